@@ -0,0 +1,3 @@
+"""
+Benchmarks de performance du pipeline MLOps (entraînement, données, serving)
+"""
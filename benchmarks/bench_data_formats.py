@@ -0,0 +1,121 @@
+"""
+Benchmark des formats de données de l'étape prepare (CSV vs Parquet vs Feather)
+Compare taille sur disque, temps d'écriture et temps de chargement (toutes
+colonnes et colonnes utiles seulement) sur un dataset au schéma Iris
+
+Usage:
+    poetry run python -m benchmarks.bench_data_formats --n-rows 1000000
+"""
+
+import argparse
+import json
+import logging
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from src.data.schema import FEATURE_COLUMNS, TARGET_COLUMN, apply_schema, dtypes
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+TARGET_NAMES = ["setosa", "versicolor", "virginica"]
+
+
+def _make_frame(n_rows: int, seed: int = 42) -> pd.DataFrame:
+    """Dataset au schéma Iris (valeurs aléatoires, typées float32/int8)"""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        rng.uniform(0.1, 8.0, size=(n_rows, len(FEATURE_COLUMNS))),
+        columns=FEATURE_COLUMNS,
+    )
+    df[TARGET_COLUMN] = rng.integers(0, len(TARGET_NAMES), n_rows)
+    return apply_schema(df, TARGET_NAMES)
+
+
+def _best_of(fn: Callable[[], object], repeat: int) -> float:
+    """Meilleur temps sur `repeat` exécutions (limite le bruit du cache disque)"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run_benchmark(n_rows: int = 1_000_000, repeat: int = 3) -> List[Dict]:
+    """
+    Mesure écriture / lecture pour chaque format
+
+    Returns:
+        List[Dict]: Une ligne de résultats par format
+    """
+    df = _make_frame(n_rows)
+    columns = FEATURE_COLUMNS + [TARGET_COLUMN]
+    results = []
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        base = Path(temp_dir)
+        formats = {
+            # Comportement historique : CSV relu sans schéma
+            "csv": (
+                base / "data.csv",
+                lambda p: df.to_csv(p, index=False),
+                lambda p: pd.read_csv(p),
+                lambda p: pd.read_csv(p, usecols=columns, dtype=dtypes()),
+            ),
+            "parquet": (
+                base / "data.parquet",
+                lambda p: df.to_parquet(p, index=False),
+                lambda p: pd.read_parquet(p),
+                lambda p: pd.read_parquet(p, columns=columns),
+            ),
+            "feather": (
+                base / "data.feather",
+                lambda p: df.to_feather(p),
+                lambda p: pd.read_feather(p),
+                lambda p: pd.read_feather(p, columns=columns),
+            ),
+        }
+
+        for name, (path, write, read_all, read_columns) in formats.items():
+            write_time = _best_of(lambda: write(path), 1)
+            read_all_time = _best_of(lambda: read_all(path), repeat)
+            read_columns_time = _best_of(lambda: read_columns(path), repeat)
+            result = {
+                "format": name,
+                "n_rows": n_rows,
+                "size_mb": round(path.stat().st_size / 1024**2, 2),
+                "write_s": round(write_time, 4),
+                "read_all_s": round(read_all_time, 4),
+                "read_columns_s": round(read_columns_time, 4),
+            }
+            results.append(result)
+            logger.info(
+                f"{name:<8} size={result['size_mb']:8.2f}MiB "
+                f"write={write_time:6.3f}s read={read_all_time:6.3f}s "
+                f"read(columns)={read_columns_time:6.3f}s"
+            )
+
+    csv_time = results[0]["read_columns_s"]
+    for result in results:
+        result["speedup_vs_csv"] = round(csv_time / result["read_columns_s"], 1)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark CSV / Parquet / Feather")
+    parser.add_argument("--n-rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="Fichier JSON des résultats")
+    args = parser.parse_args()
+
+    bench_results = run_benchmark(n_rows=args.n_rows, repeat=args.repeat)
+    if args.output:
+        Path(args.output).write_text(json.dumps(bench_results, indent=2))
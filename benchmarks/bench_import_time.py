@@ -0,0 +1,130 @@
+"""
+Audit du temps d'import de l'application de serving (python -X importtime)
+Importe le module cible dans un interpréteur neuf, analyse la trace de
+-X importtime et affiche le temps total ainsi que les paquets de premier
+niveau les plus coûteux (somme des temps propres de leurs modules). Échoue
+si un module qui doit être importé à la demande (ex. mlflow, chargé par le
+lifespan) l'est dès l'import.
+
+Usage:
+    poetry run python -m benchmarks.bench_import_time
+    poetry run python -m benchmarks.bench_import_time --module src.serving.app --top 15
+"""
+
+import argparse
+import json
+import logging
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+# Modules lourds à ne jamais importer avec l'app (importés au démarrage du serving)
+DEFERRED_MODULES = ("mlflow",)
+
+# "import time:      1234 |     567890 |   package.module"
+_LINE_PATTERN = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def parse_importtime(trace: str) -> List[Dict]:
+    """
+    Analyse la sortie stderr de -X importtime
+
+    Returns:
+        List[Dict]: {module, self_us, cumulative_us, depth}, dans l'ordre de la trace
+    """
+    entries = []
+    for line in trace.splitlines():
+        match = _LINE_PATTERN.match(line)
+        if match:
+            entries.append(
+                {
+                    "module": match.group(4),
+                    "self_us": int(match.group(1)),
+                    "cumulative_us": int(match.group(2)),
+                    "depth": (len(match.group(3)) - 1) // 2,
+                }
+            )
+    return entries
+
+
+def top_level_packages(entries: Sequence[Dict]) -> Dict[str, int]:
+    """Temps (µs) par paquet de premier niveau : somme des temps propres"""
+    totals: Dict[str, int] = {}
+    for entry in entries:
+        package = entry["module"].split(".")[0]
+        totals[package] = totals.get(package, 0) + entry["self_us"]
+    return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+
+def audit_import_time(
+    module: str = "src.serving.app",
+    deferred: Sequence[str] = DEFERRED_MODULES,
+    repeat: int = 3,
+) -> Dict:
+    """
+    Importe `module` dans `repeat` interpréteurs neufs (meilleur temps retenu)
+
+    Returns:
+        Dict: {module, total_ms, packages_ms, eager_deferred}
+    """
+    best = None
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        entries = parse_importtime(result.stderr)
+        total = max(entry["cumulative_us"] for entry in entries if entry["depth"] == 0)
+        if best is None or total < best[0]:
+            best = (total, entries)
+
+    total, entries = best
+    imported = {entry["module"] for entry in entries}
+    return {
+        "module": module,
+        "total_ms": round(total / 1000, 1),
+        "packages_ms": {
+            package: round(us / 1000, 1)
+            for package, us in top_level_packages(entries).items()
+        },
+        "eager_deferred": sorted(name for name in deferred if name in imported),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Audit du temps d'import (serving)")
+    parser.add_argument("--module", default="src.serving.app")
+    parser.add_argument("--top", type=int, default=10, help="Paquets affichés")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--deferred",
+        nargs="*",
+        default=list(DEFERRED_MODULES),
+        help="Modules qui ne doivent pas être importés avec le module cible",
+    )
+    parser.add_argument("--output", help="Fichier JSON des résultats")
+    args = parser.parse_args()
+
+    report = audit_import_time(args.module, args.deferred, args.repeat)
+    logger.info(f"import {report['module']}: {report['total_ms']:.1f} ms")
+    for package, ms in list(report["packages_ms"].items())[: args.top]:
+        logger.info(f"  {package:<24} {ms:8.1f} ms")
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+    if report["eager_deferred"]:
+        logger.error(
+            f"Imports à différer chargés d'emblée : {report['eager_deferred']}"
+        )
+        sys.exit(1)
@@ -0,0 +1,288 @@
+"""
+Microbenchmark des chemins d'inférence, hors HTTP
+Compare les moteurs (sklearn predict_proba avec le n_jobs d'entraînement,
+sklearn n_jobs=1, forêt compilée numpy de src.models.compiled_forest) sur
+une grille taille de lot x nombre d'arbres, ainsi que les variantes de
+construction du tableau de features de /predict. Pour chaque mesure : ns par
+ligne (meilleur de plusieurs répétitions) et pic d'allocation par appel
+(tracemalloc). Chaque exécution est ajoutée à un historique JSONL (commit,
+date) pour suivre les tendances d'un commit à l'autre.
+
+Le modèle est celui de production (models/metadata.json) s'il existe, sinon
+un modèle entraîné par train_model dans un dossier temporaire. Les forêts
+plus petites sont les préfixes de ce modèle (mêmes arbres, tronqués).
+
+Usage:
+    poetry run python -m benchmarks.bench_inference
+    poetry run python -m benchmarks.bench_inference --batch-sizes 1 64 --n-estimators 50 200
+"""
+
+import argparse
+import copy
+import json
+import logging
+import os
+import subprocess
+import tempfile
+import time
+import timeit
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+from sklearn.datasets import load_iris
+from sklearn.ensemble import RandomForestClassifier
+
+from src.models.compiled_forest import compile_forest
+from src.serving.models import IrisFeatures
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+HISTORY_PATH = Path("benchmarks/history/inference.jsonl")
+
+
+def _load_or_train_model(model_dir: Path, n_estimators: int) -> RandomForestClassifier:
+    """Modèle de production si disponible, sinon entraîné par train_model"""
+    if (model_dir / "metadata.json").exists():
+        from src.training.incremental import load_production_model
+
+        model, _ = load_production_model(model_dir)
+        return model
+
+    import mlflow
+
+    from src.training.train import train_model
+
+    logger.info(f"Pas de modèle dans {model_dir} : entraînement temporaire")
+    original_dir = os.getcwd()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        os.chdir(temp_dir)
+        try:
+            mlflow.set_tracking_uri(f"file://{temp_dir}/mlruns")
+            model, _ = train_model(
+                n_estimators=n_estimators, experiment_name="bench-inference"
+            )
+        finally:
+            os.chdir(original_dir)
+    return model
+
+
+def _truncate(
+    model: RandomForestClassifier, n_estimators: int
+) -> RandomForestClassifier:
+    """Forêt réduite à ses n_estimators premiers arbres"""
+    small = copy.copy(model)
+    small.estimators_ = model.estimators_[:n_estimators]
+    small.n_estimators = len(small.estimators_)
+    return small
+
+
+def _measure(fn: Callable[[], object], rows: int, repeat: int) -> Dict:
+    """ns par ligne (meilleur de `repeat`) et pic d'allocation d'un appel"""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number)) / number
+
+    fn()  # caches / imports paresseux hors mesure mémoire
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "ns_per_call": best * 1e9,
+        "ns_per_row": best * 1e9 / rows,
+        "peak_alloc_bytes": peak - before,
+    }
+
+
+def feature_builders(features: IrisFeatures) -> Dict[str, Callable[[], np.ndarray]]:
+    """Variantes de construction du tableau (1, 4) à partir de la requête"""
+    buffer = np.empty((1, 4), dtype=np.float64)
+
+    def fill_buffer() -> np.ndarray:
+        buffer[0] = (
+            features.sepal_length,
+            features.sepal_width,
+            features.petal_length,
+            features.petal_width,
+        )
+        return buffer
+
+    return {
+        # Code actuel de /predict
+        "array_reshape": lambda: np.array(
+            [
+                features.sepal_length,
+                features.sepal_width,
+                features.petal_length,
+                features.petal_width,
+            ],
+            dtype=float,
+        ).reshape(1, -1),
+        "model_dump": lambda: np.array(
+            [list(features.model_dump().values())], dtype=float
+        ),
+        "fromiter": lambda: np.fromiter(
+            (
+                features.sepal_length,
+                features.sepal_width,
+                features.petal_length,
+                features.petal_width,
+            ),
+            dtype=float,
+            count=4,
+        ).reshape(1, -1),
+        "preallocated": fill_buffer,
+    }
+
+
+def run_benchmark(
+    batch_sizes: Sequence[int] = (1, 8, 64, 512, 4096),
+    n_estimators: Sequence[int] = (10, 50, 100, 200),
+    model_dir: Path = Path("models"),
+    repeat: int = 5,
+    model: Optional[RandomForestClassifier] = None,
+) -> Dict[str, List[Dict]]:
+    """
+    Mesure chaque moteur sur la grille lots x arbres, puis la construction
+    du tableau de features
+
+    Returns:
+        Dict: {"engines": [...], "feature_array": [...]} (une ligne par mesure)
+    """
+    model = model or _load_or_train_model(model_dir, max(n_estimators))
+    iris = load_iris()
+    rng = np.random.default_rng(42)
+    engines_results = []
+
+    for n_trees in sorted(set(n_estimators)):
+        if n_trees > len(model.estimators_):
+            logger.warning(
+                f"{n_trees} arbres demandés, le modèle n'en a que {len(model.estimators_)}"
+            )
+            continue
+        forest = _truncate(model, n_trees)
+        single_thread = copy.copy(forest).set_params(n_jobs=1)
+        engines = {
+            f"sklearn_n_jobs={forest.n_jobs}": forest.predict_proba,
+            "sklearn_n_jobs=1": single_thread.predict_proba,
+            "compiled": compile_forest(forest).predict_proba,
+        }
+        for batch_size in batch_sizes:
+            X = iris.data[rng.integers(0, len(iris.data), batch_size)]
+            for engine, predict_proba in engines.items():
+                result = {
+                    "engine": engine,
+                    "n_estimators": n_trees,
+                    "batch_size": batch_size,
+                    **_measure(lambda: predict_proba(X), batch_size, repeat),
+                }
+                engines_results.append(result)
+                logger.info(
+                    f"{engine:<18} trees={n_trees:<4} batch={batch_size:<5} "
+                    f"{result['ns_per_row']:>12,.0f} ns/row "
+                    f"{result['peak_alloc_bytes']:>10,} B/call"
+                )
+
+    features = IrisFeatures(
+        sepal_length=5.1, sepal_width=3.5, petal_length=1.4, petal_width=0.2
+    )
+    builder_results = []
+    for name, build in feature_builders(features).items():
+        result = {"builder": name, **_measure(build, 1, repeat)}
+        builder_results.append(result)
+        logger.info(
+            f"features {name:<14} {result['ns_per_call']:>8,.0f} ns/call "
+            f"{result['peak_alloc_bytes']:>6,} B/call"
+        )
+    return {"engines": engines_results, "feature_array": builder_results}
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _row_key(row: Dict) -> str:
+    if "builder" in row:
+        return f"features/{row['builder']}"
+    return f"{row['engine']}/trees={row['n_estimators']}/batch={row['batch_size']}"
+
+
+def append_history(results: Dict, history_path: Path = HISTORY_PATH) -> Optional[Dict]:
+    """
+    Ajoute l'exécution à l'historique JSONL et retourne l'entrée précédente
+    (None si l'historique était vide)
+    """
+    previous = None
+    if history_path.exists():
+        lines = history_path.read_text(encoding="utf-8").splitlines()
+        if lines:
+            previous = json.loads(lines[-1])
+    entry = {
+        "commit": _git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+    history_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(history_path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry) + "\n")
+    return previous
+
+
+def log_trend(results: Dict, previous: Dict) -> None:
+    """Écart de ns/ligne par rapport à l'exécution précédente"""
+    before = {
+        _row_key(row): row["ns_per_row"]
+        for rows in previous["results"].values()
+        for row in rows
+    }
+    logger.info(f"Tendance vs {previous['commit']} ({previous['timestamp']}) :")
+    for rows in results.values():
+        for row in rows:
+            key = _row_key(row)
+            if key in before and before[key] > 0:
+                change = row["ns_per_row"] / before[key] - 1
+                logger.info(f"   {key:<45} {change:+.1%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Microbenchmark de l'inférence")
+    parser.add_argument(
+        "--batch-sizes", type=int, nargs="+", default=[1, 8, 64, 512, 4096]
+    )
+    parser.add_argument(
+        "--n-estimators", type=int, nargs="+", default=[10, 50, 100, 200]
+    )
+    parser.add_argument("--model-dir", type=Path, default=Path("models"))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--history", type=Path, default=HISTORY_PATH)
+    parser.add_argument("--output", help="Fichier JSON des résultats")
+    args = parser.parse_args()
+
+    bench_results = run_benchmark(
+        batch_sizes=args.batch_sizes,
+        n_estimators=args.n_estimators,
+        model_dir=args.model_dir,
+        repeat=args.repeat,
+    )
+    previous_run = append_history(bench_results, args.history)
+    if previous_run is not None:
+        log_trend(bench_results, previous_run)
+    if args.output:
+        Path(args.output).write_text(json.dumps(bench_results, indent=2))
@@ -0,0 +1,195 @@
+"""
+Benchmark de mise à l'échelle de l'entraînement sur plusieurs coeurs
+Ajuste la même forêt sur un dataset synthétique volumineux avec n_jobs croissant
+et vérifie que le modèle obtenu est identique quel que soit le nombre de coeurs.
+Avec --sharded, mesure l'entraînement par sous-forêts (processus workers).
+
+Usage:
+    poetry run python -m benchmarks.bench_training --n-samples 200000 --n-estimators 100
+    poetry run python -m benchmarks.bench_training --sharded
+"""
+
+import argparse
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from sklearn.datasets import make_classification
+from sklearn.ensemble import RandomForestClassifier
+
+from src.config import TrainConfig
+from src.training.distributed import train_sharded
+from src.training.train import parallel_context
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+def _default_core_counts() -> List[int]:
+    """Puissances de 2 jusqu'au nombre de coeurs disponibles (inclus)"""
+    n_cpus = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= n_cpus:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != n_cpus:
+        counts.append(n_cpus)
+    return counts
+
+
+def _make_dataset(n_samples: int, n_features: int, random_state: int):
+    X, y = make_classification(
+        n_samples=n_samples,
+        n_features=n_features,
+        n_informative=n_features,
+        n_redundant=0,
+        n_classes=3,
+        random_state=random_state,
+    )
+    return X.astype(np.float32), y
+
+
+def run_benchmark(
+    n_samples: int = 200_000,
+    n_features: int = 4,
+    n_estimators: int = 100,
+    core_counts: Optional[Sequence[int]] = None,
+    random_state: int = 42,
+    joblib_backend: str = "threading",
+) -> List[Dict]:
+    """
+    Mesure le temps d'ajustement pour chaque nombre de coeurs
+
+    Returns:
+        List[Dict]: {n_jobs, fit_time_s, speedup, efficiency} par nombre de coeurs
+    """
+    core_counts = list(core_counts or _default_core_counts())
+    X, y = _make_dataset(n_samples, n_features, random_state)
+    X_probe = X[:1000]
+
+    results = []
+    reference_proba = None
+    for n_jobs in core_counts:
+        train_config = TrainConfig(
+            n_estimators=n_estimators,
+            n_jobs=n_jobs,
+            joblib_backend=joblib_backend,
+            blas_threads=1,
+        )
+        model = RandomForestClassifier(
+            n_estimators=n_estimators, random_state=random_state, n_jobs=n_jobs
+        )
+        start = time.perf_counter()
+        with parallel_context(train_config):
+            model.fit(X, y)
+        fit_time = time.perf_counter() - start
+
+        # Déterminisme : mêmes probabilités quel que soit le nombre de coeurs
+        proba = model.predict_proba(X_probe)
+        if reference_proba is None:
+            reference_proba = proba
+        identical = bool(np.array_equal(proba, reference_proba))
+
+        baseline = results[0]["fit_time_s"] if results else fit_time
+        speedup = baseline / fit_time
+        results.append(
+            {
+                "n_jobs": n_jobs,
+                "fit_time_s": round(fit_time, 4),
+                "speedup": round(speedup, 2),
+                "efficiency": round(speedup / n_jobs, 2),
+                "identical_to_single_core": identical,
+            }
+        )
+        logger.info(
+            f"n_jobs={n_jobs:<3} fit={fit_time:7.2f}s speedup={speedup:5.2f}x "
+            f"efficiency={speedup / n_jobs:4.2f} identical={identical}"
+        )
+
+    return results
+
+
+def run_sharded_benchmark(
+    n_samples: int = 200_000,
+    n_features: int = 4,
+    n_estimators: int = 100,
+    worker_counts: Optional[Sequence[int]] = None,
+    random_state: int = 42,
+) -> List[Dict]:
+    """
+    Mesure l'entraînement par sous-forêts pour chaque nombre de workers
+
+    Returns:
+        List[Dict]: {n_workers, fit_time_s, trees_per_s, speedup, efficiency}
+    """
+    worker_counts = list(worker_counts or _default_core_counts())
+    X, y = _make_dataset(n_samples, n_features, random_state)
+
+    results = []
+    for n_workers in worker_counts:
+        start = time.perf_counter()
+        train_sharded(
+            X,
+            y,
+            n_estimators=n_estimators,
+            max_depth=None,
+            random_state=random_state,
+            n_workers=n_workers,
+        )
+        fit_time = time.perf_counter() - start
+
+        baseline = results[0]["fit_time_s"] if results else fit_time
+        speedup = baseline / fit_time
+        results.append(
+            {
+                "n_workers": n_workers,
+                "fit_time_s": round(fit_time, 4),
+                "trees_per_s": round(n_estimators / fit_time, 2),
+                "speedup": round(speedup, 2),
+                "efficiency": round(speedup / n_workers, 2),
+            }
+        )
+        logger.info(
+            f"workers={n_workers:<3} fit={fit_time:7.2f}s "
+            f"trees/s={n_estimators / fit_time:7.2f} speedup={speedup:5.2f}x"
+        )
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark de mise à l'échelle de l'entraînement"
+    )
+    parser.add_argument("--n-samples", type=int, default=200_000)
+    parser.add_argument("--n-features", type=int, default=4)
+    parser.add_argument("--n-estimators", type=int, default=100)
+    parser.add_argument("--cores", type=int, nargs="+", help="Nombres de coeurs")
+    parser.add_argument("--backend", default="threading", choices=["threading", "loky"])
+    parser.add_argument(
+        "--sharded", action="store_true", help="Sous-forêts sur processus workers"
+    )
+    parser.add_argument("--output", help="Fichier JSON des résultats")
+    args = parser.parse_args()
+
+    if args.sharded:
+        bench_results = run_sharded_benchmark(
+            n_samples=args.n_samples,
+            n_features=args.n_features,
+            n_estimators=args.n_estimators,
+            worker_counts=args.cores,
+        )
+    else:
+        bench_results = run_benchmark(
+            n_samples=args.n_samples,
+            n_features=args.n_features,
+            n_estimators=args.n_estimators,
+            core_counts=args.cores,
+            joblib_backend=args.backend,
+        )
+    if args.output:
+        Path(args.output).write_text(json.dumps(bench_results, indent=2))
@@ -0,0 +1,27 @@
+"""
+Benchmark de l'API de serving : générateur de charge et garde-fou de régression
+
+L'application FastAPI est démarrée en mémoire (httpx.ASGITransport, sans
+réseau) et/ou derrière un vrai socket uvicorn, puis chargée en boucle ouverte
+(arrivées à débit fixe, indépendantes des réponses) sur /predict, /health et
+le prédicteur par lot s'il existe. Les résultats (débit, p50/p95/p99/p999,
+erreurs) sont écrits en JSON et comparés à une référence avec une tolérance.
+
+Usage:
+    poetry run python -m benchmarks.serving --rate 200 --duration 10
+    poetry run python -m benchmarks.serving --transport both \\
+        --baseline benchmarks/serving/baseline.json
+    poetry run python -m benchmarks.serving --replay requetes.jsonl
+"""
+
+from .loadgen import RequestSpec, load_replay, run_open_loop, scenario_requests
+from .report import compare_to_baseline, summarize
+
+__all__ = [
+    "RequestSpec",
+    "compare_to_baseline",
+    "load_replay",
+    "run_open_loop",
+    "scenario_requests",
+    "summarize",
+]
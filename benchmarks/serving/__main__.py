@@ -0,0 +1,226 @@
+"""
+Point d'entrée du benchmark de serving (python -m benchmarks.serving)
+Code de sortie 1 si une régression est détectée par rapport à --baseline.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import httpx
+
+from .loadgen import RequestSpec, load_replay, run_open_loop, scenario_requests
+from .report import compare_to_baseline, summarize
+from .targets import TRANSPORTS, asgi_client, benchmark_app, uvicorn_server
+
+logger = logging.getLogger(__name__)
+
+SCENARIOS = ("predict", "batch", "health")
+
+
+async def _run_scenarios(
+    client: httpx.AsyncClient,
+    transport: str,
+    scenarios: Dict[str, List[RequestSpec]],
+    headers: Dict[str, str],
+    rate: float,
+    duration_s: float,
+    concurrency: int,
+    warmup_requests: int,
+) -> Dict[str, Dict]:
+    results = {}
+    for name, requests in scenarios.items():
+        if warmup_requests:
+            # Premiers appels (imports paresseux, caches) hors mesure
+            await run_open_loop(
+                client, requests, rate, warmup_requests / rate, concurrency, headers
+            )
+        summary = summarize(
+            await run_open_loop(
+                client, requests, rate, duration_s, concurrency, headers
+            )
+        )
+        latency = summary["latency_ms"]
+        logger.info(
+            f"   {transport}/{name}: {summary['throughput_rps']:.0f} req/s, "
+            f"p50={latency.get('p50', 0):.2f}ms p99={latency.get('p99', 0):.2f}ms "
+            f"p999={latency.get('p999', 0):.2f}ms, erreurs={summary['errors']}"
+        )
+        results[f"{transport}/{name}"] = summary
+    return results
+
+
+async def run_benchmark(
+    transports: Sequence[str] = ("asgi",),
+    scenarios: Sequence[str] = SCENARIOS,
+    rate: float = 200.0,
+    duration_s: float = 10.0,
+    concurrency: int = 64,
+    warmup_requests: int = 50,
+    replay_path: Optional[Path] = None,
+    use_lifespan: bool = False,
+) -> Dict:
+    """
+    Charge chaque scénario sur chaque transport
+
+    Args:
+        transports: "asgi" (en mémoire) et/ou "uvicorn" (socket réel)
+        scenarios: Scénarios prédéfinis (ignorés si --replay est fourni)
+        rate: Débit d'arrivée (requêtes/s)
+        duration_s: Durée mesurée par scénario
+        concurrency: Requêtes simultanées maximales
+        warmup_requests: Requêtes d'échauffement par scénario (non mesurées)
+        replay_path: Fichier JSONL de requêtes enregistrées à rejouer
+        use_lifespan: Charger le modèle de production via le lifespan
+
+    Returns:
+        Dict: {"meta": {...}, "results": {"transport/scénario": résumé}}
+    """
+    with benchmark_app(use_lifespan) as (app, headers):
+        routes = {route.path for route in app.routes}
+        if replay_path is not None:
+            requests_by_scenario = {"replay": load_replay(replay_path)}
+        else:
+            requests_by_scenario = {}
+            for name in scenarios:
+                requests = scenario_requests(name)
+                if requests[0].path not in routes:
+                    logger.warning(
+                        f"⚠️  Scénario {name} ignoré : {requests[0].path} absent"
+                    )
+                    continue
+                requests_by_scenario[name] = requests
+
+        options = dict(
+            scenarios=requests_by_scenario,
+            headers=headers,
+            rate=rate,
+            duration_s=duration_s,
+            concurrency=concurrency,
+            warmup_requests=warmup_requests,
+        )
+        results: Dict[str, Dict] = {}
+        for transport in transports:
+            logger.info(f"🚀 Transport {transport} ({rate:.0f} req/s, {duration_s}s)")
+            if transport == "asgi":
+                async with asgi_client(app, use_lifespan) as client:
+                    results.update(await _run_scenarios(client, transport, **options))
+            else:
+                with uvicorn_server(app, use_lifespan) as base_url:
+                    limits = httpx.Limits(
+                        max_connections=concurrency,
+                        max_keepalive_connections=concurrency,
+                    )
+                    async with httpx.AsyncClient(
+                        base_url=base_url, limits=limits
+                    ) as client:
+                        results.update(
+                            await _run_scenarios(client, transport, **options)
+                        )
+
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "rate": rate,
+            "duration_s": duration_s,
+            "concurrency": concurrency,
+            "replay": str(replay_path) if replay_path else None,
+        },
+        "results": results,
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    # Une ligne de log par requête côté client fausserait la mesure
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    parser = argparse.ArgumentParser(description="Benchmark de charge de l'API")
+    parser.add_argument("--transport", choices=[*TRANSPORTS, "both"], default="asgi")
+    parser.add_argument(
+        "--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS)
+    )
+    parser.add_argument("--rate", type=float, default=200.0, help="Requêtes/s")
+    parser.add_argument("--duration", type=float, default=10.0, help="Secondes")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--warmup", type=int, default=50, help="Requêtes non mesurées")
+    parser.add_argument("--replay", type=Path, help="Requêtes JSONL à rejouer")
+    parser.add_argument(
+        "--lifespan",
+        action="store_true",
+        help="Charger le modèle de production (models/metadata.json) via le lifespan",
+    )
+    parser.add_argument(
+        "--output", type=Path, default=Path("benchmarks/serving/results.json")
+    )
+    parser.add_argument("--baseline", type=Path, help="Référence à comparer")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.2, help="Écart relatif toléré (0.2 = 20%%)"
+    )
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Écrire les résultats dans --baseline",
+    )
+    args = parser.parse_args(argv)
+
+    if args.rate <= 0 or args.duration <= 0 or args.concurrency <= 0:
+        parser.error("--rate, --duration et --concurrency doivent être > 0")
+    if args.save_baseline and args.baseline is None:
+        parser.error("--save-baseline nécessite --baseline")
+
+    transports = TRANSPORTS if args.transport == "both" else (args.transport,)
+    report = asyncio.run(
+        run_benchmark(
+            transports=transports,
+            scenarios=args.scenarios,
+            rate=args.rate,
+            duration_s=args.duration,
+            concurrency=args.concurrency,
+            warmup_requests=args.warmup,
+            replay_path=args.replay,
+            use_lifespan=args.lifespan,
+        )
+    )
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    logger.info(f"💾 Résultats sauvegardés dans : {args.output}")
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        logger.info(f"💾 Nouvelle référence : {args.baseline}")
+        return 0
+    if args.baseline is None:
+        return 0
+    if not args.baseline.exists():
+        logger.warning(
+            f"⚠️  Référence {args.baseline} absente : comparaison ignorée "
+            "(la créer avec --save-baseline)"
+        )
+        return 0
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    regressions = compare_to_baseline(
+        report["results"], baseline["results"], tolerance=args.tolerance
+    )
+    for regression in regressions:
+        logger.error(f"❌ Régression : {regression}")
+    if not regressions:
+        logger.info(f"✅ Aucune régression (tolérance {args.tolerance:.0%})")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
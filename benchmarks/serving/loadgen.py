@@ -0,0 +1,170 @@
+"""
+Générateur de charge asynchrone en boucle ouverte (asyncio + httpx)
+
+Les requêtes partent à débit fixe selon un calendrier établi à l'avance, que
+les réponses précédentes soient arrivées ou non. La latence est mesurée depuis
+l'instant prévu d'envoi : l'attente derrière une requête lente est comptée
+(pas d'omission coordonnée), contrairement à une boucle fermée.
+"""
+
+import asyncio
+import itertools
+import json
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+import httpx
+from sklearn.datasets import load_iris
+
+BATCH_PATH = "/predict/batch"
+BATCH_SIZE = 32
+
+
+@dataclass
+class RequestSpec:
+    """Requête HTTP rejouable"""
+
+    method: str
+    path: str
+    json: Optional[Union[Dict, List]] = None
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class LoadResult:
+    """Résultat brut d'une charge : une latence et un statut par requête"""
+
+    latencies_s: List[float] = field(default_factory=list)
+    # Code HTTP, ou nom de l'exception si la requête n'a pas abouti
+    statuses: List[Union[int, str]] = field(default_factory=list)
+    elapsed_s: float = 0.0
+
+
+def _iris_payloads() -> List[Dict[str, float]]:
+    iris = load_iris()
+    keys = ["sepal_length", "sepal_width", "petal_length", "petal_width"]
+    return [dict(zip(keys, map(float, row))) for row in iris.data]
+
+
+def scenario_requests(name: str) -> List[RequestSpec]:
+    """
+    Requêtes d'un scénario prédéfini (parcourues en boucle pendant la charge)
+
+    Args:
+        name: "predict" (une fleur par requête), "batch" (BATCH_SIZE fleurs
+            par requête sur BATCH_PATH) ou "health"
+    """
+    if name == "health":
+        return [RequestSpec("GET", "/health")]
+    payloads = _iris_payloads()
+    if name == "predict":
+        return [RequestSpec("POST", "/predict", json=p) for p in payloads]
+    if name == "batch":
+        return [
+            RequestSpec(
+                "POST", BATCH_PATH, json={"instances": payloads[i : i + BATCH_SIZE]}
+            )
+            for i in range(0, len(payloads), BATCH_SIZE)
+        ]
+    raise ValueError(f"Scénario inconnu : {name}")
+
+
+def load_replay(path: Path) -> List[RequestSpec]:
+    """
+    Requêtes enregistrées à rejouer, une par ligne JSON :
+    {"method": "POST", "path": "/predict", "json": {...}, "headers": {...}}
+    (method par défaut : POST si un corps est fourni, GET sinon)
+    """
+    specs = []
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if "path" not in record:
+                raise ValueError(f"{path}:{line_number} : champ 'path' manquant")
+            body = record.get("json")
+            specs.append(
+                RequestSpec(
+                    method=record.get("method", "POST" if body is not None else "GET"),
+                    path=record["path"],
+                    json=body,
+                    headers=record.get("headers", {}),
+                )
+            )
+    if not specs:
+        raise ValueError(f"Aucune requête dans {path}")
+    return specs
+
+
+async def _send(
+    client: httpx.AsyncClient,
+    spec: RequestSpec,
+    headers: Dict[str, str],
+    scheduled: float,
+    semaphore: asyncio.Semaphore,
+    result: LoadResult,
+) -> None:
+    async with semaphore:
+        try:
+            response = await client.request(
+                spec.method,
+                spec.path,
+                json=spec.json,
+                headers={**headers, **spec.headers},
+            )
+            status: Union[int, str] = response.status_code
+        except httpx.HTTPError as exc:
+            status = type(exc).__name__
+    result.latencies_s.append(time.perf_counter() - scheduled)
+    result.statuses.append(status)
+
+
+async def run_open_loop(
+    client: httpx.AsyncClient,
+    requests: Sequence[RequestSpec],
+    rate: float,
+    duration_s: float,
+    concurrency: int = 64,
+    headers: Optional[Dict[str, str]] = None,
+) -> LoadResult:
+    """
+    Envoie `rate` requêtes par seconde pendant `duration_s` secondes
+
+    Args:
+        client: Client httpx (ASGITransport ou socket réel)
+        requests: Requêtes parcourues en boucle
+        rate: Débit d'arrivée (requêtes/s)
+        duration_s: Durée de la charge
+        concurrency: Requêtes simultanées maximales (au-delà, elles attendent
+            et cette attente compte dans la latence)
+        headers: En-têtes ajoutés à chaque requête (ex: X-API-Key)
+
+    Returns:
+        LoadResult: Latences, statuts et durée totale (dernière réponse incluse)
+    """
+    if rate <= 0 or duration_s <= 0:
+        raise ValueError("rate et duration_s doivent être > 0")
+    headers = headers or {}
+    semaphore = asyncio.Semaphore(concurrency)
+    result = LoadResult()
+    n_requests = max(1, int(rate * duration_s))
+    specs = itertools.cycle(requests)
+
+    tasks = []
+    start = time.perf_counter()
+    for i in range(n_requests):
+        scheduled = start + i / rate
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(
+            asyncio.create_task(
+                _send(client, next(specs), headers, scheduled, semaphore, result)
+            )
+        )
+    await asyncio.gather(*tasks)
+    result.elapsed_s = time.perf_counter() - start
+    return result
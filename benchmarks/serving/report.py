@@ -0,0 +1,95 @@
+"""
+Synthèse des résultats de charge et comparaison à une référence
+"""
+
+from collections import Counter
+from typing import Dict, List
+
+import numpy as np
+
+from .loadgen import LoadResult
+
+PERCENTILES = {"p50": 50, "p95": 95, "p99": 99, "p999": 99.9}
+# Métriques surveillées : (chemin dans le résumé, sens de la régression)
+GATED_METRICS = {
+    "latency_ms.p50": "higher",
+    "latency_ms.p99": "higher",
+    "throughput_rps": "lower",
+}
+# Hausse absolue du taux d'erreur tolérée par rapport à la référence
+ERROR_RATE_SLACK = 0.001
+
+
+def summarize(result: LoadResult) -> Dict:
+    """Débit, percentiles de latence (ms) et erreurs d'une charge"""
+    latencies_ms = np.asarray(result.latencies_s) * 1000
+    n_requests = len(latencies_ms)
+    statuses = Counter(str(status) for status in result.statuses)
+    n_errors = sum(
+        count
+        for status, count in statuses.items()
+        if not (status.isdigit() and 200 <= int(status) < 300)
+    )
+    summary = {
+        "requests": n_requests,
+        "errors": n_errors,
+        "error_rate": n_errors / n_requests if n_requests else 0.0,
+        "status_counts": dict(sorted(statuses.items())),
+        "elapsed_s": result.elapsed_s,
+        "throughput_rps": n_requests / result.elapsed_s if result.elapsed_s else 0.0,
+        "latency_ms": {},
+    }
+    if n_requests:
+        summary["latency_ms"] = {
+            "mean": float(latencies_ms.mean()),
+            **{
+                name: float(np.percentile(latencies_ms, q))
+                for name, q in PERCENTILES.items()
+            },
+            "max": float(latencies_ms.max()),
+        }
+    return summary
+
+
+def _get(summary: Dict, path: str) -> float:
+    value = summary
+    for key in path.split("."):
+        value = value[key]
+    return value
+
+
+def compare_to_baseline(
+    results: Dict[str, Dict], baseline: Dict[str, Dict], tolerance: float = 0.2
+) -> List[str]:
+    """
+    Compare des résultats à une référence (mêmes clés "transport/scénario")
+
+    Une latence est en régression au-delà de référence * (1 + tolerance), un
+    débit en deçà de référence * (1 - tolerance) ; le taux d'erreur ne peut
+    pas dépasser celui de la référence de plus de ERROR_RATE_SLACK. Les
+    scénarios absents de l'un ou l'autre côté sont ignorés.
+
+    Returns:
+        List[str]: Description des régressions (vide = pas de régression)
+    """
+    regressions = []
+    for key in sorted(results.keys() & baseline.keys()):
+        current, reference = results[key], baseline[key]
+        if not current.get("requests") or not reference.get("requests"):
+            continue
+        for path, direction in GATED_METRICS.items():
+            value, ref = _get(current, path), _get(reference, path)
+            if direction == "higher" and value > ref * (1 + tolerance):
+                regressions.append(
+                    f"{key} {path}: {value:.2f} > {ref:.2f} (+{tolerance:.0%})"
+                )
+            elif direction == "lower" and value < ref * (1 - tolerance):
+                regressions.append(
+                    f"{key} {path}: {value:.2f} < {ref:.2f} (-{tolerance:.0%})"
+                )
+        if current["error_rate"] > reference["error_rate"] + ERROR_RATE_SLACK:
+            regressions.append(
+                f"{key} error_rate: {current['error_rate']:.4f} "
+                f"> {reference['error_rate']:.4f}"
+            )
+    return regressions
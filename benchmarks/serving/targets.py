@@ -0,0 +1,124 @@
+"""
+Cibles du benchmark : application en mémoire (ASGITransport) ou derrière un
+socket uvicorn réel (serveur dans un thread du même processus)
+"""
+
+import contextlib
+import os
+import secrets
+import socket
+import threading
+import time
+from typing import AsyncIterator, Iterator
+
+import httpx
+import uvicorn
+from fastapi import FastAPI
+from sklearn.datasets import load_iris
+from sklearn.ensemble import RandomForestClassifier
+
+from src.config import get_config
+from src.serving.middleware import limiter
+from src.serving.security import API_KEY_HEADER_NAME
+
+TRANSPORTS = ("asgi", "uvicorn")
+
+
+@contextlib.contextmanager
+def benchmark_app(use_lifespan: bool = False) -> Iterator[tuple]:
+    """
+    Application de serving configurée pour la charge
+
+    Le rate limiting est désactivé (il rejetterait la charge en 429) et une
+    clé API temporaire est installée pour mesurer le chemin authentifié. Sans
+    `use_lifespan`, un modèle ajusté sur Iris avec les paramètres de
+    params.yaml est placé dans app.state (aucun run MLflow requis) ; avec
+    `use_lifespan`, le modèle de production est chargé par le lifespan.
+
+    Yields:
+        Tuple[FastAPI, Dict[str, str]]: Application et en-têtes d'authentification
+    """
+    from src.serving.app import app
+
+    api_key = secrets.token_hex(32)
+    previous_key = os.environ.get("API_KEY")
+    os.environ["API_KEY"] = api_key
+    limiter_enabled = limiter.enabled
+    limiter.enabled = False
+    try:
+        if not use_lifespan:
+            config = get_config()
+            iris = load_iris()
+            model = RandomForestClassifier(
+                n_estimators=config.train.n_estimators,
+                max_depth=config.train.max_depth,
+                random_state=config.train.random_state,
+                n_jobs=config.train.n_jobs,
+            ).fit(iris.data, iris.target)
+            app.state.model = model
+            app.state.metadata = {"target_names": list(iris.target_names)}
+            app.state.metrics = None
+        yield app, {API_KEY_HEADER_NAME: api_key}
+    finally:
+        limiter.enabled = limiter_enabled
+        if previous_key is None:
+            os.environ.pop("API_KEY", None)
+        else:
+            os.environ["API_KEY"] = previous_key
+        if not use_lifespan:
+            app.state.model = None
+            app.state.metadata = None
+
+
+@contextlib.asynccontextmanager
+async def asgi_client(
+    app: FastAPI, use_lifespan: bool = False
+) -> AsyncIterator[httpx.AsyncClient]:
+    """Client httpx branché directement sur l'application (sans réseau)"""
+    lifespan = (
+        app.router.lifespan_context(app) if use_lifespan else contextlib.nullcontext()
+    )
+    async with lifespan:
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://bench"
+        ) as client:
+            yield client
+
+
+@contextlib.contextmanager
+def uvicorn_server(
+    app: FastAPI, use_lifespan: bool = False, timeout_s: float = 10.0
+) -> Iterator[str]:
+    """
+    Serveur uvicorn sur un port libre de 127.0.0.1 (thread dédié)
+
+    Yields:
+        str: URL de base du serveur
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind(("127.0.0.1", 0))
+    host, port = sock.getsockname()
+    server = uvicorn.Server(
+        uvicorn.Config(
+            app,
+            lifespan="on" if use_lifespan else "off",
+            log_level="warning",
+            access_log=False,
+        )
+    )
+    thread = threading.Thread(
+        target=server.run, kwargs={"sockets": [sock]}, name="bench-uvicorn", daemon=True
+    )
+    thread.start()
+    deadline = time.monotonic() + timeout_s
+    while not server.started:
+        if not thread.is_alive() or time.monotonic() > deadline:
+            raise RuntimeError("Le serveur uvicorn n'a pas démarré")
+        time.sleep(0.01)
+    try:
+        yield f"http://{host}:{port}"
+    finally:
+        server.should_exit = True
+        thread.join(timeout_s)
+        sock.close()
@@ -6,10 +6,10 @@ Approche recommandée en production MLOps
 
 import logging
 from pathlib import Path
-from typing import Optional
+from typing import List, Literal, Optional
 
 import yaml
-from pydantic import BaseModel, Field, ValidationError
+from pydantic import BaseModel, Field, ValidationError, field_validator
 
 logger = logging.getLogger(__name__)
 
@@ -28,7 +28,17 @@ class BaseConfig(BaseModel):
 class DataConfig(BaseConfig):
     """Configuration pour la préparation des données"""
 
-    pass
+    export_csv: bool = Field(
+        default=False,
+        description="Exporter aussi les fichiers en CSV (en plus de Parquet)",
+    )
+    source_path: Optional[str] = Field(
+        default=None,
+        description="Source Parquet/CSV découpée en flux (None = Iris en mémoire)",
+    )
+    chunk_size: int = Field(
+        default=100_000, gt=0, description="Taille des morceaux du mode flux"
+    )
 
 
 class TrainConfig(BaseConfig):
@@ -40,6 +50,123 @@ class TrainConfig(BaseConfig):
     max_depth: Optional[int] = Field(
         default=None, description="Profondeur maximale des arbres (None = illimitée)"
     )
+    n_jobs: int = Field(
+        default=-1,
+        ge=-1,
+        description="Nombre de coeurs pour l'entraînement (-1 = tous les coeurs)",
+    )
+    joblib_backend: Literal["threading", "loky", "multiprocessing"] = Field(
+        default="threading", description="Backend joblib pour l'ajustement des arbres"
+    )
+    blas_threads: Optional[int] = Field(
+        default=None, gt=0, description="Limite de threads BLAS (None = pas de limite)"
+    )
+    openmp_threads: Optional[int] = Field(
+        default=None,
+        gt=0,
+        description="Limite de threads OpenMP (None = pas de limite)",
+    )
+
+    distributed_workers: int = Field(
+        default=1,
+        ge=1,
+        description="Sous-forêts ajustées en parallèle puis fusionnées (1 = fit classique)",
+    )
+    worker_addresses: List[str] = Field(
+        default_factory=list,
+        description="Noeuds workers distants host:port (vide = processus locaux)",
+    )
+    shard_data: bool = Field(
+        default=False,
+        description="Chaque sous-forêt n'ajuste qu'un shard stratifié des données",
+    )
+    early_stopping: bool = Field(
+        default=False,
+        description="Arrêt anticipé sur le score OOB (n_estimators = budget maximal)",
+    )
+    oob_step: int = Field(default=10, gt=0, description="Arbres ajoutés par incrément")
+    oob_tol: float = Field(
+        default=1e-3, ge=0.0, description="Amélioration OOB minimale par incrément"
+    )
+    oob_patience: int = Field(
+        default=3, gt=0, description="Incréments sans amélioration avant l'arrêt"
+    )
+    oob_metric: Literal["log_loss", "accuracy"] = Field(
+        default="log_loss", description="Métrique OOB suivie pour le plateau"
+    )
+    incremental_trees: int = Field(
+        default=50,
+        gt=0,
+        description="Arbres ajoutés au modèle de production (entraînement incrémental)",
+    )
+
+    @field_validator("n_jobs")
+    @classmethod
+    def validate_n_jobs(cls, v: int) -> int:
+        """n_jobs=0 n'a pas de sens pour joblib"""
+        if v == 0:
+            raise ValueError("n_jobs doit être -1 (tous les coeurs) ou >= 1")
+        return v
+
+
+class TrackingConfig(BaseModel):
+    """Configuration du logging MLflow (envoi groupé via log_batch)"""
+
+    background_flush: bool = Field(
+        default=False,
+        description="Vider les params/métriques en arrière-plan pendant l'entraînement",
+    )
+    flush_interval_s: float = Field(
+        default=5.0, gt=0.0, description="Intervalle de vidage en arrière-plan"
+    )
+
+
+class ProfilingConfig(BaseModel):
+    """Configuration du profilage des étapes (timings.json toujours écrit)"""
+
+    profiler: Literal["none", "cprofile", "sampling"] = Field(
+        default="none", description="Profil détaillé optionnel de l'exécution"
+    )
+    sampling_interval_ms: float = Field(
+        default=5.0, gt=0.0, description="Intervalle du profileur par échantillonnage"
+    )
+
+
+class CVConfig(BaseModel):
+    """Configuration de la validation croisée k-fold"""
+
+    n_splits: int = Field(default=5, ge=2, description="Nombre de folds stratifiés")
+    seed: int = Field(default=42, ge=0, description="Graine du découpage en folds")
+    n_workers: int = Field(
+        default=-1, ge=-1, description="Processus ajustant les folds (-1 = tous)"
+    )
+    cache_dir: str = Field(
+        default="data/cache/folds", description="Cache des indices de folds"
+    )
+    in_train: bool = Field(
+        default=False, description="Lancer aussi la CV dans train_model"
+    )
+
+    @field_validator("n_workers")
+    @classmethod
+    def validate_n_workers(cls, v: int) -> int:
+        if v == 0:
+            raise ValueError("n_workers doit être -1 (tous les coeurs) ou >= 1")
+        return v
+
+
+class SyntheticConfig(BaseModel):
+    """Configuration du générateur de données synthétiques (benchmarks)"""
+
+    n_rows: int = Field(default=1_000_000, gt=0, description="Nombre de lignes")
+    chunk_size: int = Field(
+        default=100_000, gt=0, description="Taille des morceaux générés et écrits"
+    )
+    seed: int = Field(default=42, ge=0, description="Graine du générateur")
+    output_path: str = Field(
+        default="data/synthetic/iris_synthetic.parquet",
+        description="Fichier Parquet produit",
+    )
 
 
 class Config(BaseModel):
@@ -47,6 +174,10 @@ class Config(BaseModel):
 
     data: DataConfig = Field(default_factory=DataConfig)
     train: TrainConfig = Field(default_factory=TrainConfig)
+    tracking: TrackingConfig = Field(default_factory=TrackingConfig)
+    cv: CVConfig = Field(default_factory=CVConfig)
+    profiling: ProfilingConfig = Field(default_factory=ProfilingConfig)
+    synthetic: SyntheticConfig = Field(default_factory=SyntheticConfig)
 
 
 def load_config(config_path: Optional[str] = None) -> Config:
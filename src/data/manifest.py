@@ -0,0 +1,87 @@
+"""
+Manifeste du dataset préparé (data/processed/manifest.json)
+Écrit par l'étape prepare, lu par l'entraînement et le serving : schéma,
+noms des classes, nombre de lignes et empreinte SHA-256 de chaque fichier.
+Évite de recharger le dataset scikit-learn juste pour ses métadonnées.
+"""
+
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pyarrow.parquet as pq
+
+from src.data.schema import FEATURE_COLUMNS, TARGET_COLUMN, TARGET_NAME_COLUMN, dtypes
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+
+def file_sha256(path: Path, block_size: int = 1 << 20) -> str:
+    """Empreinte SHA-256 d'un fichier, lu par blocs (mémoire bornée)"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def build_manifest(files: Dict[str, Path], target_names: List[str]) -> dict:
+    """
+    Construit le manifeste des fichiers Parquet d'un dataset
+
+    Args:
+        files: Fichiers par split (ex: {"train": ..., "test": ...})
+        target_names: Noms des classes (dans l'ordre des codes)
+
+    Returns:
+        dict: Manifeste sérialisable en JSON (sans horodatage : reproductible)
+    """
+    return {
+        "version": MANIFEST_VERSION,
+        "schema": {col: str(dtype.__name__) for col, dtype in dtypes().items()},
+        "feature_names": list(FEATURE_COLUMNS),
+        "target_column": TARGET_COLUMN,
+        "target_name_column": TARGET_NAME_COLUMN,
+        "target_names": list(target_names),
+        "files": {
+            split: {
+                "path": path.name,
+                # Nombre de lignes lu dans le pied de page Parquet (pas de lecture)
+                "rows": pq.ParquetFile(path).metadata.num_rows,
+                "sha256": file_sha256(path),
+            }
+            for split, path in files.items()
+        },
+    }
+
+
+def write_manifest(
+    processed_dir: Path, files: Dict[str, Path], target_names: List[str]
+) -> Path:
+    """Écrit le manifeste dans `processed_dir` et retourne son chemin"""
+    manifest = build_manifest(files, target_names)
+    path = processed_dir / MANIFEST_FILENAME
+    path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    logger.info(f"📇 Manifeste du dataset sauvegardé dans : {path}")
+    return path
+
+
+def load_manifest(processed_dir: Path) -> Optional[dict]:
+    """Charge le manifeste s'il existe (None sinon)"""
+    path = Path(processed_dir) / MANIFEST_FILENAME
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def dataset_metadata(manifest: dict) -> dict:
+    """Métadonnées attendues par l'évaluation (feature_names, target_names)"""
+    return {
+        "feature_names": list(manifest["feature_names"]),
+        "target_names": list(manifest["target_names"]),
+    }
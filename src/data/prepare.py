@@ -2,17 +2,43 @@
 Script de préparation des données pour le dataset Iris
 Utilisé dans le pipeline DVC (Semaine 4)
 Lit les paramètres depuis params.yaml avec validation Pydantic
+Écrit des fichiers Parquet typés (float32/int8), CSV en export optionnel
+
+Mode flux (data.source_path) : la source est lue par morceaux et chaque ligne
+est affectée à train/test par hachage déterministe, sans mélange global. Le
+fichier brut data/raw/iris.parquet est alors la source typée (le dataset Iris
+n'est pas chargé). DVC ne suit pas le contenu de la source : après l'avoir
+régénérée, relancer `dvc repro -f prepare`.
 """
 
 import logging
+import time
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Iterator, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from sklearn.datasets import load_iris
 from sklearn.model_selection import train_test_split
 
 from src.config import get_config
+from src.data.manifest import write_manifest
+from src.data.profile import ProfileAccumulator, write_reference_profile
+from src.data.schema import (
+    FEATURE_COLUMNS,
+    RAW_FILENAME,
+    TARGET_COLUMN,
+    TARGET_NAME_COLUMN,
+    TARGET_NAMES,
+    TEST_FILENAME,
+    TRAIN_FILENAME,
+    apply_schema,
+    arrow_schema,
+    dtypes,
+)
+from src.profiling import TIMINGS_FILENAME, PipelineProfiler
 
 # Configuration du logging
 logging.basicConfig(
@@ -21,58 +47,269 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def _save(df: pd.DataFrame, path: Path, export_csv: bool) -> None:
+    """Sauvegarde en Parquet (et en CSV si l'export est demandé)"""
+    df.to_parquet(path, index=False)
+    if export_csv:
+        df.to_csv(path.with_suffix(".csv"), index=False)
+
+
+_MASK64 = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+
+def _splitmix64(x: np.ndarray) -> np.ndarray:
+    """Mélangeur splitmix64 vectorisé (uint64, débordements volontaires)"""
+    with np.errstate(over="ignore"):
+        x = (x + np.uint64(0x9E3779B97F4A7C15)) & _MASK64
+        x = ((x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)) & _MASK64
+        x = ((x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)) & _MASK64
+        return x ^ (x >> np.uint64(31))
+
+
+def hash_split_mask(
+    codes: np.ndarray, ranks: np.ndarray, test_size: float, random_state: int
+) -> np.ndarray:
+    """
+    Affectation train/test déterministe par hachage, stratifiée par classe
+
+    La clé d'une ligne est (graine, classe, rang de la ligne dans sa classe) :
+    chaque strate est tirée indépendamment des autres, et une même ligne
+    tombe toujours du même côté quel que soit le découpage en morceaux.
+
+    Args:
+        codes: Classes encodées des lignes
+        ranks: Rang de chaque ligne parmi les lignes de sa classe
+        test_size: Proportion attendue de lignes de test par classe
+        random_state: Graine
+
+    Returns:
+        np.ndarray: Masque booléen (True = test)
+    """
+    seed = _splitmix64(np.array([random_state], dtype=np.uint64))
+    key = _splitmix64(seed ^ codes.astype(np.uint64))
+    key = _splitmix64(key ^ ranks.astype(np.uint64))
+    # 53 bits de poids fort -> uniforme dans [0, 1)
+    uniform = (key >> np.uint64(11)).astype(np.float64) / float(1 << 53)
+    return uniform < test_size
+
+
+def _iter_source_chunks(path: Path, chunk_size: int) -> Iterator[pd.DataFrame]:
+    """Lit la source (Parquet ou CSV) par morceaux, colonnes utiles seulement"""
+    columns = FEATURE_COLUMNS + [TARGET_COLUMN]
+    if path.suffix == ".parquet":
+        parquet_file = pq.ParquetFile(path)
+        for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=columns):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(
+            path, usecols=columns, dtype=dtypes(), chunksize=chunk_size
+        )
+
+
+class _IncrementalWriter:
+    """Écriture Parquet (et CSV optionnel) morceau par morceau"""
+
+    def __init__(self, path: Path, export_csv: bool):
+        self.path = path
+        self.schema = arrow_schema()
+        self.writer = pq.ParquetWriter(path, self.schema)
+        self.csv_path = path.with_suffix(".csv") if export_csv else None
+        self.n_rows = 0
+
+    def write(self, df: pd.DataFrame) -> None:
+        self.writer.write_table(
+            pa.Table.from_pandas(df, schema=self.schema, preserve_index=False)
+        )
+        if self.csv_path is not None:
+            df.to_csv(self.csv_path, mode="a", header=self.n_rows == 0, index=False)
+        self.n_rows += len(df)
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+def prepare_streaming(
+    source_path: Path,
+    target_names: List[str],
+    test_size: float,
+    random_state: int,
+    chunk_size: int,
+    export_csv: bool,
+    processed_dir: Path = Path("data/processed"),
+    raw_path: Optional[Path] = None,
+) -> Tuple[Path, Path]:
+    """
+    Découpe train/test en flux : mémoire bornée par `chunk_size`
+    La source typée est recopiée dans `raw_path` si fourni (fichier brut
+    cohérent avec les splits)
+
+    Returns:
+        Tuple[Path, Path]: Chemins vers les fichiers train.parquet et test.parquet
+    """
+    processed_dir.mkdir(parents=True, exist_ok=True)
+    train_path = processed_dir / TRAIN_FILENAME
+    test_path = processed_dir / TEST_FILENAME
+    output_paths = [train_path, test_path] + ([raw_path] if raw_path else [])
+    if export_csv:
+        # Le CSV est écrit en mode ajout : repartir de fichiers vides
+        for path in output_paths:
+            path.with_suffix(".csv").unlink(missing_ok=True)
+
+    logger.info(
+        f"🌊 Préparation en flux depuis : {source_path} (chunk_size={chunk_size})"
+    )
+    n_classes = len(target_names)
+    class_counts = np.zeros(n_classes, dtype=np.int64)
+    test_counts = np.zeros(n_classes, dtype=np.int64)
+    train_writer = _IncrementalWriter(train_path, export_csv)
+    test_writer = _IncrementalWriter(test_path, export_csv)
+    raw_writer = _IncrementalWriter(raw_path, export_csv) if raw_path else None
+    profile = ProfileAccumulator(target_names)
+    start = time.perf_counter()
+    try:
+        for chunk in _iter_source_chunks(source_path, chunk_size):
+            df = apply_schema(chunk, target_names)
+            if raw_writer is not None:
+                raw_writer.write(df)
+            codes = df[TARGET_COLUMN].to_numpy().astype(np.int64)
+
+            # Rang dans la classe = lignes déjà vues de la classe + cumcount local
+            ranks = df.groupby(TARGET_COLUMN, observed=True).cumcount().to_numpy()
+            ranks = ranks + class_counts[codes]
+            class_counts += np.bincount(codes, minlength=n_classes)
+
+            is_test = hash_split_mask(codes, ranks, test_size, random_state)
+            test_counts += np.bincount(codes[is_test], minlength=n_classes)
+            train_df = df[~is_test]
+            train_writer.write(train_df)
+            # Profil de référence fusionné morceau par morceau
+            profile.update(train_df)
+            test_writer.write(df[is_test])
+    finally:
+        train_writer.close()
+        test_writer.close()
+        if raw_writer is not None:
+            raw_writer.close()
+
+    elapsed = time.perf_counter() - start
+    n_rows = int(class_counts.sum())
+    if raw_path is not None:
+        logger.info(f"💾 Dataset brut (source typée) sauvegardé dans : {raw_path}")
+    logger.info(f"💾 Dataset d'entraînement sauvegardé dans : {train_path}")
+    logger.info(f"💾 Dataset de test sauvegardé dans : {test_path}")
+    logger.info(f"   Train: {train_writer.n_rows} échantillons")
+    logger.info(f"   Test: {test_writer.n_rows} échantillons")
+    logger.info(
+        f"   Débit: {n_rows / max(elapsed, 1e-9):,.0f} lignes/s ({elapsed:.2f}s)"
+    )
+    for name, total, n_test in zip(target_names, class_counts, test_counts):
+        logger.info(f"   {name}: {total} lignes, test={n_test / max(total, 1):.3f}")
+
+    write_manifest(
+        processed_dir, {"train": train_path, "test": test_path}, target_names
+    )
+    if profile.n:
+        write_reference_profile(profile.to_profile(), processed_dir)
+    return train_path, test_path
+
+
+def _write_profile(profiler: PipelineProfiler, data_dir: Path = Path("data")) -> None:
+    """Arrête le profileur et écrit data/timings.json (+ profil détaillé)"""
+    profiler.stop()
+    profiler.write_timings(data_dir / TIMINGS_FILENAME)
+    if profiler.profiler != "none":
+        profiler.write_profile(data_dir / "profile")
+
+
 def prepare_iris_data(
-    test_size: Optional[float] = None, random_state: Optional[int] = None
+    test_size: Optional[float] = None,
+    random_state: Optional[int] = None,
+    export_csv: Optional[bool] = None,
+    source_path: Optional[str] = None,
+    chunk_size: Optional[int] = None,
 ) -> Tuple[Path, Path]:
     """
     Prépare le dataset Iris et le divise en train/test
-    Sauvegarde les fichiers dans data/processed/
+    Sauvegarde les fichiers Parquet typés dans data/processed/
 
     Args:
         test_size: Proportion du dataset pour le test (surcharge params.yaml si fourni)
         random_state: Graine aléatoire (surcharge params.yaml si fourni)
+        export_csv: Exporter aussi en CSV (surcharge params.yaml si fourni)
+        source_path: Source Parquet/CSV à découper en flux (None = Iris en mémoire)
+        chunk_size: Taille des morceaux du mode flux (surcharge params.yaml si fourni)
 
     Returns:
-        Tuple[Path, Path]: Chemins vers les fichiers train.csv et test.csv
+        Tuple[Path, Path]: Chemins vers les fichiers train.parquet et test.parquet
     """
     config = get_config()
     test_size = test_size if test_size is not None else config.data.test_size
     random_state = (
         random_state if random_state is not None else config.data.random_state
     )
+    export_csv = export_csv if export_csv is not None else config.data.export_csv
+    source_path = source_path or config.data.source_path
+    chunk_size = chunk_size or config.data.chunk_size
 
     logger.info("🌱 Chargement du dataset Iris...")
     logger.info(f"   Paramètres: test_size={test_size}, random_state={random_state}")
 
-    iris = load_iris()
-
-    # Créer un DataFrame
-    df = pd.DataFrame(iris.data, columns=iris.feature_names)
-    df["target"] = iris.target
-    df["target_name"] = df["target"].apply(lambda x: iris.target_names[x])
+    profiler = PipelineProfiler(
+        "prepare",
+        profiler=config.profiling.profiler,
+        sampling_interval_ms=config.profiling.sampling_interval_ms,
+    )
+    profiler.start()
 
     # Créer les répertoires
     raw_dir = Path("data/raw")
     processed_dir = Path("data/processed")
     raw_dir.mkdir(parents=True, exist_ok=True)
     processed_dir.mkdir(parents=True, exist_ok=True)
+    raw_path = raw_dir / RAW_FILENAME
+
+    if source_path:
+        # Fichier brut = source typée : brut, train et test viennent de la source
+        with profiler.stage("stream_split"):
+            paths = prepare_streaming(
+                Path(source_path),
+                TARGET_NAMES,
+                test_size=test_size,
+                random_state=random_state,
+                chunk_size=chunk_size,
+                export_csv=export_csv,
+                processed_dir=processed_dir,
+                raw_path=raw_path,
+            )
+        _write_profile(profiler)
+        return paths
+
+    with profiler.stage("load"):
+        iris = load_iris()
+
+        # Créer un DataFrame typé (float32 / int8 / catégoriel)
+        df = pd.DataFrame(iris.data, columns=iris.feature_names)
+        df["target"] = iris.target
+        df = apply_schema(df, list(iris.target_names))
 
     # Sauvegarder le dataset complet (raw)
-    raw_path = raw_dir / "iris.csv"
-    df.to_csv(raw_path, index=False)
+    with profiler.stage("save_raw"):
+        _save(df, raw_path, export_csv)
     logger.info(f"💾 Dataset brut sauvegardé dans : {raw_path}")
 
     # Diviser en train/test avec les paramètres validés
-    train_df, test_df = train_test_split(
-        df, test_size=test_size, random_state=random_state, stratify=df["target"]
-    )
+    with profiler.stage("split"):
+        train_df, test_df = train_test_split(
+            df, test_size=test_size, random_state=random_state, stratify=df["target"]
+        )
 
     # Sauvegarder train et test
-    train_path = processed_dir / "train.csv"
-    test_path = processed_dir / "test.csv"
+    train_path = processed_dir / TRAIN_FILENAME
+    test_path = processed_dir / TEST_FILENAME
 
-    train_df.to_csv(train_path, index=False)
-    test_df.to_csv(test_path, index=False)
+    with profiler.stage("save_splits"):
+        _save(train_df, train_path, export_csv)
+        _save(test_df, test_path, export_csv)
 
     logger.info(f"💾 Dataset d'entraînement sauvegardé dans : {train_path}")
     logger.info(f"💾 Dataset de test sauvegardé dans : {test_path}")
@@ -85,8 +322,18 @@ def prepare_iris_data(
     logger.info(f"   Features: {len(iris.feature_names)}")
     logger.info(f"   Classes: {len(iris.target_names)}")
     logger.info(f"   Distribution des classes (train):")
-    logger.info(train_df["target_name"].value_counts().to_string())
+    logger.info(train_df[TARGET_NAME_COLUMN].value_counts().to_string())
 
+    with profiler.stage("manifest"):
+        write_manifest(
+            processed_dir,
+            {"train": train_path, "test": test_path},
+            list(iris.target_names),
+        )
+    with profiler.stage("reference_profile"):
+        profile = ProfileAccumulator(list(iris.target_names)).update(train_df)
+        write_reference_profile(profile.to_profile(), processed_dir)
+    _write_profile(profiler)
     logger.info("✅ Préparation des données terminée !")
     return train_path, test_path
 
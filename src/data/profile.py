@@ -0,0 +1,214 @@
+"""
+Profil de référence du dataset d'entraînement (reference_profile.json)
+Écrit par l'étape prepare (data/processed/), copié à côté du modèle par
+l'entraînement (models/, artefact MLflow) et chargé par le serving au
+démarrage : le monitoring n'a jamais besoin du dataset brut.
+
+Par feature : effectif, moyenne, variance, min / max, quantiles et
+histogramme à classes fixes ; effectifs et fréquences par classe. Les
+classes d'histogramme couvrent la plage validée par l'API ([0, 20] cm) : le
+trafic et la référence sont comptés sur les mêmes bornes.
+
+Le calcul est vectorisé et fusionnable (ProfileAccumulator) : un profil
+construit morceau par morceau est identique à celui du dataset complet.
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from src.data.schema import FEATURE_COLUMNS, TARGET_COLUMN
+
+logger = logging.getLogger(__name__)
+
+PROFILE_FILENAME = "reference_profile.json"
+PROFILE_VERSION = 2
+
+# Même plage que la validation des entrées de l'API (IrisFeatures)
+FEATURE_RANGE = (0.0, 20.0)
+HISTOGRAM_BINS = 40
+# Histogramme fin (non exporté) dont sont tirés les quantiles : erreur
+# bornée par la largeur d'une classe (0.01 cm)
+QUANTILE_BINS = 2000
+QUANTILES = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+
+
+def histogram_edges(bins: int = HISTOGRAM_BINS) -> np.ndarray:
+    """Bornes des classes d'histogramme (bins + 1 valeurs)"""
+    return np.linspace(*FEATURE_RANGE, bins + 1)
+
+
+def bin_indices(X: np.ndarray, bins: int = HISTOGRAM_BINS) -> np.ndarray:
+    """
+    Classe d'histogramme de chaque valeur (vectorisé)
+
+    Les valeurs hors plage tombent dans la première / dernière classe ;
+    la borne haute (20) appartient à la dernière classe.
+    """
+    low, high = FEATURE_RANGE
+    scaled = (np.asarray(X, dtype=np.float64) - low) * (bins / (high - low))
+    return np.clip(scaled.astype(np.int64), 0, bins - 1)
+
+
+def _bincount_2d(bins: np.ndarray, n_bins: int) -> np.ndarray:
+    """Histogramme de chaque colonne en un seul bincount (n_features, n_bins)"""
+    n_features = bins.shape[1]
+    offsets = np.arange(n_features) * n_bins
+    counts = np.bincount((bins + offsets).ravel(), minlength=n_features * n_bins)
+    return counts.reshape(n_features, n_bins)
+
+
+class ProfileAccumulator:
+    """
+    Statistiques fusionnables d'un flux de morceaux du schéma prepare
+
+    Usage:
+        accumulator = ProfileAccumulator(target_names)
+        for chunk in chunks:
+            accumulator.update(chunk)
+        profile = accumulator.to_profile()
+    """
+
+    def __init__(self, target_names: List[str]):
+        n_features = len(FEATURE_COLUMNS)
+        self.target_names = list(target_names)
+        self.n = 0
+        self.mean = np.zeros(n_features)
+        self.m2 = np.zeros(n_features)
+        self.min = np.full(n_features, np.inf)
+        self.max = np.full(n_features, -np.inf)
+        self.histogram = np.zeros((n_features, HISTOGRAM_BINS), dtype=np.int64)
+        self.fine_histogram = np.zeros((n_features, QUANTILE_BINS), dtype=np.int64)
+        self.class_counts = np.zeros(len(self.target_names), dtype=np.int64)
+
+    def update(self, df: pd.DataFrame) -> "ProfileAccumulator":
+        """Intègre un morceau (DataFrame typé)"""
+        if len(df) == 0:
+            return self
+        X = df[FEATURE_COLUMNS].to_numpy(dtype=np.float64)
+        chunk = ProfileAccumulator(self.target_names)
+        chunk.n = len(X)
+        chunk.mean = X.mean(axis=0)
+        chunk.m2 = ((X - chunk.mean) ** 2).sum(axis=0)
+        chunk.min = X.min(axis=0)
+        chunk.max = X.max(axis=0)
+        chunk.histogram = _bincount_2d(bin_indices(X), HISTOGRAM_BINS)
+        chunk.fine_histogram = _bincount_2d(
+            bin_indices(X, QUANTILE_BINS), QUANTILE_BINS
+        )
+        codes = df[TARGET_COLUMN].to_numpy().astype(np.int64)
+        chunk.class_counts = np.bincount(codes, minlength=len(self.target_names))
+        return self.merge(chunk)
+
+    def merge(self, other: "ProfileAccumulator") -> "ProfileAccumulator":
+        """
+        Fusionne les statistiques d'un morceau disjoint (en place)
+
+        Moyennes et variances sont combinées exactement (formule de Chan),
+        histogrammes et effectifs additionnés.
+        """
+        if other.n == 0:
+            return self
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.m2 = self.m2 + other.m2 + delta**2 * self.n * other.n / n
+        self.mean = self.mean + delta * other.n / n
+        self.n = n
+        self.min = np.minimum(self.min, other.min)
+        self.max = np.maximum(self.max, other.max)
+        self.histogram += other.histogram
+        self.fine_histogram += other.fine_histogram
+        self.class_counts += other.class_counts
+        return self
+
+    def quantiles(self) -> np.ndarray:
+        """Quantiles QUANTILES de chaque feature (n_features, len(QUANTILES))"""
+        width = (FEATURE_RANGE[1] - FEATURE_RANGE[0]) / QUANTILE_BINS
+        result = np.empty((len(FEATURE_COLUMNS), len(QUANTILES)))
+        for j, counts in enumerate(self.fine_histogram):
+            cumulative = np.cumsum(counts)
+            ranks = np.asarray(QUANTILES) * self.n
+            # Première classe atteignant le rang, interpolation linéaire dedans
+            index = np.minimum(
+                np.searchsorted(cumulative, ranks, side="left"), QUANTILE_BINS - 1
+            )
+            before = cumulative[index] - counts[index]
+            fraction = (ranks - before) / np.maximum(counts[index], 1)
+            values = FEATURE_RANGE[0] + (index + fraction) * width
+            result[j] = np.clip(values, self.min[j], self.max[j])
+        return result
+
+    def to_profile(self) -> dict:
+        """Profil sérialisable en JSON"""
+        if self.n == 0:
+            raise ValueError("Profil de référence vide : aucune ligne")
+        quantiles = self.quantiles()
+        features = {}
+        for j, name in enumerate(FEATURE_COLUMNS):
+            features[name] = {
+                "mean": float(self.mean[j]),
+                "variance": float(self.m2[j] / self.n),
+                "min": float(self.min[j]),
+                "max": float(self.max[j]),
+                "quantiles": {
+                    str(q): float(value) for q, value in zip(QUANTILES, quantiles[j])
+                },
+                "histogram": self.histogram[j].tolist(),
+            }
+        return {
+            "version": PROFILE_VERSION,
+            "n_rows": int(self.n),
+            "feature_names": list(FEATURE_COLUMNS),
+            "target_names": list(self.target_names),
+            "histogram_range": list(FEATURE_RANGE),
+            "histogram_bins": HISTOGRAM_BINS,
+            "features": features,
+            "class_counts": self.class_counts.tolist(),
+            "class_frequencies": (self.class_counts / self.n).tolist(),
+        }
+
+
+def build_reference_profile(df: pd.DataFrame, target_names: List[str]) -> dict:
+    """
+    Résume un DataFrame typé (schéma de l'étape prepare) en un seul morceau
+
+    Args:
+        df: Données de référence (en pratique le split train)
+        target_names: Noms des classes (dans l'ordre des codes)
+
+    Returns:
+        dict: Profil sérialisable en JSON
+    """
+    return ProfileAccumulator(target_names).update(df).to_profile()
+
+
+def write_reference_profile(profile: dict, directory: Path) -> Path:
+    """Écrit le profil dans `directory` et retourne son chemin"""
+    path = Path(directory) / PROFILE_FILENAME
+    path.write_text(json.dumps(profile, indent=2) + "\n", encoding="utf-8")
+    logger.info(f"📐 Profil de référence écrit : {path}")
+    return path
+
+
+def load_reference_profile(path: Path) -> dict:
+    """
+    Charge un profil de référence
+
+    Raises:
+        FileNotFoundError: Si le fichier n'existe pas
+        ValueError: Si les classes d'histogramme ne correspondent pas
+    """
+    profile = json.loads(Path(path).read_text(encoding="utf-8"))
+    if (
+        profile.get("histogram_bins") != HISTOGRAM_BINS
+        or tuple(profile.get("histogram_range", ())) != FEATURE_RANGE
+    ):
+        raise ValueError(
+            f"Profil {path} : histogrammes incompatibles "
+            f"(attendu {HISTOGRAM_BINS} classes sur {FEATURE_RANGE})"
+        )
+    return profile
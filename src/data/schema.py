@@ -0,0 +1,64 @@
+"""
+Schéma typé des données Iris échangées entre les étapes du pipeline
+Les features sont stockées en float32 (précision utilisée en interne par les
+arbres scikit-learn) et la cible en int8 : pas de perte côté modèle.
+"""
+
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+FEATURE_COLUMNS: List[str] = [
+    "sepal length (cm)",
+    "sepal width (cm)",
+    "petal length (cm)",
+    "petal width (cm)",
+]
+TARGET_COLUMN = "target"
+TARGET_NAME_COLUMN = "target_name"
+# Classes Iris dans l'ordre des codes de la cible (sources du mode flux comprises)
+TARGET_NAMES: List[str] = ["setosa", "versicolor", "virginica"]
+
+FEATURE_DTYPE = np.float32
+TARGET_DTYPE = np.int8
+
+# Noms des fichiers produits par l'étape prepare
+RAW_FILENAME = "iris.parquet"
+TRAIN_FILENAME = "train.parquet"
+TEST_FILENAME = "test.parquet"
+
+
+def dtypes() -> Dict[str, object]:
+    """Types pandas des colonnes numériques (pour read_csv / astype)"""
+    return {
+        **{col: FEATURE_DTYPE for col in FEATURE_COLUMNS},
+        TARGET_COLUMN: TARGET_DTYPE,
+    }
+
+
+def apply_schema(df: pd.DataFrame, target_names: List[str]) -> pd.DataFrame:
+    """
+    Applique le schéma typé : features float32, cible int8, nom de classe
+    catégoriel (dictionnaire Parquet) calculé de façon vectorisée
+
+    Returns:
+        pd.DataFrame: DataFrame typé (colonnes dans l'ordre du schéma)
+    """
+    typed = df[FEATURE_COLUMNS + [TARGET_COLUMN]].astype(dtypes())
+    typed[TARGET_NAME_COLUMN] = pd.Categorical.from_codes(
+        typed[TARGET_COLUMN], categories=list(target_names)
+    )
+    return typed
+
+
+def arrow_schema() -> pa.Schema:
+    """Schéma Arrow équivalent (pour les écritures Parquet incrémentales)"""
+    return pa.schema(
+        [pa.field(col, pa.float32()) for col in FEATURE_COLUMNS]
+        + [
+            pa.field(TARGET_COLUMN, pa.int8()),
+            pa.field(TARGET_NAME_COLUMN, pa.dictionary(pa.int8(), pa.string())),
+        ]
+    )
@@ -0,0 +1,177 @@
+"""
+Générateur de datasets synthétiques distribués comme Iris (benchmarks de charge)
+Une gaussienne multivariée par classe est ajustée sur les données réelles, puis
+les lignes sont tirées par morceaux (mémoire bornée) et écrites au schéma typé
+de schema.py : le fichier produit se lit comme train.parquet / test.parquet.
+
+Déterministe : même graine et même chunk_size donnent le même fichier.
+
+Usage:
+    poetry run python -m src.data.synthetic --n-rows 10000000
+"""
+
+import argparse
+import logging
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sklearn.datasets import load_iris
+
+from src.config import get_config
+from src.data.schema import FEATURE_COLUMNS, TARGET_COLUMN, apply_schema, arrow_schema
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+# Bornes des mesures acceptées par l'API (voir serving/models.py)
+FEATURE_MIN = 0.0
+FEATURE_MAX = 20.0
+
+
+@dataclass
+class ClassGaussians:
+    """Paramètres des gaussiennes par classe (une ligne par classe)"""
+
+    means: np.ndarray  # (n_classes, n_features)
+    cholesky: np.ndarray  # (n_classes, n_features, n_features)
+    priors: np.ndarray  # (n_classes,)
+    target_names: List[str]
+
+
+def fit_class_gaussians(
+    X: np.ndarray, y: np.ndarray, target_names: List[str]
+) -> ClassGaussians:
+    """
+    Ajuste une gaussienne multivariée (moyenne + covariance) par classe
+
+    Args:
+        X: Features réelles
+        y: Classes encodées 0..n_classes-1
+        target_names: Noms des classes
+
+    Returns:
+        ClassGaussians: Paramètres prêts pour l'échantillonnage
+    """
+    n_classes, n_features = len(target_names), X.shape[1]
+    means = np.empty((n_classes, n_features))
+    cholesky = np.empty((n_classes, n_features, n_features))
+    priors = np.bincount(y, minlength=n_classes) / len(y)
+
+    for k in range(n_classes):
+        X_k = X[y == k]
+        means[k] = X_k.mean(axis=0)
+        # Légère régularisation : certaines covariances Iris sont presque singulières
+        cov = np.cov(X_k, rowvar=False) + 1e-6 * np.eye(n_features)
+        cholesky[k] = np.linalg.cholesky(cov)
+
+    return ClassGaussians(means, cholesky, priors, list(target_names))
+
+
+def fit_iris_gaussians() -> ClassGaussians:
+    """Gaussiennes par classe ajustées sur le dataset Iris réel"""
+    iris = load_iris()
+    return fit_class_gaussians(iris.data, iris.target, list(iris.target_names))
+
+
+def iter_synthetic_chunks(
+    n_rows: int,
+    chunk_size: int = 100_000,
+    seed: int = 42,
+    gaussians: Optional[ClassGaussians] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Génère le dataset par morceaux typés (schéma de schema.py)
+
+    Chaque morceau a son propre générateur dérivé de (seed, index du morceau) :
+    le résultat ne dépend pas de l'ordre de consommation.
+
+    Yields:
+        pd.DataFrame: Morceau de `chunk_size` lignes au plus
+    """
+    if n_rows <= 0 or chunk_size <= 0:
+        raise ValueError("n_rows et chunk_size doivent être > 0")
+    gaussians = gaussians or fit_iris_gaussians()
+    n_classes, n_features = gaussians.means.shape
+
+    for index, start in enumerate(range(0, n_rows, chunk_size)):
+        size = min(chunk_size, n_rows - start)
+        rng = np.random.default_rng(np.random.SeedSequence([seed, index]))
+
+        y = rng.choice(n_classes, size=size, p=gaussians.priors)
+        z = rng.standard_normal((size, n_features))
+        # x = mu_k + L_k z, vectorisé sur toutes les lignes du morceau
+        X = gaussians.means[y] + np.einsum("nij,nj->ni", gaussians.cholesky[y], z)
+        np.clip(X, FEATURE_MIN, FEATURE_MAX, out=X)
+
+        df = pd.DataFrame(X, columns=FEATURE_COLUMNS)
+        df[TARGET_COLUMN] = y
+        yield apply_schema(df, gaussians.target_names)
+
+
+def generate_synthetic_dataset(
+    n_rows: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    seed: Optional[int] = None,
+    output_path: Optional[str] = None,
+) -> Path:
+    """
+    Écrit un dataset synthétique en Parquet, morceau par morceau
+
+    Args:
+        n_rows: Nombre de lignes (surcharge params.yaml si fourni)
+        chunk_size: Taille des morceaux (surcharge params.yaml si fourni)
+        seed: Graine (surcharge params.yaml si fourni)
+        output_path: Fichier de sortie (surcharge params.yaml si fourni)
+
+    Returns:
+        Path: Chemin du fichier Parquet écrit
+    """
+    config = get_config().synthetic
+    n_rows = n_rows or config.n_rows
+    chunk_size = chunk_size or config.chunk_size
+    seed = seed if seed is not None else config.seed
+    output_path = Path(output_path or config.output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    logger.info(
+        f"🧪 Génération de {n_rows} lignes synthétiques "
+        f"(chunk_size={chunk_size}, seed={seed})"
+    )
+    schema = arrow_schema()
+    start = time.perf_counter()
+    with pq.ParquetWriter(output_path, schema) as writer:
+        for chunk in iter_synthetic_chunks(n_rows, chunk_size, seed):
+            writer.write_table(
+                pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+            )
+    elapsed = time.perf_counter() - start
+
+    logger.info(
+        f"💾 Dataset synthétique sauvegardé dans : {output_path} "
+        f"({elapsed:.2f}s, {n_rows / elapsed:,.0f} lignes/s)"
+    )
+    return output_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Génère un dataset Iris synthétique")
+    parser.add_argument("--n-rows", type=int, help="Nombre de lignes")
+    parser.add_argument("--chunk-size", type=int, help="Taille des morceaux")
+    parser.add_argument("--seed", type=int, help="Graine du générateur")
+    parser.add_argument("--output", help="Fichier Parquet de sortie")
+    args = parser.parse_args()
+
+    generate_synthetic_dataset(
+        n_rows=args.n_rows,
+        chunk_size=args.chunk_size,
+        seed=args.seed,
+        output_path=args.output,
+    )
@@ -6,78 +6,123 @@ Calcule les métriques et les log dans MLflow
 import logging
 import tempfile
 from pathlib import Path
-from typing import Any, Dict, Tuple
+from typing import Any, Dict, Optional, Tuple
 
 import mlflow
 import numpy as np
-from sklearn.metrics import (
-    accuracy_score,
-    classification_report,
-    confusion_matrix,
-    f1_score,
-    precision_score,
-    recall_score,
+
+from src.evaluation.metrics import (
+    ClassificationMetrics,
+    ConfusionMatrixAccumulator,
+    compute_classification_metrics,
+    encode_labels,
+    format_classification_report,
 )
+from src.tracking import BatchedMlflowLogger
 
 logger = logging.getLogger(__name__)
 
 
-def evaluate_model(
-    model: Any, X_test: Any, y_test: Any, iris_metadata: Dict
-) -> Tuple[Dict, Dict]:
+def _model_labels(model: Any, n_classes: int) -> Optional[np.ndarray]:
+    """Labels du modèle à ré-encoder, None s'ils sont déjà 0..n-1"""
+    classes = getattr(model, "classes_", None)
+    if classes is None or np.array_equal(classes, np.arange(n_classes)):
+        return None
+    return np.asarray(classes)
+
+
+def predict_confusion_matrix(
+    model: Any,
+    X_test: Any,
+    y_test: Any,
+    n_classes: int,
+    chunk_size: Optional[int] = None,
+) -> ConfusionMatrixAccumulator:
     """
-    Évalue un modèle et retourne les métriques et métadonnées
-    Les métriques sont automatiquement loggées dans MLflow
+    Prédit et accumule la matrice de confusion, éventuellement par morceaux
 
     Args:
         model: Modèle entraîné
         X_test: Features de test
         y_test: Labels de test
-        iris_metadata: Métadonnées du dataset (feature_names, target_names)
+        n_classes: Nombre de classes
+        chunk_size: Taille des morceaux de prédiction (None = tout d'un coup)
 
     Returns:
-        Tuple[Dict, Dict]: (métriques, métadonnées)
+        ConfusionMatrixAccumulator: Matrice de confusion accumulée
     """
-    # Prédictions
-    y_pred = model.predict(X_test)
-    accuracy = accuracy_score(y_test, y_pred)
+    labels = _model_labels(model, n_classes)
+    accumulator = ConfusionMatrixAccumulator(n_classes)
+    n_rows = len(y_test)
+    step = chunk_size or max(n_rows, 1)
+    for start in range(0, n_rows, step):
+        y_pred = model.predict(X_test[start : start + step])
+        accumulator.update(
+            encode_labels(y_test[start : start + step], labels),
+            encode_labels(y_pred, labels),
+        )
+    return accumulator
 
-    # Métriques détaillées
-    precision = precision_score(y_test, y_pred, average="weighted")
-    recall = recall_score(y_test, y_pred, average="weighted")
-    f1 = f1_score(y_test, y_pred, average="weighted")
 
-    # Métriques par classe
-    precision_per_class = precision_score(y_test, y_pred, average=None)
-    recall_per_class = recall_score(y_test, y_pred, average=None)
-    f1_per_class = f1_score(y_test, y_pred, average=None)
+def log_classification_metrics(
+    result: ClassificationMetrics,
+    iris_metadata: Dict,
+    tracker: Optional[BatchedMlflowLogger] = None,
+) -> Tuple[Dict, Dict]:
+    """
+    Affiche et log dans MLflow les métriques dérivées de la matrice de confusion
+
+    Args:
+        result: Métriques calculées par compute_classification_metrics
+        iris_metadata: Métadonnées du dataset (feature_names, target_names)
+        tracker: Logger MLflow groupé de l'appelant (défaut: un logger dédié,
+            vidé en un seul log_batch)
+
+    Returns:
+        Tuple[Dict, Dict]: (métriques, métadonnées)
+    """
+    accuracy = result.accuracy
+    precision = result.precision_weighted
+    recall = result.recall_weighted
+    f1 = result.f1_weighted
 
     logger.info(f"📊 Précision du modèle : {accuracy:.3f}")
     logger.info(f"   Precision (weighted): {precision:.3f}")
     logger.info(f"   Recall (weighted): {recall:.3f}")
     logger.info(f"   F1-Score (weighted): {f1:.3f}")
     logger.info("\n📋 Rapport de classification :")
-    logger.info(
-        classification_report(
-            y_test, y_pred, target_names=iris_metadata["target_names"]
-        )
-    )
+    logger.info(format_classification_report(result, iris_metadata["target_names"]))
+
+    # Logger les métriques dans MLflow (accumulées puis envoyées par lot)
+    own_tracker = tracker is None
+    if own_tracker:
+        tracker = BatchedMlflowLogger()
 
-    # Logger les métriques dans MLflow
     # Métriques globales
-    mlflow.log_metric("accuracy", accuracy)
-    mlflow.log_metric("precision_weighted", precision)
-    mlflow.log_metric("recall_weighted", recall)
-    mlflow.log_metric("f1_score_weighted", f1)
+    tracker.log_metrics(
+        {
+            "accuracy": accuracy,
+            "precision_weighted": precision,
+            "recall_weighted": recall,
+            "f1_score_weighted": f1,
+        }
+    )
 
     # Métriques par classe
     for i, class_name in enumerate(iris_metadata["target_names"]):
-        mlflow.log_metric(f"precision_{class_name}", precision_per_class[i])
-        mlflow.log_metric(f"recall_{class_name}", recall_per_class[i])
-        mlflow.log_metric(f"f1_score_{class_name}", f1_per_class[i])
+        tracker.log_metrics(
+            {
+                f"precision_{class_name}": result.precision_per_class[i],
+                f"recall_{class_name}": result.recall_per_class[i],
+                f"f1_score_{class_name}": result.f1_per_class[i],
+            }
+        )
+
+    if own_tracker:
+        tracker.close()
 
     # Confusion matrix
-    cm = confusion_matrix(y_test, y_pred)
+    cm = result.confusion_matrix
     # Créer un fichier temporaire pour la confusion matrix
     tmp_file_path = None
     try:
@@ -107,3 +152,38 @@ def evaluate_model(
     }
 
     return metrics, metadata
+
+
+def evaluate_model(
+    model: Any,
+    X_test: Any,
+    y_test: Any,
+    iris_metadata: Dict,
+    tracker: Optional[BatchedMlflowLogger] = None,
+    chunk_size: Optional[int] = None,
+) -> Tuple[Dict, Dict]:
+    """
+    Évalue un modèle et retourne les métriques et métadonnées
+    Les métriques sont automatiquement loggées dans MLflow
+
+    La matrice de confusion est calculée une seule fois (np.bincount) et toutes
+    les métriques globales, pondérées et par classe en sont dérivées.
+
+    Args:
+        model: Modèle entraîné
+        X_test: Features de test
+        y_test: Labels de test
+        iris_metadata: Métadonnées du dataset (feature_names, target_names)
+        tracker: Logger MLflow groupé de l'appelant (défaut: un logger dédié,
+            vidé en un seul log_batch à la fin de l'évaluation)
+        chunk_size: Prédire par morceaux de cette taille (None = tout d'un coup)
+
+    Returns:
+        Tuple[Dict, Dict]: (métriques, métadonnées)
+    """
+    n_classes = len(iris_metadata["target_names"])
+    accumulator = predict_confusion_matrix(
+        model, np.asarray(X_test), np.asarray(y_test), n_classes, chunk_size
+    )
+    result = compute_classification_metrics(accumulator.matrix)
+    return log_classification_metrics(result, iris_metadata, tracker=tracker)
@@ -0,0 +1,206 @@
+"""
+Moteur de métriques de classification en une seule passe
+La matrice de confusion est calculée une fois avec np.bincount, toutes les
+métriques (globales, pondérées, macro, par classe) en sont dérivées.
+Elle peut être accumulée par morceaux pour les grands jeux d'évaluation.
+"""
+
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def encode_labels(y: np.ndarray, labels: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Convertit des labels en indices de classe [0, n_classes)
+
+    Args:
+        y: Labels (déjà entiers 0..n-1 si labels est None)
+        labels: Labels triés (ex: model.classes_) pour les labels non encodés
+
+    Returns:
+        np.ndarray: Indices entiers (int64)
+
+    Raises:
+        ValueError: Si un label est inconnu
+    """
+    y = np.asarray(y)
+    if labels is None:
+        return y.astype(np.int64, copy=False)
+    labels = np.asarray(labels)
+    codes = np.searchsorted(labels, y)
+    codes = np.clip(codes, 0, len(labels) - 1)
+    if not np.array_equal(labels[codes], y):
+        raise ValueError("Labels inconnus dans y (absents de labels)")
+    return codes.astype(np.int64, copy=False)
+
+
+class ConfusionMatrixAccumulator:
+    """Matrice de confusion accumulée par morceaux (lignes = vrai, colonnes = prédit)"""
+
+    def __init__(self, n_classes: int):
+        if n_classes <= 0:
+            raise ValueError("n_classes doit être > 0")
+        self.n_classes = n_classes
+        self.matrix = np.zeros((n_classes, n_classes), dtype=np.int64)
+
+    def update(self, y_true: np.ndarray, y_pred: np.ndarray) -> None:
+        """Ajoute un morceau de prédictions (indices de classe entiers)"""
+        y_true = np.asarray(y_true, dtype=np.int64)
+        y_pred = np.asarray(y_pred, dtype=np.int64)
+        if y_true.shape != y_pred.shape:
+            raise ValueError(
+                f"y_true et y_pred de tailles différentes: "
+                f"{y_true.shape} != {y_pred.shape}"
+            )
+        if y_true.size == 0:
+            return
+        n = self.n_classes
+        if min(y_true.min(), y_pred.min()) < 0 or max(y_true.max(), y_pred.max()) >= n:
+            raise ValueError(f"Indices de classe hors de [0, {n})")
+        self.matrix += np.bincount(y_true * n + y_pred, minlength=n * n).reshape(n, n)
+
+    def merge(self, other: "ConfusionMatrixAccumulator") -> None:
+        """Fusionne une autre matrice (ex: calculée dans un autre processus)"""
+        if other.n_classes != self.n_classes:
+            raise ValueError("Nombres de classes différents")
+        self.matrix += other.matrix
+
+    @property
+    def n_samples(self) -> int:
+        return int(self.matrix.sum())
+
+
+@dataclass
+class ClassificationMetrics:
+    """Métriques dérivées d'une matrice de confusion"""
+
+    confusion_matrix: np.ndarray
+    accuracy: float
+    precision_per_class: np.ndarray
+    recall_per_class: np.ndarray
+    f1_per_class: np.ndarray
+    support: np.ndarray
+    precision_weighted: float
+    recall_weighted: float
+    f1_weighted: float
+    precision_macro: float
+    recall_macro: float
+    f1_macro: float
+
+
+def _safe_divide(num: np.ndarray, den: np.ndarray) -> np.ndarray:
+    """Division élément par élément, 0 si dénominateur nul (zero_division=0)"""
+    num = num.astype(np.float64)
+    out = np.zeros_like(num)
+    np.divide(num, den, out=out, where=den != 0)
+    return out
+
+
+def compute_classification_metrics(cm: np.ndarray) -> ClassificationMetrics:
+    """
+    Dérive toutes les métriques d'une matrice de confusion
+
+    Conventions identiques à scikit-learn (zero_division=0) ; les moyennes macro
+    portent sur les classes présentes dans y_true ou y_pred.
+    """
+    cm = np.asarray(cm, dtype=np.int64)
+    tp = np.diag(cm)
+    support = cm.sum(axis=1)
+    predicted = cm.sum(axis=0)
+    total = support.sum()
+
+    precision = _safe_divide(tp, predicted)
+    recall = _safe_divide(tp, support)
+    f1 = _safe_divide(2 * tp, support + predicted)
+
+    present = (support + predicted) > 0
+    weights = support / total if total else np.zeros_like(support, dtype=np.float64)
+
+    def _macro(values: np.ndarray) -> float:
+        return float(values[present].mean()) if present.any() else 0.0
+
+    return ClassificationMetrics(
+        confusion_matrix=cm,
+        accuracy=float(tp.sum() / total) if total else 0.0,
+        precision_per_class=precision,
+        recall_per_class=recall,
+        f1_per_class=f1,
+        support=support,
+        precision_weighted=float(precision @ weights),
+        recall_weighted=float(recall @ weights),
+        f1_weighted=float(f1 @ weights),
+        precision_macro=_macro(precision),
+        recall_macro=_macro(recall),
+        f1_macro=_macro(f1),
+    )
+
+
+def accumulate_confusion_matrix(
+    chunks: Iterable[Tuple[np.ndarray, np.ndarray]], n_classes: int
+) -> ConfusionMatrixAccumulator:
+    """
+    Accumule la matrice de confusion sur un flux de morceaux (y_true, y_pred)
+
+    Returns:
+        ConfusionMatrixAccumulator: Matrice accumulée
+    """
+    accumulator = ConfusionMatrixAccumulator(n_classes)
+    for y_true, y_pred in chunks:
+        accumulator.update(y_true, y_pred)
+    return accumulator
+
+
+def format_classification_report(
+    metrics: ClassificationMetrics, target_names: Sequence[str], digits: int = 2
+) -> str:
+    """
+    Rapport texte au format de sklearn.metrics.classification_report
+    (sans repasser sur les prédictions)
+    """
+    headers = ["precision", "recall", "f1-score", "support"]
+    width = max(len("weighted avg"), *(len(name) for name in target_names), digits)
+    lines: List[str] = []
+    head_fmt = "{:>{width}s} " + " {:>9}" * len(headers)
+    lines.append(head_fmt.format("", *headers, width=width))
+    lines.append("")
+
+    row_fmt = "{:>{width}s} " + " {:>9.{digits}f}" * 3 + " {:>9}"
+    for i, name in enumerate(target_names):
+        lines.append(
+            row_fmt.format(
+                name,
+                metrics.precision_per_class[i],
+                metrics.recall_per_class[i],
+                metrics.f1_per_class[i],
+                int(metrics.support[i]),
+                width=width,
+                digits=digits,
+            )
+        )
+    lines.append("")
+
+    total = int(metrics.support.sum())
+    acc_fmt = "{:>{width}s} " + " {:>9}" * 2 + " {:>9.{digits}f}" + " {:>9}"
+    lines.append(
+        acc_fmt.format(
+            "accuracy", "", "", metrics.accuracy, total, width=width, digits=digits
+        )
+    )
+    for label, p, r, f in (
+        (
+            "macro avg",
+            metrics.precision_macro,
+            metrics.recall_macro,
+            metrics.f1_macro,
+        ),
+        (
+            "weighted avg",
+            metrics.precision_weighted,
+            metrics.recall_weighted,
+            metrics.f1_weighted,
+        ),
+    ):
+        lines.append(row_fmt.format(label, p, r, f, total, width=width, digits=digits))
+    return "\n".join(lines) + "\n"
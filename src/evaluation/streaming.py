@@ -0,0 +1,336 @@
+"""
+Évaluation en flux (out-of-core) sur de grands jeux de hold-out
+Lit le hold-out sur disque par morceaux, prédit morceau par morceau (en option
+sur un pool de processus) et accumule incrémentalement la matrice de confusion
+et les statistiques de calibration. La mémoire reste bornée par la taille des
+morceaux en vol ; le pic RSS (processus courant et workers du pool) est loggé
+dans le run MLflow. La boucle chronométrée n'est pas tracée (tracemalloc
+ralentirait chaque allocation et fausserait le débit).
+"""
+
+import logging
+import os
+import resource
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple
+
+import mlflow
+import numpy as np
+import pandas as pd
+
+from src.evaluation.evaluate import _model_labels, log_classification_metrics
+from src.evaluation.metrics import (
+    ConfusionMatrixAccumulator,
+    compute_classification_metrics,
+    encode_labels,
+)
+from src.tracking import BatchedMlflowLogger
+
+logger = logging.getLogger(__name__)
+
+# Probabilité minimale pour le log-loss (comme sklearn, évite log(0))
+_EPS = 1e-15
+
+
+def iter_holdout_chunks(
+    path: Path,
+    feature_cols: Sequence[str],
+    target_col: str = "target",
+    chunk_size: int = 100_000,
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Lit un hold-out CSV ou Parquet par morceaux, uniquement les colonnes utiles
+
+    Yields:
+        Tuple[np.ndarray, np.ndarray]: (X, y) d'un morceau
+    """
+    path = Path(path)
+    columns = list(feature_cols) + [target_col]
+    if path.suffix == ".parquet":
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(path)
+        for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=columns):
+            df = batch.to_pandas()
+            yield df[list(feature_cols)].to_numpy(), df[target_col].to_numpy()
+    else:
+        for df in pd.read_csv(path, usecols=columns, chunksize=chunk_size):
+            yield df[list(feature_cols)].to_numpy(), df[target_col].to_numpy()
+
+
+class CalibrationAccumulator:
+    """
+    Statistiques de calibration accumulées par morceaux
+    (diagramme de fiabilité sur la confiance max, Brier, log-loss)
+    """
+
+    def __init__(self, n_bins: int = 10):
+        self.n_bins = n_bins
+        self.bin_counts = np.zeros(n_bins, dtype=np.int64)
+        self.bin_confidence = np.zeros(n_bins)
+        self.bin_correct = np.zeros(n_bins)
+        self.brier_sum = 0.0
+        self.log_loss_sum = 0.0
+        self.n_samples = 0
+
+    def update(self, proba: np.ndarray, y_true: np.ndarray) -> None:
+        """Ajoute un morceau (probabilités et indices de classe vrais)"""
+        n = len(y_true)
+        if n == 0:
+            return
+        rows = np.arange(n)
+        confidence = proba.max(axis=1)
+        correct = proba.argmax(axis=1) == y_true
+
+        # Bins [0, 1/n_bins), ..., [1 - 1/n_bins, 1]
+        bins = np.minimum((confidence * self.n_bins).astype(np.int64), self.n_bins - 1)
+        self.bin_counts += np.bincount(bins, minlength=self.n_bins)
+        self.bin_confidence += np.bincount(
+            bins, weights=confidence, minlength=self.n_bins
+        )
+        self.bin_correct += np.bincount(bins, weights=correct, minlength=self.n_bins)
+
+        p_true = proba[rows, y_true]
+        # sum_k (p_k - y_k)^2 = sum_k p_k^2 - 2 p_true + 1
+        self.brier_sum += float(((proba**2).sum(axis=1) - 2 * p_true + 1).sum())
+        self.log_loss_sum += float(-np.log(np.clip(p_true, _EPS, 1.0)).sum())
+        self.n_samples += n
+
+    def merge(self, other: "CalibrationAccumulator") -> None:
+        self.bin_counts += other.bin_counts
+        self.bin_confidence += other.bin_confidence
+        self.bin_correct += other.bin_correct
+        self.brier_sum += other.brier_sum
+        self.log_loss_sum += other.log_loss_sum
+        self.n_samples += other.n_samples
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Returns:
+            Dict: ece, mce, brier_score, log_loss et table de fiabilité par bin
+        """
+        if self.n_samples == 0:
+            return {"ece": 0.0, "mce": 0.0, "brier_score": 0.0, "log_loss": 0.0}
+        nonempty = self.bin_counts > 0
+        mean_conf = np.zeros(self.n_bins)
+        accuracy = np.zeros(self.n_bins)
+        mean_conf[nonempty] = self.bin_confidence[nonempty] / self.bin_counts[nonempty]
+        accuracy[nonempty] = self.bin_correct[nonempty] / self.bin_counts[nonempty]
+        gaps = np.abs(accuracy - mean_conf)
+        return {
+            "ece": float((gaps * self.bin_counts).sum() / self.n_samples),
+            "mce": float(gaps[nonempty].max()),
+            "brier_score": self.brier_sum / self.n_samples,
+            "log_loss": self.log_loss_sum / self.n_samples,
+            "reliability": {
+                "bin_upper_edges": np.linspace(0, 1, self.n_bins + 1)[1:].tolist(),
+                "count": self.bin_counts.tolist(),
+                "mean_confidence": mean_conf.tolist(),
+                "accuracy": accuracy.tolist(),
+            },
+        }
+
+
+# Modèle chargé une fois par processus du pool (évite de le re-sérialiser par morceau)
+_worker_model: Any = None
+
+
+def _init_worker(model: Any) -> None:
+    global _worker_model
+    _worker_model = model
+
+
+def _score_chunk(
+    X: np.ndarray,
+    y: np.ndarray,
+    n_classes: int,
+    n_bins: int,
+    model: Any = None,
+) -> Tuple[ConfusionMatrixAccumulator, CalibrationAccumulator]:
+    """Prédit un morceau et retourne ses accumulateurs partiels"""
+    model = model if model is not None else _worker_model
+    labels = _model_labels(model, n_classes)
+    proba = model.predict_proba(X)
+    y_true = encode_labels(y, labels)
+    # argmax sur predict_proba = prédiction de la forêt (classes_ triées)
+    y_pred = proba.argmax(axis=1)
+
+    confusion = ConfusionMatrixAccumulator(n_classes)
+    confusion.update(y_true, y_pred)
+    calibration = CalibrationAccumulator(n_bins)
+    calibration.update(proba, y_true)
+    return confusion, calibration
+
+
+def _max_rss_mb() -> float:
+    """Pic RSS du processus courant (ru_maxrss est en kilo-octets sous Linux)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _score_chunk_in_worker(
+    X: np.ndarray, y: np.ndarray, n_classes: int, n_bins: int
+) -> Tuple[Tuple[ConfusionMatrixAccumulator, CalibrationAccumulator], int, float]:
+    """_score_chunk dans un worker du pool, avec son PID et son pic RSS (MiB)"""
+    return _score_chunk(X, y, n_classes, n_bins), os.getpid(), _max_rss_mb()
+
+
+def evaluate_model_streaming(
+    model: Any,
+    holdout_path: Path,
+    iris_metadata: Dict,
+    chunk_size: int = 100_000,
+    n_workers: int = 1,
+    n_bins: int = 10,
+    tracker: Optional[BatchedMlflowLogger] = None,
+) -> Tuple[Dict, Dict]:
+    """
+    Évalue un modèle sur un hold-out lu en flux depuis le disque
+
+    Args:
+        model: Modèle entraîné (avec predict_proba)
+        holdout_path: Fichier CSV ou Parquet (features + target)
+        iris_metadata: Métadonnées du dataset (feature_names, target_names)
+        chunk_size: Nombre de lignes par morceau
+        n_workers: Processus de prédiction (1 = dans le processus courant)
+        n_bins: Nombre de bins du diagramme de fiabilité
+        tracker: Logger MLflow groupé de l'appelant (défaut: un logger dédié)
+
+    Returns:
+        Tuple[Dict, Dict]: (métriques, métadonnées), comme evaluate_model
+    """
+    feature_cols = iris_metadata["feature_names"]
+    n_classes = len(iris_metadata["target_names"])
+    confusion = ConfusionMatrixAccumulator(n_classes)
+    calibration = CalibrationAccumulator(n_bins)
+
+    logger.info(
+        f"🌊 Évaluation en flux de {holdout_path} "
+        f"(chunk_size={chunk_size}, n_workers={n_workers})"
+    )
+    start = time.perf_counter()
+    n_chunks = 0
+    # Pic RSS de chaque worker du pool (maximum rapporté par PID)
+    worker_rss_mb: Dict[int, float] = {}
+
+    def _merge(partial: Tuple[ConfusionMatrixAccumulator, CalibrationAccumulator]):
+        confusion.merge(partial[0])
+        calibration.merge(partial[1])
+
+    def _merge_from_worker(future) -> None:
+        partial, pid, rss_mb = future.result()
+        worker_rss_mb[pid] = max(rss_mb, worker_rss_mb.get(pid, 0.0))
+        _merge(partial)
+
+    chunks = iter_holdout_chunks(holdout_path, feature_cols, chunk_size=chunk_size)
+    if n_workers <= 1:
+        for X, y in chunks:
+            _merge(_score_chunk(X, y, n_classes, n_bins, model=model))
+            n_chunks += 1
+    else:
+        # Au plus 2 morceaux en vol par processus : mémoire bornée
+        max_in_flight = 2 * n_workers
+        in_flight: deque = deque()
+        with ProcessPoolExecutor(
+            max_workers=n_workers, initializer=_init_worker, initargs=(model,)
+        ) as executor:
+            for X, y in chunks:
+                if len(in_flight) >= max_in_flight:
+                    _merge_from_worker(in_flight.popleft())
+                in_flight.append(
+                    executor.submit(_score_chunk_in_worker, X, y, n_classes, n_bins)
+                )
+                n_chunks += 1
+            while in_flight:
+                _merge_from_worker(in_flight.popleft())
+    elapsed = time.perf_counter() - start
+
+    # Pic mémoire de l'évaluation : processus courant + chaque worker du pool
+    max_rss_mb = _max_rss_mb()
+    workers_max_rss_mb = sum(worker_rss_mb.values())
+    peak_memory_mb = max_rss_mb + workers_max_rss_mb
+    n_rows = confusion.n_samples
+    calibration_summary = calibration.summary()
+    reliability = calibration_summary.pop("reliability", None)
+
+    logger.info(
+        f"   {n_rows} lignes en {n_chunks} morceaux, {elapsed:.2f}s "
+        f"({n_rows / max(elapsed, 1e-9):.0f} lignes/s), "
+        f"pic RSS {peak_memory_mb:.1f} MiB"
+    )
+    logger.info(
+        f"   Calibration: ECE={calibration_summary['ece']:.4f} "
+        f"Brier={calibration_summary['brier_score']:.4f} "
+        f"log-loss={calibration_summary['log_loss']:.4f}"
+    )
+
+    own_tracker = tracker is None
+    if own_tracker:
+        tracker = BatchedMlflowLogger()
+    tracker.log_metrics(calibration_summary)
+    tracker.log_metrics(
+        {
+            "eval_rows": n_rows,
+            "eval_time_s": elapsed,
+            "eval_rows_per_s": n_rows / max(elapsed, 1e-9),
+            "eval_peak_memory_mb": peak_memory_mb,
+            "eval_max_rss_mb": max_rss_mb,
+            "eval_workers_max_rss_mb": workers_max_rss_mb,
+        }
+    )
+    tracker.log_params({"eval_chunk_size": chunk_size, "eval_n_workers": n_workers})
+
+    result = compute_classification_metrics(confusion.matrix)
+    metrics, metadata = log_classification_metrics(result, iris_metadata, tracker)
+    if own_tracker:
+        tracker.close()
+    if reliability is not None:
+        mlflow.log_dict(reliability, "calibration/reliability.json")
+
+    metrics.update(calibration_summary)
+    return metrics, metadata
+
+
+def _load_production_model(model_dir: Path) -> Tuple[Any, Dict]:
+    """Charge le modèle référencé par models/metadata.json (via son run MLflow)"""
+    import json
+
+    import mlflow.sklearn
+
+    metadata = json.loads((model_dir / "metadata.json").read_text(encoding="utf-8"))
+    model = mlflow.sklearn.load_model(f"runs:/{metadata['mlflow_run_id']}/model")
+    return model, metadata
+
+
+if __name__ == "__main__":
+    import argparse
+    import os
+
+    parser = argparse.ArgumentParser(description="Évaluation en flux d'un hold-out")
+    parser.add_argument("holdout", type=Path, help="Fichier CSV ou Parquet")
+    parser.add_argument("--model-dir", type=Path, default=Path("models"))
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--experiment-name", default="iris-evaluation")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    if os.getenv("MLFLOW_TRACKING_URI"):
+        mlflow.set_tracking_uri(os.getenv("MLFLOW_TRACKING_URI"))
+    production_model, production_metadata = _load_production_model(args.model_dir)
+
+    mlflow.set_experiment(args.experiment_name)
+    with mlflow.start_run(run_name=f"holdout_{args.holdout.stem}"):
+        mlflow.set_tag("evaluated_run_id", production_metadata["mlflow_run_id"])
+        evaluate_model_streaming(
+            production_model,
+            args.holdout,
+            production_metadata,
+            chunk_size=args.chunk_size,
+            n_workers=args.workers,
+        )
@@ -0,0 +1,96 @@
+"""
+Forêt aléatoire "compilée" pour l'inférence en numpy pur
+Les arbres d'un RandomForestClassifier ajusté sont aplatis dans des tableaux
+contigus (un seul jeu de noeuds pour toute la forêt). Le parcours avance tous
+les arbres et toutes les lignes d'un niveau à la fois, sans boucle Python par
+arbre ni pool de threads : le coût fixe par appel est bien plus faible que
+celui de sklearn, ce qui compte pour les prédictions ligne à ligne.
+
+Les feuilles atteintes sont exactement celles de sklearn (même conversion
+float32 des entrées, même comparaison <= seuil) ; les probabilités ne
+diffèrent que par l'ordre de sommation des arbres (écart de l'ordre de 1e-16).
+"""
+
+from typing import List
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+
+
+class CompiledForest:
+    """
+    Représentation aplatie d'une forêt ajustée
+
+    Attributes:
+        classes_: Classes du modèle d'origine
+        roots: Indice du noeud racine de chaque arbre
+        feature, threshold: Test de chaque noeud (feature 0 / seuil +inf
+            pour les feuilles, qui bouclent sur elles-mêmes)
+        left, right: Indices globaux des enfants (feuille : elle-même)
+        proba: Distribution des classes de chaque noeud (n_nodes, n_classes)
+        max_depth: Profondeur maximale (nombre de pas du parcours)
+    """
+
+    def __init__(self, model: RandomForestClassifier):
+        if not hasattr(model, "estimators_"):
+            raise ValueError("Le modèle doit être ajusté avant compilation")
+        if getattr(model, "n_outputs_", 1) != 1:
+            raise ValueError("Seules les forêts à une sortie sont supportées")
+
+        self.classes_ = model.classes_
+        self.n_features_in_ = model.n_features_in_
+        features, thresholds, lefts, rights, probas = [], [], [], [], []
+        roots: List[int] = []
+        offset = 0
+        max_depth = 0
+        for estimator in model.estimators_:
+            tree = estimator.tree_
+            nodes = np.arange(tree.node_count)
+            is_leaf = tree.children_left == -1
+            roots.append(offset)
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(np.where(is_leaf, np.inf, tree.threshold))
+            lefts.append(np.where(is_leaf, nodes, tree.children_left) + offset)
+            rights.append(np.where(is_leaf, nodes, tree.children_right) + offset)
+            value = tree.value[:, 0, :]
+            probas.append(value / value.sum(axis=1, keepdims=True))
+            max_depth = max(max_depth, tree.max_depth)
+            offset += tree.node_count
+
+        self.roots = np.asarray(roots, dtype=np.intp)
+        self.feature = np.concatenate(features).astype(np.intp)
+        self.threshold = np.concatenate(thresholds)
+        self.left = np.concatenate(lefts).astype(np.intp)
+        self.right = np.concatenate(rights).astype(np.intp)
+        self.proba = np.concatenate(probas)
+        self.max_depth = max_depth
+
+    @property
+    def n_estimators(self) -> int:
+        return len(self.roots)
+
+    def apply(self, X: np.ndarray) -> np.ndarray:
+        """Indice global de la feuille atteinte, par arbre et par ligne (n_trees, n)"""
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(
+                f"X doit avoir la forme (n, {self.n_features_in_}), reçu {X.shape}"
+            )
+        rows = np.arange(X.shape[0])
+        nodes = np.repeat(self.roots[:, None], X.shape[0], axis=1)
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return nodes
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """Moyenne des distributions des feuilles atteintes (comme sklearn)"""
+        return self.proba[self.apply(X)].mean(axis=0)
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+
+def compile_forest(model: RandomForestClassifier) -> CompiledForest:
+    """Compile une forêt ajustée pour l'inférence numpy"""
+    return CompiledForest(model)
@@ -0,0 +1,291 @@
+"""
+Profilage des étapes du pipeline (prepare, train)
+Chaque étape instrumentée enregistre son temps réel, son temps CPU et le pic
+de mémoire résidente (RSS) du processus. Le rapport est écrit dans un
+timings.json suivi par DVC (détection des régressions) et loggé dans MLflow.
+
+En option, un profil détaillé est capturé sur toute l'exécution :
+- "cprofile" : profil déterministe (fichier .prof + résumé texte)
+- "sampling" : échantillonnage de la pile du thread principal à intervalle
+  fixe (surcoût faible), écrit au format "folded" des flamegraphs
+"""
+
+import cProfile
+import io
+import json
+import logging
+import pstats
+import resource
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PROFILERS = ("none", "cprofile", "sampling")
+TIMINGS_FILENAME = "timings.json"
+
+
+def peak_rss_mb() -> float:
+    """Pic de mémoire résidente du processus depuis son démarrage (Mo)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss est en kilo-octets sous Linux, en octets sous macOS
+    return peak / 1024**2 if sys.platform == "darwin" else peak / 1024
+
+
+class SamplingProfiler:
+    """
+    Profileur par échantillonnage : un thread relève la pile d'un thread cible
+    toutes les `interval_s` secondes et compte les piles identiques
+    """
+
+    def __init__(
+        self,
+        interval_s: float = 0.005,
+        thread_id: Optional[int] = None,
+        all_threads: bool = False,
+    ):
+        self.interval_s = interval_s
+        self.thread_id = thread_id or threading.main_thread().ident
+        # all_threads : toutes les piles sauf la sienne, préfixées par le thread
+        self.all_threads = all_threads
+        self.stacks: Counter = Counter()
+        self.n_samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _fold(frame) -> List[str]:
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append(
+                f"{code.co_name} ({Path(code.co_filename).name}:{frame.f_lineno})"
+            )
+            frame = frame.f_back
+        # Format folded : de la racine vers la feuille
+        return stack[::-1]
+
+    def _sample(self) -> None:
+        frames = sys._current_frames()
+        if not self.all_threads:
+            frame = frames.get(self.thread_id)
+            if frame is not None:
+                self.stacks[";".join(self._fold(frame))] += 1
+                self.n_samples += 1
+            return
+
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        own_id = threading.get_ident()
+        for thread_id, frame in frames.items():
+            if thread_id == own_id:
+                continue
+            name = names.get(thread_id, str(thread_id))
+            self.stacks[";".join([name] + self._fold(frame))] += 1
+        self.n_samples += 1
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            self._sample()
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="sampling-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def folded(self) -> str:
+        """Piles au format folded (une ligne "pile nb_échantillons")"""
+        return "\n".join(
+            f"{stack} {count}" for stack, count in self.stacks.most_common()
+        )
+
+    def top_functions(self, limit: int = 20) -> List[Dict]:
+        """Fonctions les plus souvent en haut de pile (temps propre)"""
+        leaves: Counter = Counter()
+        for stack, count in self.stacks.items():
+            leaves[stack.rsplit(";", 1)[-1]] += count
+        total = max(self.n_samples, 1)
+        return [
+            {"function": name, "samples": count, "share": count / total}
+            for name, count in leaves.most_common(limit)
+        ]
+
+
+class PipelineProfiler:
+    """
+    Mesure des étapes d'un pipeline et profil détaillé optionnel
+
+    Usage:
+        profiler = PipelineProfiler("train", profiler="sampling")
+        with profiler:
+            with profiler.stage("fit"):
+                ...
+        profiler.write_timings(Path("models/timings.json"))
+    """
+
+    def __init__(
+        self,
+        name: str,
+        profiler: str = "none",
+        sampling_interval_ms: float = 5.0,
+    ):
+        if profiler not in PROFILERS:
+            raise ValueError(f"Profileur inconnu : {profiler} (attendu: {PROFILERS})")
+        self.name = name
+        self.profiler = profiler
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self._cprofile: Optional[cProfile.Profile] = None
+        self._sampler: Optional[SamplingProfiler] = None
+        self._sampling_interval_s = sampling_interval_ms / 1000
+        self._start_wall = 0.0
+        self._start_cpu = 0.0
+        self.total_wall_s = 0.0
+        self.total_cpu_s = 0.0
+        self._running = False
+
+    def __enter__(self) -> "PipelineProfiler":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        self._running = True
+        self._start_wall = time.perf_counter()
+        self._start_cpu = time.process_time()
+        if self.profiler == "cprofile":
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        elif self.profiler == "sampling":
+            self._sampler = SamplingProfiler(self._sampling_interval_s)
+            self._sampler.start()
+
+    def stop(self) -> None:
+        """Arrête les mesures globales (idempotent)"""
+        if not self._running:
+            return
+        self._running = False
+        if self._cprofile is not None:
+            self._cprofile.disable()
+        if self._sampler is not None:
+            self._sampler.stop()
+        self.total_wall_s = time.perf_counter() - self._start_wall
+        self.total_cpu_s = time.process_time() - self._start_cpu
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Mesure une étape (les appels répétés d'une même étape s'additionnent)"""
+        rss_before = peak_rss_mb()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            rss_after = peak_rss_mb()
+            entry = self.stages.setdefault(
+                name,
+                {
+                    "wall_s": 0.0,
+                    "cpu_s": 0.0,
+                    "peak_rss_mb": 0.0,
+                    "rss_growth_mb": 0.0,
+                    "calls": 0,
+                },
+            )
+            entry["wall_s"] += wall
+            entry["cpu_s"] += cpu
+            entry["peak_rss_mb"] = max(entry["peak_rss_mb"], rss_after)
+            # Hausse du pic de RSS pendant l'étape (0 si le pic date d'avant)
+            entry["rss_growth_mb"] += rss_after - rss_before
+            entry["calls"] += 1
+            logger.info(
+                f"   ⏱️  {name}: {wall:.3f}s (cpu {cpu:.3f}s, pic RSS {rss_after:.0f} Mo)"
+            )
+
+    def report(self) -> Dict:
+        """Rapport sérialisable (écrit dans timings.json)"""
+        report = {
+            "pipeline": self.name,
+            "total_wall_s": round(self.total_wall_s, 6),
+            "total_cpu_s": round(self.total_cpu_s, 6),
+            "peak_rss_mb": round(peak_rss_mb(), 2),
+            "stages": {
+                name: {key: round(value, 6) for key, value in entry.items()}
+                for name, entry in self.stages.items()
+            },
+        }
+        if self._sampler is not None:
+            report["sampling"] = {
+                "interval_ms": self._sampling_interval_s * 1000,
+                "n_samples": self._sampler.n_samples,
+                "top_functions": self._sampler.top_functions(),
+            }
+        return report
+
+    def flat_metrics(self) -> Dict[str, float]:
+        """Métriques MLflow : time_<étape>_s, cpu_<étape>_s, peak_rss_<étape>_mb"""
+        metrics = {
+            "time_total_s": self.total_wall_s,
+            "cpu_total_s": self.total_cpu_s,
+            "peak_rss_mb": peak_rss_mb(),
+        }
+        for name, entry in self.stages.items():
+            metrics[f"time_{name}_s"] = entry["wall_s"]
+            metrics[f"cpu_{name}_s"] = entry["cpu_s"]
+            metrics[f"peak_rss_{name}_mb"] = entry["peak_rss_mb"]
+        return metrics
+
+    def write_timings(self, path: Path) -> Path:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.report(), indent=2), encoding="utf-8")
+        logger.info(f"💾 Temps par étape sauvegardés dans : {path}")
+        return path
+
+    def write_profile(self, directory: Path) -> List[Path]:
+        """Écrit le profil détaillé (si capturé) ; retourne les fichiers écrits"""
+        directory.mkdir(parents=True, exist_ok=True)
+        paths = []
+        if self._cprofile is not None:
+            prof_path = directory / f"{self.name}.prof"
+            self._cprofile.dump_stats(prof_path)
+            summary = io.StringIO()
+            stats = pstats.Stats(self._cprofile, stream=summary)
+            stats.sort_stats("cumulative").print_stats(40)
+            text_path = directory / f"{self.name}_profile.txt"
+            text_path.write_text(summary.getvalue(), encoding="utf-8")
+            paths += [prof_path, text_path]
+        if self._sampler is not None:
+            folded_path = directory / f"{self.name}.folded"
+            folded_path.write_text(self._sampler.folded(), encoding="utf-8")
+            paths.append(folded_path)
+        return paths
+
+    def log_to_mlflow(self, tracker, profile_dir: Optional[Path] = None) -> None:
+        """
+        Logge les métriques par étape via le tracker et, s'il a été capturé,
+        le profil détaillé comme artefact du run actif (dossier "profile/")
+        """
+        tracker.log_metrics(self.flat_metrics())
+        tracker.set_tag("profiler", self.profiler)
+        if self.profiler == "none" or profile_dir is None:
+            return
+
+        import mlflow
+
+        for path in self.write_profile(profile_dir):
+            mlflow.log_artifact(str(path), artifact_path="profile")
@@ -3,20 +3,15 @@ Point d'entrée de l'application FastAPI
 Assemble tous les composants : routes, middleware, lifespan
 """
 
-import logging
-import os
-
 from fastapi import FastAPI
 
 from .lifespan import lifespan
 from .middleware import setup_cors, setup_rate_limiting, setup_security_headers
 from .routes import register_routes
+from .structured_logging import setup_logging
 
-# Configuration du logging
-logging.basicConfig(
-    level=getattr(logging, os.getenv("LOG_LEVEL", "INFO").upper(), logging.INFO),
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-)
+# Configuration du logging : file non bloquante, JSON écrit par un thread dédié
+log_listener = setup_logging()
 
 # Création de l'application FastAPI
 app = FastAPI(
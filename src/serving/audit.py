@@ -0,0 +1,245 @@
+"""
+Journal d'audit des prédictions (features, probabilités, run MLflow, latence)
+Les prédictions sont déposées dans un tampon borné et écrites par un thread
+dédié, par lots, dans des segments Parquet (un groupe de lignes par lot). Un
+segment est fermé puis renommé en .parquet quand il atteint sa taille ou son
+âge maximal : les lecteurs ne voient que des segments complets.
+
+Tampon plein : l'appelant attend qu'une place se libère (contre-pression),
+au plus `put_timeout_s`, puis la ligne est abandonnée et comptée. À l'arrêt
+(close), le tampon est vidé et le segment courant fermé : rien n'est perdu.
+
+Variables d'environnement (lues par from_env) :
+- AUDIT_LOG_DIR : dossier des segments (logs/audit, vide = désactivé)
+- AUDIT_BUFFER_SIZE : lignes en attente maximales (10000)
+- AUDIT_BATCH_SIZE : lignes par écriture (1000)
+- AUDIT_FLUSH_INTERVAL_S : délai maximal avant écriture d'un lot partiel (5)
+- AUDIT_SEGMENT_MAX_ROWS : lignes par segment (100000)
+- AUDIT_SEGMENT_MAX_AGE_S : âge maximal d'un segment (3600)
+"""
+
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .metrics import audit_records_dropped, audit_records_written
+
+logger = logging.getLogger("iris_api")
+
+IN_PROGRESS_SUFFIX = ".parquet.inprogress"
+
+AUDIT_SCHEMA = pa.schema(
+    [
+        pa.field("prediction_id", pa.string()),
+        pa.field("timestamp", pa.timestamp("ms", tz="UTC")),
+        pa.field("model_run_id", pa.string()),
+        pa.field("sepal_length", pa.float32()),
+        pa.field("sepal_width", pa.float32()),
+        pa.field("petal_length", pa.float32()),
+        pa.field("petal_width", pa.float32()),
+        pa.field("prediction", pa.dictionary(pa.int8(), pa.string())),
+        pa.field("confidence", pa.float32()),
+        pa.field("class_names", pa.list_(pa.string())),
+        pa.field("probabilities", pa.list_(pa.float32())),
+        pa.field("latency_ms", pa.float32()),
+    ]
+)
+
+_STOP = object()
+
+
+def new_prediction_id() -> str:
+    return uuid.uuid4().hex
+
+
+class AuditLogWriter:
+    """
+    Écrivain asynchrone du journal d'audit
+
+    Usage:
+        writer = AuditLogWriter(Path("logs/audit"))
+        writer.start()
+        writer.record({...})  # depuis le chemin de la requête
+        writer.close()        # au shutdown : vide le tampon
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        buffer_size: int = 10_000,
+        batch_size: int = 1_000,
+        flush_interval_s: float = 5.0,
+        segment_max_rows: int = 100_000,
+        segment_max_age_s: float = 3600.0,
+        put_timeout_s: float = 1.0,
+    ):
+        if batch_size <= 0 or buffer_size <= 0 or segment_max_rows <= 0:
+            raise ValueError(
+                "buffer_size, batch_size et segment_max_rows doivent être > 0"
+            )
+        self.directory = Path(directory)
+        self.batch_size = batch_size
+        self.flush_interval_s = flush_interval_s
+        self.segment_max_rows = segment_max_rows
+        self.segment_max_age_s = segment_max_age_s
+        self.put_timeout_s = put_timeout_s
+        self.dropped = 0
+        self.written = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=buffer_size)
+        self._thread: Optional[threading.Thread] = None
+        self._writer: Optional[pq.ParquetWriter] = None
+        self._segment_path: Optional[Path] = None
+        self._segment_rows = 0
+        self._segment_opened_at = 0.0
+        self._segment_index = 0
+
+    @classmethod
+    def from_env(cls) -> Optional["AuditLogWriter"]:
+        """Écrivain configuré par les variables AUDIT_* (None si désactivé)"""
+        directory = os.getenv("AUDIT_LOG_DIR", "logs/audit").strip()
+        if not directory:
+            return None
+        return cls(
+            Path(directory),
+            buffer_size=int(os.getenv("AUDIT_BUFFER_SIZE", "10000")),
+            batch_size=int(os.getenv("AUDIT_BATCH_SIZE", "1000")),
+            flush_interval_s=float(os.getenv("AUDIT_FLUSH_INTERVAL_S", "5")),
+            segment_max_rows=int(os.getenv("AUDIT_SEGMENT_MAX_ROWS", "100000")),
+            segment_max_age_s=float(os.getenv("AUDIT_SEGMENT_MAX_AGE_S", "3600")),
+        )
+
+    def start(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._thread = threading.Thread(
+            target=self._run, name="audit-writer", daemon=True
+        )
+        self._thread.start()
+        logger.info("Audit log writer started", extra={"path": str(self.directory)})
+
+    def try_record(self, row: Dict) -> bool:
+        """Dépose une ligne sans attendre ; False si le tampon est plein"""
+        try:
+            self._queue.put_nowait(row)
+            return True
+        except queue.Full:
+            return False
+
+    def record(self, row: Dict) -> bool:
+        """
+        Dépose une ligne, en attendant au plus put_timeout_s qu'une place se
+        libère (contre-pression) ; la ligne est abandonnée et comptée sinon
+        """
+        try:
+            self._queue.put(row, timeout=self.put_timeout_s)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            audit_records_dropped.inc()
+            return False
+
+    def close(self, timeout_s: Optional[float] = None) -> None:
+        """Écrit les lignes en attente, ferme le segment courant et arrête le thread"""
+        if self._thread is None:
+            return
+        # Bloquant : la sentinelle passe après toutes les lignes déjà déposées
+        self._queue.put(_STOP)
+        self._thread.join(timeout_s)
+        self._thread = None
+        logger.info(
+            "Audit log writer stopped",
+            extra={"written": self.written, "dropped": self.dropped},
+        )
+
+    def _run(self) -> None:
+        batch: List[Dict] = []
+        deadline = time.monotonic() + self.flush_interval_s
+        while True:
+            try:
+                item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                self._write(batch)
+                self._close_segment()
+                return
+            if item is not None:
+                batch.append(item)
+            if len(batch) >= self.batch_size or time.monotonic() >= deadline:
+                self._write(batch)
+                batch = []
+                deadline = time.monotonic() + self.flush_interval_s
+            self._rotate_if_old()
+
+    def _write(self, rows: Sequence[Dict]) -> None:
+        if not rows:
+            return
+        try:
+            # Un lot peut chevaucher deux segments (rotation par nombre de lignes)
+            start = 0
+            while start < len(rows):
+                if self._writer is None:
+                    self._open_segment()
+                room = self.segment_max_rows - self._segment_rows
+                chunk = rows[start : start + room]
+                self._writer.write_table(
+                    pa.Table.from_pylist(list(chunk), schema=AUDIT_SCHEMA)
+                )
+                self._segment_rows += len(chunk)
+                start += len(chunk)
+                if self._segment_rows >= self.segment_max_rows:
+                    self._close_segment()
+            self.written += len(rows)
+            audit_records_written.inc(len(rows))
+        except Exception as exc:
+            # Le thread ne doit pas mourir : le lot est perdu mais compté
+            self.dropped += len(rows)
+            audit_records_dropped.inc(len(rows))
+            logger.exception(
+                "Audit log write failed",
+                extra={"error": str(exc), "error_type": type(exc).__name__},
+            )
+
+    def _open_segment(self) -> None:
+        timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+        name = f"audit-{timestamp}-{os.getpid()}-{self._segment_index:05d}"
+        self._segment_index += 1
+        self._segment_path = self.directory / f"{name}{IN_PROGRESS_SUFFIX}"
+        self._writer = pq.ParquetWriter(self._segment_path, AUDIT_SCHEMA)
+        self._segment_rows = 0
+        self._segment_opened_at = time.monotonic()
+
+    def _close_segment(self) -> None:
+        if self._writer is None:
+            return
+        self._writer.close()
+        final_path = self._segment_path.with_name(
+            self._segment_path.name.replace(IN_PROGRESS_SUFFIX, ".parquet")
+        )
+        self._segment_path.rename(final_path)
+        self._writer = None
+        self._segment_path = None
+
+    def _rotate_if_old(self) -> None:
+        if (
+            self._writer is not None
+            and time.monotonic() - self._segment_opened_at >= self.segment_max_age_s
+        ):
+            self._close_segment()
+
+
+def read_audit_log(directory: Path) -> pa.Table:
+    """Lit les segments complets du journal d'audit (analyse de dérive, jointures)"""
+    paths = sorted(Path(directory).glob("audit-*.parquet"))
+    if not paths:
+        return AUDIT_SCHEMA.empty_table()
+    return pa.concat_tables(pq.read_table(path, schema=AUDIT_SCHEMA) for path in paths)
@@ -0,0 +1,163 @@
+"""
+Moniteur de dérive en ligne des features et des classes prédites
+Chaque prédiction met à jour, en O(1) et en mémoire constante, la moyenne et
+la variance de chaque feature (Welford), un histogramme à classes fixes (les
+mêmes que le profil de référence) et les effectifs par classe prédite.
+
+Les scores (PSI, divergence KL, écart de moyenne en écarts-types de la
+référence) ne sont calculés qu'au scrape de /metrics : le chemin de la
+requête ne fait que quelques additions. Les statistiques sont cumulées
+depuis le démarrage du worker.
+"""
+
+import logging
+import math
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from src.data.profile import FEATURE_RANGE, HISTOGRAM_BINS, load_reference_profile
+
+from .metrics import (
+    drift_samples,
+    feature_drift_kl,
+    feature_drift_psi,
+    feature_mean_shift,
+    prediction_drift_kl,
+    prediction_drift_psi,
+)
+
+logger = logging.getLogger("iris_api")
+
+# Plancher des proportions : une classe vide ne rend pas le score infini
+EPSILON = 1e-4
+
+
+def _proportions(counts: Sequence[float]) -> np.ndarray:
+    counts = np.asarray(counts, dtype=np.float64)
+    proportions = counts / max(counts.sum(), 1.0)
+    proportions = np.clip(proportions, EPSILON, None)
+    return proportions / proportions.sum()
+
+
+def psi(expected: Sequence[float], actual: Sequence[float]) -> float:
+    """Population Stability Index entre deux histogrammes (effectifs)"""
+    p, q = _proportions(actual), _proportions(expected)
+    return float(np.sum((p - q) * np.log(p / q)))
+
+
+def kl_divergence(expected: Sequence[float], actual: Sequence[float]) -> float:
+    """Divergence KL(actual || expected) entre deux histogrammes (effectifs)"""
+    p, q = _proportions(actual), _proportions(expected)
+    return float(np.sum(p * np.log(p / q)))
+
+
+class DriftMonitor:
+    """
+    Statistiques du trafic comparées au profil de référence
+
+    Usage:
+        monitor = DriftMonitor.from_reference(Path("data/processed/reference_profile.json"))
+        monitor.update([5.1, 3.5, 1.4, 0.2], predicted_index=0)  # par requête
+        monitor.export()  # au scrape : met à jour les gauges Prometheus
+    """
+
+    def __init__(self, reference: dict):
+        self.reference = reference
+        self.feature_names = list(reference["feature_names"])
+        self.target_names = list(reference["target_names"])
+        n_features = len(self.feature_names)
+        self.n = 0
+        # Listes Python : plus rapides que numpy pour 4 valeurs par requête
+        self._mean = [0.0] * n_features
+        self._m2 = [0.0] * n_features
+        self._histograms = [[0] * HISTOGRAM_BINS for _ in range(n_features)]
+        self._class_counts = [0] * len(self.target_names)
+        self._low = FEATURE_RANGE[0]
+        self._scale = HISTOGRAM_BINS / (FEATURE_RANGE[1] - FEATURE_RANGE[0])
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_reference(cls, path: Path) -> Optional["DriftMonitor"]:
+        """Moniteur basé sur le profil `path` (None si absent ou invalide)"""
+        try:
+            reference = load_reference_profile(path)
+        except FileNotFoundError:
+            logger.warning("Reference profile not found", extra={"path": str(path)})
+            return None
+        except (ValueError, KeyError) as exc:
+            logger.error(
+                "Invalid reference profile",
+                extra={"path": str(path), "error": str(exc)},
+            )
+            return None
+        logger.info("Reference profile loaded", extra={"path": str(path)})
+        return cls(reference)
+
+    def update(self, values: Sequence[float], predicted_index: int) -> None:
+        """Intègre une prédiction (features dans l'ordre du profil)"""
+        last_bin = HISTOGRAM_BINS - 1
+        with self._lock:
+            self.n += 1
+            for j, x in enumerate(values):
+                delta = x - self._mean[j]
+                self._mean[j] += delta / self.n
+                self._m2[j] += delta * (x - self._mean[j])
+                index = int((x - self._low) * self._scale)
+                self._histograms[j][min(max(index, 0), last_bin)] += 1
+            if 0 <= predicted_index < len(self._class_counts):
+                self._class_counts[predicted_index] += 1
+
+    def scores(self) -> Dict[str, object]:
+        """
+        Scores de dérive (calculés à la demande)
+
+        Returns:
+            dict: {"samples", "features": {nom: {"psi", "kl", "mean_shift"}},
+                   "prediction": {"psi", "kl"}}
+        """
+        with self._lock:
+            n = self.n
+            means = list(self._mean)
+            histograms = [list(h) for h in self._histograms]
+            class_counts = list(self._class_counts)
+
+        features = {}
+        for j, name in enumerate(self.feature_names):
+            reference = self.reference["features"][name]
+            std = math.sqrt(reference["variance"])
+            features[name] = {
+                "psi": psi(reference["histogram"], histograms[j]),
+                "kl": kl_divergence(reference["histogram"], histograms[j]),
+                "mean_shift": (means[j] - reference["mean"]) / std if std else 0.0,
+            }
+        return {
+            "samples": n,
+            "features": features,
+            "prediction": {
+                "psi": psi(self.reference["class_counts"], class_counts),
+                "kl": kl_divergence(self.reference["class_counts"], class_counts),
+            },
+        }
+
+    def variance(self) -> np.ndarray:
+        """Variance (population) courante de chaque feature"""
+        with self._lock:
+            if self.n == 0:
+                return np.zeros(len(self._m2))
+            return np.asarray(self._m2) / self.n
+
+    def export(self) -> None:
+        """Met à jour les gauges Prometheus (aucune si pas encore de trafic)"""
+        scores = self.scores()
+        drift_samples.set(scores["samples"])
+        if not scores["samples"]:
+            return
+        for name, values in scores["features"].items():
+            feature_drift_psi.labels(feature=name).set(values["psi"])
+            feature_drift_kl.labels(feature=name).set(values["kl"])
+            feature_mean_shift.labels(feature=name).set(values["mean_shift"])
+        prediction_drift_psi.set(scores["prediction"]["psi"])
+        prediction_drift_kl.set(scores["prediction"]["kl"])
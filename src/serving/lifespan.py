@@ -9,11 +9,18 @@ from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import Optional
 
-import mlflow
-import mlflow.sklearn
 from fastapi import FastAPI
 
-from .metrics import model_loaded
+from src.data.manifest import MANIFEST_FILENAME, dataset_metadata, load_manifest
+from src.data.profile import PROFILE_FILENAME
+
+from .audit import AuditLogWriter
+from .drift import DriftMonitor
+from .metrics import ab_weight, model_loaded
+from .registry import DEFAULT_MODEL_KEY, ModelRegistry, serve_single_threaded
+from .shadow import shadow_from_env
+from .traffic_split import TrafficSplit
+from .warmup import warm_up
 
 logger = logging.getLogger("iris_api")
 
@@ -31,6 +38,8 @@ def _configure_mlflow_tracking() -> tuple[str, Optional[str]]:
       configurée comme tracking URI classique.
     - MLFLOW_TRACKING_URI non défini: tracking local file://mlruns.
     """
+    import mlflow
+
     raw_uri = os.getenv("MLFLOW_TRACKING_URI", "").strip()
 
     # Cas 1 : URI GCS → artifact store uniquement
@@ -117,6 +126,31 @@ def _load_metadata(model_dir: Path) -> dict:
     return metadata
 
 
+def _fill_from_manifest(metadata: dict, data_dir: Path) -> dict:
+    """Complète feature_names / target_names depuis le manifeste du dataset
+    (modèles entraînés sans ces champs dans metadata.json)."""
+    if metadata.get("target_names") and metadata.get("feature_names"):
+        return metadata
+
+    manifest = load_manifest(data_dir)
+    if manifest is None:
+        return metadata
+    try:
+        fields = dataset_metadata(manifest)
+    except KeyError as exc:
+        logger.warning(f"Incomplete dataset manifest in {data_dir}: missing {exc}")
+        return metadata
+
+    for key, value in fields.items():
+        if not metadata.get(key):
+            metadata[key] = value
+    logger.info(
+        "Dataset manifest loaded",
+        extra={"path": str(data_dir / MANIFEST_FILENAME)},
+    )
+    return metadata
+
+
 def _load_metrics(model_dir: Path) -> Optional[dict]:
     """Charge les métriques du modèle si disponibles."""
     metrics_path = model_dir / "metrics.json"
@@ -130,6 +164,50 @@ def _load_metrics(model_dir: Path) -> Optional[dict]:
     return metrics
 
 
+def _start_audit() -> Optional[AuditLogWriter]:
+    """Journal d'audit des variables AUDIT_*, démarré (None si désactivé ou en échec)"""
+    try:
+        audit = AuditLogWriter.from_env()
+        if audit is not None:
+            audit.start()
+        return audit
+    except Exception as exc:
+        # Disque en lecture seule, dossier impossible à créer : servir sans audit
+        logger.exception(
+            "Audit log unavailable, predictions not audited",
+            extra={"error": str(exc), "error_type": type(exc).__name__},
+        )
+        return None
+
+
+async def _load_traffic_split(registry: ModelRegistry) -> Optional[TrafficSplit]:
+    """Répartition A/B de AB_ARMS, bras chargés d'avance (None si inactive)"""
+    try:
+        split = TrafficSplit.from_env()
+    except ValueError as exc:
+        logger.error(f"Invalid AB_ARMS: {exc}")
+        return None
+    if split is None:
+        return None
+    for key in split.weights:
+        if key == DEFAULT_MODEL_KEY:
+            continue
+        registry.allowed_keys.add(key)
+        try:
+            entry = await registry.get(key)
+        except Exception as exc:
+            logger.error(
+                "A/B arm unavailable, traffic split disabled",
+                extra={"arm": key, "error": str(exc)},
+            )
+            return None
+        entry.pinned = True
+    for key, share in split.weights.items():
+        ab_weight.labels(arm=key).set(share)
+    logger.info("Traffic split enabled", extra={"weights": split.weights})
+    return split
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Gestionnaire de cycle de vie de l'application.
@@ -142,10 +220,26 @@ async def lifespan(app: FastAPI):
     app.state.model = None
     app.state.metadata = None
     app.state.metrics = None
+    app.state.drift = None
+    # Registre multi-modèles (versions supplémentaires chargées à la demande)
+    app.state.registry = ModelRegistry.from_env()
+    app.state.shadow = None
+    app.state.traffic_split = None
+
+    # Journal d'audit des prédictions (thread d'écriture dédié)
+    app.state.audit = _start_audit()
+
+    # Moniteur de dérive : profil livré avec le modèle, sinon celui de prepare
+    data_dir = Path(os.getenv("DATA_DIR", "data/processed"))
+    profile_path = model_dir / PROFILE_FILENAME
+    if not profile_path.exists():
+        profile_path = data_dir / PROFILE_FILENAME
+    app.state.drift = DriftMonitor.from_reference(profile_path)
 
     try:
         # Charger et valider les métadonnées
         metadata = _load_metadata(model_dir)
+        metadata = _fill_from_manifest(metadata, data_dir)
         app.state.metadata = metadata
 
         # Configurer MLflow (tracking + éventuelle base d'artefacts GCS)
@@ -162,8 +256,14 @@ async def lifespan(app: FastAPI):
 
         logger.info(f"Loading model from: {model_uri}")
 
-        # Charger le modèle
+        # Charger le modèle (mlflow importé ici : ~2 s épargnées à l'import de l'app)
+        import mlflow.sklearn
+
         app.state.model = mlflow.sklearn.load_model(model_uri)
+        serve_single_threaded(app.state.model)
+        app.state.registry.register(
+            mlflow_run_id, app.state.model, run_id=mlflow_run_id, default=True
+        )
         model_loaded.set(1)
 
         logger.info(
@@ -192,7 +292,27 @@ async def lifespan(app: FastAPI):
             extra={"error": str(exc), "error_type": type(exc).__name__},
         )
 
+    # Candidat fantôme (SHADOW_MODEL) et bras A/B (AB_ARMS), si un modèle principal existe
+    if app.state.model is not None:
+        app.state.shadow = await shadow_from_env(app.state.registry)
+        app.state.traffic_split = await _load_traffic_split(app.state.registry)
+
+    # Prédictions synthétiques sur chaque chemin actif avant d'accepter du trafic
+    try:
+        await warm_up(app)
+    except Exception as exc:
+        logger.exception(
+            "Warm-up failed",
+            extra={"error": str(exc), "error_type": type(exc).__name__},
+        )
+
     yield  # l'app est maintenant prête
 
-    # Cleanup au shutdown
+    # Cleanup au shutdown : écrire les prédictions encore en tampon
+    if app.state.shadow is not None:
+        app.state.shadow.close()
+        app.state.shadow = None
+    if app.state.audit is not None:
+        app.state.audit.close()
+        app.state.audit = None
     model_loaded.set(0)
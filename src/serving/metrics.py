@@ -4,16 +4,84 @@ from fastapi import Response
 from prometheus_client import Counter, Gauge, Histogram, generate_latest
 
 model_predictions = Counter(
-    "model_predictions_total", "Total predictions", ["predicted_class"]
+    "model_predictions_total", "Total predictions", ["predicted_class", "model"]
 )
 model_confidence = Histogram(
     "model_confidence",
     "Prediction confidence",
-    ["predicted_class"],
+    ["predicted_class", "model"],
     buckets=[0.0, 0.5, 0.7, 0.8, 0.9, 0.95, 1.0],
 )
 model_loaded = Gauge("model_loaded", "Model loaded (1) or not (0)")
+warmup_duration = Gauge(
+    "warmup_duration_seconds", "Duration of the startup warm-up predictions"
+)
 api_errors = Counter("api_errors_total", "Total errors", ["error_type", "endpoint"])
+registry_models_loaded = Gauge(
+    "registry_models_loaded", "Models currently loaded in the serving registry"
+)
+registry_memory_bytes = Gauge(
+    "registry_memory_bytes", "Estimated memory of the models loaded in the registry"
+)
+registry_evictions = Counter(
+    "registry_evictions_total", "Models unloaded to stay under the memory budget"
+)
+# Répartition A/B (un label par bras)
+ab_requests = Counter("ab_requests_total", "Requests routed to each A/B arm", ["arm"])
+ab_errors = Counter("ab_errors_total", "Failed requests per A/B arm", ["arm"])
+ab_latency = Histogram("ab_latency_seconds", "Prediction latency per A/B arm", ["arm"])
+ab_confidence = Histogram(
+    "ab_confidence",
+    "Prediction confidence per A/B arm",
+    ["arm"],
+    buckets=[0.0, 0.5, 0.7, 0.8, 0.9, 0.95, 1.0],
+)
+ab_weight = Gauge("ab_weight", "Current traffic share of each A/B arm", ["arm"])
+# Inférence fantôme (candidat évalué après la réponse principale)
+shadow_requests = Counter(
+    "shadow_requests_total", "Shadow scoring requests", ["outcome"]
+)
+shadow_predictions = Counter(
+    "shadow_predictions_total",
+    "Shadow predictions by agreement with the primary model",
+    ["agreement"],
+)
+shadow_probability_delta = Histogram(
+    "shadow_probability_delta",
+    "Max absolute probability difference between candidate and primary",
+    buckets=[0.0, 0.01, 0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0],
+)
+shadow_latency = Histogram(
+    "shadow_latency_seconds", "Candidate model inference latency"
+)
+audit_records_written = Counter(
+    "audit_records_written_total", "Predictions written to the audit log"
+)
+audit_records_dropped = Counter(
+    "audit_records_dropped_total", "Predictions dropped from the audit log"
+)
+# Dérive (mises à jour au scrape par DriftMonitor.export)
+drift_samples = Gauge("drift_samples", "Predictions seen by the drift monitor")
+feature_drift_psi = Gauge(
+    "feature_drift_psi", "Population Stability Index vs reference", ["feature"]
+)
+feature_drift_kl = Gauge(
+    "feature_drift_kl", "KL divergence (live || reference)", ["feature"]
+)
+feature_mean_shift = Gauge(
+    "feature_mean_shift",
+    "Live mean minus reference mean, in reference standard deviations",
+    ["feature"],
+)
+prediction_drift_psi = Gauge(
+    "prediction_drift_psi", "PSI of predicted classes vs reference class priors"
+)
+prediction_drift_kl = Gauge(
+    "prediction_drift_kl", "KL divergence of predicted classes vs reference priors"
+)
+log_records_dropped = Counter(
+    "log_records_dropped_total", "Log records dropped because the log queue was full"
+)
 
 
 def get_metrics_response() -> Response:
@@ -45,6 +45,27 @@ class IrisFeatures(BaseModel):
     )
 
 
+class TrafficSplitUpdate(BaseModel):
+    """Nouveaux poids des bras A/B (clé du registre ou "default" -> poids)"""
+
+    weights: Dict[str, float] = Field(..., min_length=1)
+
+    @field_validator("weights")
+    @classmethod
+    def validate_weights(cls, v: Dict[str, float]) -> Dict[str, float]:
+        if any(weight < 0 for weight in v.values()):
+            raise ValueError("Les poids doivent être positifs")
+        if sum(v.values()) <= 0:
+            raise ValueError("La somme des poids doit être > 0")
+        return v
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {"weights": {"default": 90, "IrisClassifier@challenger": 10}}
+        }
+    )
+
+
 class PredictionResponse(BaseModel):
     prediction: str
     confidence: float
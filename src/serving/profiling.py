@@ -0,0 +1,126 @@
+"""
+Profilage à la demande d'un worker en cours d'exécution
+Une capture bornée dans le temps est lancée par l'endpoint d'administration :
+- "sampling" : piles de tous les threads relevées à intervalle fixe
+  (format folded pour flamegraph.pl / speedscope)
+- "cprofile" : profil déterministe du thread de la boucle asyncio (là où
+  s'exécutent les routes async), fichier pstats
+- "tracemalloc" : différence entre deux instantanés mémoire (début / fin)
+
+Rien n'est installé hors capture (aucun surcoût au repos) et une seule capture
+peut tourner à la fois par worker.
+"""
+
+import asyncio
+import cProfile
+import marshal
+import os
+import tracemalloc
+from dataclasses import dataclass
+
+from src.profiling import SamplingProfiler
+
+CAPTURE_MODES = ("sampling", "cprofile", "tracemalloc")
+# Durée maximale d'une capture (surchargée par PROFILE_MAX_DURATION_S)
+DEFAULT_MAX_DURATION_S = 30.0
+TRACEMALLOC_FRAMES = 10
+TRACEMALLOC_TOP = 50
+
+_capture_lock = asyncio.Lock()
+
+
+class CaptureBusyError(RuntimeError):
+    """Une capture est déjà en cours sur ce worker"""
+
+
+@dataclass
+class CaptureResult:
+    """Résultat d'une capture, renvoyé en pièce jointe"""
+
+    content: bytes
+    filename: str
+    media_type: str
+
+
+def max_duration_s() -> float:
+    return float(os.getenv("PROFILE_MAX_DURATION_S", DEFAULT_MAX_DURATION_S))
+
+
+async def _capture_sampling(duration_s: float, interval_ms: float) -> CaptureResult:
+    sampler = SamplingProfiler(interval_ms / 1000, all_threads=True)
+    sampler.start()
+    try:
+        await asyncio.sleep(duration_s)
+    finally:
+        sampler.stop()
+    return CaptureResult(
+        content=(sampler.folded() + "\n").encode("utf-8"),
+        filename="profile.folded",
+        media_type="text/plain; charset=utf-8",
+    )
+
+
+async def _capture_cprofile(duration_s: float) -> CaptureResult:
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        await asyncio.sleep(duration_s)
+    finally:
+        profiler.disable()
+    # Même contenu que Profile.dump_stats, sans fichier temporaire
+    profiler.create_stats()
+    return CaptureResult(
+        content=marshal.dumps(profiler.stats),
+        filename="profile.prof",
+        media_type="application/octet-stream",
+    )
+
+
+async def _capture_tracemalloc(duration_s: float) -> CaptureResult:
+    # Ne pas arrêter un traçage démarré par ailleurs (PYTHONTRACEMALLOC...)
+    already_tracing = tracemalloc.is_tracing()
+    if not already_tracing:
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+    try:
+        before = tracemalloc.take_snapshot()
+        await asyncio.sleep(duration_s)
+        after = tracemalloc.take_snapshot()
+    finally:
+        if not already_tracing:
+            tracemalloc.stop()
+
+    lines = [f"Différence d'allocations sur {duration_s:.1f}s (top {TRACEMALLOC_TOP})"]
+    lines += [
+        str(stat) for stat in after.compare_to(before, "lineno")[:TRACEMALLOC_TOP]
+    ]
+    return CaptureResult(
+        content=("\n".join(lines) + "\n").encode("utf-8"),
+        filename="tracemalloc.txt",
+        media_type="text/plain; charset=utf-8",
+    )
+
+
+async def capture_profile(
+    mode: str, duration_s: float, interval_ms: float = 5.0
+) -> CaptureResult:
+    """
+    Capture le profil du worker pendant `duration_s` secondes
+
+    Raises:
+        ValueError: Mode inconnu ou durée hors de ]0, PROFILE_MAX_DURATION_S]
+        CaptureBusyError: Si une capture est déjà en cours
+    """
+    if mode not in CAPTURE_MODES:
+        raise ValueError(f"Mode inconnu : {mode} (attendu: {CAPTURE_MODES})")
+    limit = max_duration_s()
+    if not 0 < duration_s <= limit:
+        raise ValueError(f"La durée doit être dans ]0, {limit:g}] secondes")
+    if _capture_lock.locked():
+        raise CaptureBusyError("Une capture est déjà en cours")
+
+    async with _capture_lock:
+        if mode == "sampling":
+            return await _capture_sampling(duration_s, interval_ms)
+        if mode == "cprofile":
+            return await _capture_cprofile(duration_s)
+        return await _capture_tracemalloc(duration_s)
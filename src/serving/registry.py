@@ -0,0 +1,263 @@
+"""
+Registre multi-modèles du serving
+Le modèle de metadata.json reste le modèle par défaut (épinglé). D'autres
+versions peuvent être servies par le même processus, désignées par
+`mlflow_run_id` ou par alias du Model Registry (ex. IrisClassifier@champion) :
+elles sont chargées à la première requête puis gardées en cache LRU, et les
+moins récemment utilisées sont déchargées quand le budget mémoire est dépassé.
+
+Routage : header X-Model ou route /models/{clé}/predict.
+Seules les clés listées dans SERVING_MODELS peuvent être chargées : un client
+ne peut pas faire charger un run arbitraire.
+
+Variables d'environnement (lues par from_env) :
+- SERVING_MODELS : clés servables en plus du modèle par défaut (séparées par `,`)
+- MODEL_MEMORY_BUDGET_MB : budget mémoire des modèles chargés (512)
+"""
+
+import asyncio
+import logging
+import os
+import pickle
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+
+from .metrics import registry_evictions, registry_memory_bytes, registry_models_loaded
+
+logger = logging.getLogger("iris_api")
+
+# Clé du modèle par défaut et header de routage
+DEFAULT_MODEL_KEY = "default"
+MODEL_HEADER = "X-Model"
+
+# Identifiant de run MLflow (hexadécimal, 32 caractères)
+_RUN_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+Loader = Callable[[str], Tuple[Any, Optional[str]]]
+
+
+class UnknownModelError(KeyError):
+    """Clé de modèle absente de SERVING_MODELS"""
+
+
+@dataclass
+class ModelEntry:
+    """Modèle chargé et son empreinte mémoire estimée"""
+
+    key: str
+    model: Any
+    run_id: Optional[str]
+    size_bytes: int
+    pinned: bool = False
+
+
+def model_uri_for_key(key: str) -> str:
+    """URI MLflow d'une clé : run id -> runs:/<id>/model, sinon models:/<clé>"""
+    if _RUN_ID_PATTERN.match(key):
+        return f"runs:/{key}/model"
+    return f"models:/{key}"
+
+
+# Tableaux par nœud d'un arbre sklearn (vues sur la structure interne, sans copie)
+_TREE_ARRAYS = (
+    "children_left",
+    "children_right",
+    "feature",
+    "threshold",
+    "impurity",
+    "n_node_samples",
+    "weighted_n_node_samples",
+    "value",
+)
+
+
+def estimate_model_bytes(model: Any) -> int:
+    """
+    Empreinte mémoire estimée du modèle
+
+    Forêts et arbres sklearn : somme des tableaux de nœuds de chaque arbre,
+    sans sérialisation. Autres modèles : taille sérialisée (pickle).
+    """
+    estimators = getattr(model, "estimators_", None)
+    if estimators is None and hasattr(model, "tree_"):
+        estimators = [model]
+    if estimators and all(hasattr(tree, "tree_") for tree in estimators):
+        return sum(
+            getattr(tree.tree_, name).nbytes
+            for tree in estimators
+            for name in _TREE_ARRAYS
+        )
+    return len(pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def serve_single_threaded(model: Any) -> Any:
+    """
+    Remet n_jobs à None : une prédiction d'une ligne ne doit pas passer par
+    joblib sur tous les coeurs (modèles enregistrés avec n_jobs=-1)
+    """
+    if hasattr(model, "n_jobs"):
+        model.set_params(n_jobs=None)
+    return model
+
+
+def load_mlflow_model(key: str) -> Tuple[Any, Optional[str]]:
+    """Charge un modèle depuis MLflow et retourne (modèle, run id)"""
+    import mlflow.models
+    import mlflow.sklearn
+
+    uri = model_uri_for_key(key)
+    model = serve_single_threaded(mlflow.sklearn.load_model(uri))
+    run_id = key if _RUN_ID_PATTERN.match(key) else None
+    if run_id is None:
+        run_id = mlflow.models.get_model_info(uri).run_id
+    return model, run_id
+
+
+class ModelRegistry:
+    """
+    Cache LRU de modèles sous budget mémoire
+
+    Usage:
+        registry = ModelRegistry(["IrisClassifier@challenger"], 512 * 2**20)
+        registry.register("abc...", model, run_id="abc...", pinned=True)
+        entry = await registry.get("IrisClassifier@challenger")
+    """
+
+    def __init__(
+        self,
+        allowed_keys: Iterable[str] = (),
+        memory_budget_bytes: int = 512 * 2**20,
+        loader: Loader = load_mlflow_model,
+    ):
+        self.allowed_keys = {key for key in allowed_keys if key}
+        self.memory_budget_bytes = memory_budget_bytes
+        self.loader = loader
+        self.default_key: Optional[str] = None
+        self._entries: "OrderedDict[str, ModelEntry]" = OrderedDict()
+        self._load_locks: Dict[str, asyncio.Lock] = {}
+
+    @classmethod
+    def from_env(cls) -> "ModelRegistry":
+        keys = os.getenv("SERVING_MODELS", "").split(",")
+        budget_mb = float(os.getenv("MODEL_MEMORY_BUDGET_MB", "512"))
+        return cls(
+            allowed_keys=[key.strip() for key in keys],
+            memory_budget_bytes=int(budget_mb * 2**20),
+        )
+
+    @property
+    def memory_bytes(self) -> int:
+        return sum(entry.size_bytes for entry in self._entries.values())
+
+    def loaded_keys(self) -> list:
+        """Clés chargées, de la moins à la plus récemment utilisée"""
+        return list(self._entries)
+
+    def register(
+        self,
+        key: str,
+        model: Any,
+        run_id: Optional[str] = None,
+        pinned: bool = False,
+        default: bool = False,
+        size_bytes: Optional[int] = None,
+    ) -> ModelEntry:
+        """
+        Ajoute un modèle déjà chargé (le modèle par défaut est épinglé)
+
+        `size_bytes` évite de recalculer l'empreinte quand elle a été estimée
+        hors de la boucle asyncio (voir get)
+        """
+        entry = ModelEntry(
+            key=key,
+            model=model,
+            run_id=run_id,
+            size_bytes=(
+                estimate_model_bytes(model) if size_bytes is None else size_bytes
+            ),
+            pinned=pinned or default,
+        )
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        if default:
+            self.default_key = key
+        self._evict()
+        return entry
+
+    def unpin(self, key: str) -> None:
+        """Rend un modèle chargé de nouveau déchargeable (sauf le modèle par défaut)"""
+        entry = self._entries.get(key)
+        if entry is None or key == self.default_key:
+            return
+        entry.pinned = False
+        self._evict()
+
+    async def get(self, key: str) -> ModelEntry:
+        """
+        Modèle de clé `key`, chargé (hors boucle asyncio) s'il ne l'est pas
+
+        Raises:
+            UnknownModelError: Si la clé n'est ni chargée ni autorisée
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            return entry
+        if key not in self.allowed_keys:
+            raise UnknownModelError(key)
+
+        # Un seul chargement par clé, même sous requêtes concurrentes
+        lock = self._load_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                start = time.perf_counter()
+                model, run_id, size_bytes = await run_in_threadpool(self._load, key)
+                entry = self.register(key, model, run_id=run_id, size_bytes=size_bytes)
+                logger.info(
+                    "Model loaded into registry",
+                    extra={
+                        "model": key,
+                        "run_id": run_id,
+                        "size_mb": round(entry.size_bytes / 2**20, 2),
+                        "load_s": round(time.perf_counter() - start, 3),
+                    },
+                )
+        if key in self._entries:
+            self._entries.move_to_end(key)
+        return entry
+
+    def _load(self, key: str) -> Tuple[Any, Optional[str], int]:
+        """Chargement et estimation de l'empreinte, dans le pool de threads"""
+        model, run_id = self.loader(key)
+        return model, run_id, estimate_model_bytes(model)
+
+    def _evict(self) -> None:
+        """Décharge les modèles LRU non épinglés jusqu'à repasser sous le budget"""
+        newest = next(reversed(self._entries), None)
+        for key in list(self._entries):
+            if self.memory_bytes <= self.memory_budget_bytes:
+                break
+            entry = self._entries[key]
+            # Le modèle qui vient d'être chargé n'est jamais déchargé
+            if entry.pinned or key == newest:
+                continue
+            del self._entries[key]
+            registry_evictions.inc()
+            logger.info("Model evicted from registry", extra={"model": key})
+
+        if self.memory_bytes > self.memory_budget_bytes:
+            logger.warning(
+                "Model memory budget exceeded",
+                extra={
+                    "memory_mb": round(self.memory_bytes / 2**20, 2),
+                    "budget_mb": round(self.memory_budget_bytes / 2**20, 2),
+                },
+            )
+        registry_models_loaded.set(len(self._entries))
+        registry_memory_bytes.set(self.memory_bytes)
@@ -3,20 +3,42 @@ Routes/Endpoints de l'API
 """
 
 import logging
-from typing import Dict
+import os
+import time
+from datetime import datetime, timezone
+from typing import Dict, Literal, Optional
 
 import numpy as np
-from fastapi import Depends, FastAPI, HTTPException, Request
+from fastapi import (
+    BackgroundTasks,
+    Depends,
+    FastAPI,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+)
+from fastapi.concurrency import run_in_threadpool
 
+from .audit import new_prediction_id
 from .metrics import (
+    ab_confidence,
+    ab_errors,
+    ab_latency,
+    ab_requests,
+    ab_weight,
     api_errors,
     get_metrics_response,
     model_confidence,
     model_predictions,
 )
 from .middleware import limiter
-from .models import HealthResponse, IrisFeatures, PredictionResponse
-from .security import verify_api_key
+from .models import HealthResponse, IrisFeatures, PredictionResponse, TrafficSplitUpdate
+from .profiling import CaptureBusyError, capture_profile
+from .registry import DEFAULT_MODEL_KEY, MODEL_HEADER, UnknownModelError
+from .security import verify_admin_key, verify_api_key
+from .traffic_split import ARM_HEADER, TrafficSplit, sticky_id
 
 logger = logging.getLogger("iris_api")
 
@@ -38,8 +60,12 @@ def register_routes(app: FastAPI):
         }
 
     @app.get("/metrics")
-    async def metrics():
+    async def metrics(request: Request):
         """Endpoint Prometheus pour les métriques"""
+        # Scores de dérive calculés au scrape, pas sur le chemin des prédictions
+        drift = getattr(request.app.state, "drift", None)
+        if drift is not None:
+            drift.export()
         return get_metrics_response()
 
     @app.get("/health", response_model=HealthResponse)
@@ -56,30 +82,83 @@ def register_routes(app: FastAPI):
             version=request.app.version,
         )
 
-    @app.post("/predict", response_model=PredictionResponse)
-    @limiter.limit("10/minute")  # ⚠️ SÉCURITÉ : 10 requêtes par minute par IP
-    async def predict_iris(
-        features: IrisFeatures,
-        request: Request,
-        api_key: str = Depends(
-            verify_api_key
-        ),  # ⚠️ SÉCURITÉ : Authentification requise
-    ):
+    async def resolve_model(request: Request, model_key: Optional[str]):
         """
-        Prédiction de la classe d'une fleur d'iris.
-        Récupère le modèle depuis request.app.state (évite globals).
+        Modèle servant la requête : modèle par défaut (metadata.json) ou
+        version du registre désignée par run id / alias
 
-        ⚠️ SÉCURITÉ :
-        - Authentification : Requiert une API key via le header X-API-Key
-        - Rate limiting : 10 requêtes par minute par adresse IP
-        - Validation : Les entrées sont validées par Pydantic (IrisFeatures)
+        Returns:
+            Tuple[model, label, run_id]: label = valeur du label Prometheus `model`
         """
-        model = getattr(request.app.state, "model", None)
-        metadata = getattr(request.app.state, "metadata", None)
+        metadata = getattr(request.app.state, "metadata", None) or {}
+        default_run_id = metadata.get("mlflow_run_id")
+        if model_key in (None, "", DEFAULT_MODEL_KEY, default_run_id):
+            model = getattr(request.app.state, "model", None)
+            if model is None:
+                # 503 Service Unavailable — le modèle n'est pas présent
+                raise HTTPException(status_code=503, detail="Modèle non chargé")
+            return model, default_run_id or DEFAULT_MODEL_KEY, default_run_id
 
-        if model is None:
-            # 503 Service Unavailable — le modèle n'est pas présent
-            raise HTTPException(status_code=503, detail="Modèle non chargé")
+        registry = getattr(request.app.state, "registry", None)
+        if registry is None:
+            raise HTTPException(status_code=404, detail="Modèle inconnu")
+        try:
+            entry = await registry.get(model_key)
+        except UnknownModelError:
+            raise HTTPException(status_code=404, detail="Modèle inconnu")
+        except Exception as exc:
+            api_errors.labels(error_type=type(exc).__name__, endpoint="/predict").inc()
+            logger.exception(
+                "Failed to load model",
+                extra={"model": model_key, "error_type": type(exc).__name__},
+            )
+            raise HTTPException(status_code=503, detail="Modèle indisponible")
+        return entry.model, entry.key, entry.run_id
+
+    async def predict(
+        request: Request,
+        response: Response,
+        background_tasks: BackgroundTasks,
+        features: IrisFeatures,
+        model_key: Optional[str],
+    ) -> PredictionResponse:
+        """
+        Corps commun des routes /predict : sans modèle désigné, la répartition
+        A/B (si active) choisit le bras du client
+        """
+        split = getattr(request.app.state, "traffic_split", None)
+        if model_key is not None or split is None:
+            return await run_prediction(
+                request, response, background_tasks, features, model_key
+            )
+
+        arm = split.assign(sticky_id(request))
+        response.headers[ARM_HEADER] = arm
+        ab_requests.labels(arm=arm).inc()
+        start = time.perf_counter()
+        try:
+            result = await run_prediction(
+                request, response, background_tasks, features, arm
+            )
+        except HTTPException:
+            ab_errors.labels(arm=arm).inc()
+            raise
+        ab_latency.labels(arm=arm).observe(time.perf_counter() - start)
+        ab_confidence.labels(arm=arm).observe(result.confidence)
+        return result
+
+    async def run_prediction(
+        request: Request,
+        response: Response,
+        background_tasks: BackgroundTasks,
+        features: IrisFeatures,
+        model_key: Optional[str],
+    ) -> PredictionResponse:
+        """Prédiction par le modèle désigné"""
+        start = time.perf_counter()
+        model, model_label, run_id = await resolve_model(request, model_key)
+        metadata = getattr(request.app.state, "metadata", None)
+        response.headers[MODEL_HEADER] = model_label
 
         # Préparer l'array
         features_array = np.array(
@@ -131,18 +210,53 @@ def register_routes(app: FastAPI):
             confidence = float(max(proba)) if proba.size > 0 else 0.0
 
             # Tracker les métriques
-            model_predictions.labels(predicted_class=predicted_class).inc()
-            model_confidence.labels(predicted_class=predicted_class).observe(confidence)
+            model_predictions.labels(
+                predicted_class=predicted_class, model=model_label
+            ).inc()
+            model_confidence.labels(
+                predicted_class=predicted_class, model=model_label
+            ).observe(confidence)
+            # Dérive et shadow portent sur le seul modèle par défaut : les bras
+            # A/B et les versions X-Model ont leurs propres a priori de classes
+            served_by_default = model is getattr(request.app.state, "model", None)
+            drift = getattr(request.app.state, "drift", None)
+            if drift is not None and served_by_default:
+                drift.update(features_array[0].tolist(), pred_index)
+            # Candidat évalué après l'envoi de la réponse (jamais sur son chemin)
+            shadow = getattr(request.app.state, "shadow", None)
+            if shadow is not None and served_by_default and shadow.should_sample():
+                background_tasks.add_task(shadow.submit, features_array, proba)
 
             logger.info(
                 "Prediction made",
                 extra={
                     "predicted_class": predicted_class,
                     "confidence": confidence,
+                    "model": model_label,
                     "status": "success",
                 },
             )
 
+            # Journal d'audit : identifiant renvoyé pour la jointure avec les labels
+            audit = getattr(request.app.state, "audit", None)
+            if audit is not None:
+                prediction_id = new_prediction_id()
+                row = {
+                    "prediction_id": prediction_id,
+                    "timestamp": datetime.now(timezone.utc),
+                    "model_run_id": run_id,
+                    **features.model_dump(),
+                    "prediction": predicted_class,
+                    "confidence": confidence,
+                    "class_names": class_names,
+                    "probabilities": [float(p) for p in proba],
+                    "latency_ms": (time.perf_counter() - start) * 1000,
+                }
+                # Tampon plein : attente hors de la boucle asyncio (contre-pression)
+                if not audit.try_record(row):
+                    await run_in_threadpool(audit.record, row)
+                response.headers["X-Prediction-ID"] = prediction_id
+
             return PredictionResponse(
                 prediction=predicted_class,
                 confidence=confidence,
@@ -165,6 +279,50 @@ def register_routes(app: FastAPI):
                 detail="Erreur lors de la prédiction. Veuillez vérifier vos données d'entrée.",
             )
 
+    @app.post("/predict", response_model=PredictionResponse)
+    @limiter.limit("10/minute")  # ⚠️ SÉCURITÉ : 10 requêtes par minute par IP
+    async def predict_iris(
+        features: IrisFeatures,
+        request: Request,
+        response: Response,
+        background_tasks: BackgroundTasks,
+        model_key: Optional[str] = Header(
+            None,
+            alias=MODEL_HEADER,
+            description="Run id ou alias (IrisClassifier@champion) ; défaut : modèle de metadata.json",
+        ),
+        api_key: str = Depends(
+            verify_api_key
+        ),  # ⚠️ SÉCURITÉ : Authentification requise
+    ):
+        """
+        Prédiction de la classe d'une fleur d'iris.
+        Récupère le modèle depuis request.app.state (évite globals) ; le header
+        X-Model désigne une autre version servie par le registre.
+
+        ⚠️ SÉCURITÉ :
+        - Authentification : Requiert une API key via le header X-API-Key
+        - Rate limiting : 10 requêtes par minute par adresse IP
+        - Validation : Les entrées sont validées par Pydantic (IrisFeatures)
+        - Seules les versions listées dans SERVING_MODELS peuvent être chargées
+        """
+        return await predict(request, response, background_tasks, features, model_key)
+
+    @app.post("/models/{model_key}/predict", response_model=PredictionResponse)
+    @limiter.limit("10/minute")  # ⚠️ SÉCURITÉ : 10 requêtes par minute par IP
+    async def predict_with_model(
+        model_key: str,
+        features: IrisFeatures,
+        request: Request,
+        response: Response,
+        background_tasks: BackgroundTasks,
+        api_key: str = Depends(
+            verify_api_key
+        ),  # ⚠️ SÉCURITÉ : Authentification requise
+    ):
+        """Prédiction par une version désignée dans le chemin (run id ou alias)"""
+        return await predict(request, response, background_tasks, features, model_key)
+
     @app.get("/model/info")
     @limiter.limit(
         "20/minute"
@@ -179,6 +337,7 @@ def register_routes(app: FastAPI):
         metadata = getattr(request.app.state, "metadata", None)
         metrics = getattr(request.app.state, "metrics", None)
         model = getattr(request.app.state, "model", None)
+        registry = getattr(request.app.state, "registry", None)
 
         if metadata is None and model is None:
             raise HTTPException(
@@ -203,4 +362,112 @@ def register_routes(app: FastAPI):
             "precision": metrics.get("precision") if metrics else "Unknown",
             "recall": metrics.get("recall") if metrics else "Unknown",
             "f1_score": metrics.get("f1_score") if metrics else "Unknown",
+            # Versions servies par ce processus (registre multi-modèles)
+            "loaded_models": registry.loaded_keys() if registry else [],
+            "servable_models": sorted(registry.allowed_keys) if registry else [],
         }
+
+    @app.post("/admin/profile")
+    async def profile_worker(
+        request: Request,
+        mode: Literal["sampling", "cprofile", "tracemalloc"] = Query(
+            "sampling", description="Type de capture"
+        ),
+        duration_s: float = Query(5.0, gt=0, description="Durée de la capture"),
+        interval_ms: float = Query(
+            5.0, ge=1.0, le=1000.0, description="Intervalle d'échantillonnage"
+        ),
+        admin_key: str = Depends(
+            verify_admin_key
+        ),  # ⚠️ SÉCURITÉ : Clé d'administration requise (X-Admin-Key)
+    ):
+        """
+        Profile le worker qui reçoit la requête pendant `duration_s` secondes
+        et renvoie la capture en pièce jointe (folded, pstats ou texte).
+
+        ⚠️ SÉCURITÉ / CHARGE :
+        - Authentification : clé d'administration (ADMIN_API_KEY), désactivé sinon
+        - Durée plafonnée (PROFILE_MAX_DURATION_S), une capture à la fois (409)
+        """
+        try:
+            result = await capture_profile(mode, duration_s, interval_ms)
+        except CaptureBusyError as exc:
+            raise HTTPException(status_code=409, detail=str(exc))
+        except ValueError as exc:
+            raise HTTPException(status_code=422, detail=str(exc))
+
+        logger.info(
+            "Profile captured",
+            extra={"mode": mode, "duration_s": duration_s, "size": len(result.content)},
+        )
+        filename = f"worker-{os.getpid()}-{result.filename}"
+        return Response(
+            content=result.content,
+            media_type=result.media_type,
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        )
+
+    @app.get("/admin/traffic-split")
+    async def get_traffic_split(
+        request: Request,
+        admin_key: str = Depends(
+            verify_admin_key
+        ),  # ⚠️ SÉCURITÉ : Clé d'administration requise (X-Admin-Key)
+    ):
+        """Poids courants des bras A/B (vide si la répartition est inactive)"""
+        split = getattr(request.app.state, "traffic_split", None)
+        return {"weights": split.weights if split else {}}
+
+    @app.put("/admin/traffic-split")
+    async def update_traffic_split(
+        update: TrafficSplitUpdate,
+        request: Request,
+        admin_key: str = Depends(
+            verify_admin_key
+        ),  # ⚠️ SÉCURITÉ : Clé d'administration requise (X-Admin-Key)
+    ):
+        """
+        Modifie à chaud les poids des bras A/B (active la répartition si besoin).
+        Les bras doivent être "default" ou une version servable (SERVING_MODELS) ;
+        ils sont chargés avant que la nouvelle table ne prenne effet.
+        """
+        state = request.app.state
+        previous = getattr(state, "traffic_split", None)
+        # Poids validés (nouvelle table construite) avant tout chargement
+        try:
+            split = TrafficSplit(update.weights, seed=previous.seed if previous else 0)
+        except ValueError as exc:
+            raise HTTPException(status_code=422, detail=str(exc))
+
+        registry = getattr(state, "registry", None)
+        entries = []
+        for key in split.weights:
+            if key == DEFAULT_MODEL_KEY:
+                continue
+            if registry is None:
+                raise HTTPException(status_code=422, detail=f"Modèle inconnu : {key}")
+            try:
+                entries.append(await registry.get(key))
+            except UnknownModelError:
+                raise HTTPException(status_code=422, detail=f"Modèle inconnu : {key}")
+            except Exception:
+                raise HTTPException(
+                    status_code=503, detail=f"Modèle indisponible : {key}"
+                )
+
+        # Bras épinglés tant qu'ils reçoivent du trafic, retirés : déchargeables
+        for entry in entries:
+            entry.pinned = True
+        if previous is not None and registry is not None:
+            shadow = getattr(state, "shadow", None)
+            for key in set(previous.weights) - set(split.weights):
+                if key != DEFAULT_MODEL_KEY and (shadow is None or key != shadow.key):
+                    registry.unpin(key)
+
+        # Remplacement atomique : une requête voit l'ancienne ou la nouvelle table
+        state.traffic_split = split
+        ab_weight.clear()
+        for key, share in split.weights.items():
+            ab_weight.labels(arm=key).set(share)
+        logger.info("Traffic split updated", extra={"weights": split.weights})
+        return {"weights": split.weights}
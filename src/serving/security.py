@@ -5,6 +5,7 @@ Gère l'authentification par API key et le rate limiting
 
 import logging
 import os
+import secrets
 from typing import Optional
 
 from fastapi import HTTPException, Request, Security, status
@@ -15,6 +16,9 @@ logger = logging.getLogger("iris_api")
 API_KEY_HEADER_NAME = "X-API-Key"
 api_key_header = APIKeyHeader(name=API_KEY_HEADER_NAME, auto_error=False)
 
+ADMIN_KEY_HEADER_NAME = "X-Admin-Key"
+admin_key_header = APIKeyHeader(name=ADMIN_KEY_HEADER_NAME, auto_error=False)
+
 
 def verify_api_key(
     request: Request, api_key: Optional[str] = Security(api_key_header)
@@ -85,6 +89,45 @@ def verify_api_key(
     return api_key
 
 
+def verify_admin_key(
+    request: Request, admin_key: Optional[str] = Security(admin_key_header)
+) -> str:
+    """
+    Vérifie la clé d'administration (endpoints /admin/*)
+    Sans ADMIN_API_KEY configurée, les endpoints d'administration sont
+    désactivés, quel que soit l'environnement.
+    """
+    valid_key = os.getenv("ADMIN_API_KEY")
+    client_ip = request.client.host if request.client else "unknown"
+
+    if not valid_key:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Endpoints d'administration désactivés (ADMIN_API_KEY non configurée)",
+        )
+
+    if not admin_key:
+        logger.warning(f"Tentative d'accès admin sans clé depuis {client_ip}")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Clé admin manquante. Fournissez la clé via le header X-Admin-Key",
+            headers={"WWW-Authenticate": "ApiKey"},
+        )
+
+    # Comparaison à temps constant
+    if not secrets.compare_digest(admin_key.encode(), valid_key.encode()):
+        logger.warning(
+            f"Tentative d'accès admin avec une clé invalide depuis {client_ip}"
+        )
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Clé admin invalide",
+            headers={"WWW-Authenticate": "ApiKey"},
+        )
+
+    return admin_key
+
+
 def get_remote_address(request: Request) -> str:
     """Récupère l'adresse IP du client pour le rate limiting (support proxy)"""
     if not request.client:
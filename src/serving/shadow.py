@@ -0,0 +1,160 @@
+"""
+Inférence fantôme (shadow) d'un modèle candidat sur le trafic réel
+Une fraction des requêtes /predict est aussi évaluée par le candidat, une fois
+la réponse principale envoyée (tâche d'arrière-plan Starlette), dans un
+exécuteur dédié à un seul thread. Le candidat ne modifie jamais la réponse.
+
+Sous charge, le travail fantôme est abandonné plutôt que mis en attente :
+au-delà de `max_pending` évaluations en cours ou en file, la requête n'est
+pas évaluée (shadow_requests_total{outcome="dropped"}).
+
+Variables d'environnement (lues par shadow_from_env) :
+- SHADOW_MODEL : clé du candidat dans le registre (run id ou alias), vide = désactivé
+- SHADOW_SAMPLE_RATE : fraction des requêtes évaluées (0.1)
+- SHADOW_MAX_PENDING : évaluations en attente maximales (100)
+"""
+
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+import numpy as np
+
+from .metrics import (
+    shadow_latency,
+    shadow_predictions,
+    shadow_probability_delta,
+    shadow_requests,
+)
+
+logger = logging.getLogger("iris_api")
+
+
+class ShadowScorer:
+    """
+    Évaluation du candidat hors du chemin de la réponse
+
+    Usage:
+        shadow = ShadowScorer(candidate, "IrisClassifier@challenger", sample_rate=0.1)
+        if shadow.should_sample():
+            background_tasks.add_task(shadow.submit, features_array, proba)
+        shadow.close()  # au shutdown
+    """
+
+    def __init__(
+        self,
+        model: Any,
+        key: str,
+        sample_rate: float = 0.1,
+        max_pending: int = 100,
+    ):
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("Le taux d'échantillonnage doit être dans [0, 1]")
+        if max_pending <= 0:
+            raise ValueError("max_pending doit être > 0")
+        self.model = model
+        self.key = key
+        self.sample_rate = sample_rate
+        self.max_pending = max_pending
+        self.pending = 0
+        self._lock = threading.Lock()
+        # Un seul thread : le candidat ne peut pas monopoliser les coeurs
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="shadow")
+
+    def should_sample(self) -> bool:
+        return self.sample_rate >= 1.0 or random.random() < self.sample_rate
+
+    async def submit(self, features: np.ndarray, primary_proba: np.ndarray) -> bool:
+        """
+        Met l'évaluation en file (sans attendre son résultat)
+
+        Coroutine : exécutée par Starlette après l'envoi de la réponse, dans
+        la boucle asyncio, sans passer par le pool de threads.
+
+        Returns:
+            bool: False si l'évaluation a été abandonnée (file pleine)
+        """
+        with self._lock:
+            if self.pending >= self.max_pending:
+                shadow_requests.labels(outcome="dropped").inc()
+                return False
+            self.pending += 1
+        try:
+            self._executor.submit(self._score, features, primary_proba)
+        except RuntimeError:
+            # Exécuteur arrêté (shutdown en cours)
+            self._done()
+            shadow_requests.labels(outcome="dropped").inc()
+            return False
+        return True
+
+    def run_in_executor(self, fn: Callable, *args) -> Future:
+        """Exécute fn(*args) dans le thread fantôme (préchauffage au démarrage)"""
+        return self._executor.submit(fn, *args)
+
+    def _done(self) -> None:
+        with self._lock:
+            self.pending -= 1
+
+    def _score(self, features: np.ndarray, primary_proba: np.ndarray) -> None:
+        try:
+            start = time.perf_counter()
+            proba = self.model.predict_proba(features)[0]
+            shadow_latency.observe(time.perf_counter() - start)
+            if proba.shape != primary_proba.shape:
+                raise ValueError(
+                    f"Classes incompatibles : {proba.shape} vs {primary_proba.shape}"
+                )
+            agree = int(np.argmax(proba)) == int(np.argmax(primary_proba))
+            shadow_predictions.labels(agreement="agree" if agree else "disagree").inc()
+            shadow_probability_delta.observe(
+                float(np.max(np.abs(proba - primary_proba)))
+            )
+            shadow_requests.labels(outcome="scored").inc()
+        except Exception as exc:
+            shadow_requests.labels(outcome="error").inc()
+            logger.warning(
+                "Shadow scoring failed",
+                extra={
+                    "model": self.key,
+                    "error": str(exc),
+                    "error_type": type(exc).__name__,
+                },
+            )
+        finally:
+            self._done()
+
+    def close(self, wait: bool = False) -> None:
+        """Arrête l'exécuteur (évaluations en file abandonnées sauf si `wait`)"""
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+
+
+async def shadow_from_env(registry) -> Optional[ShadowScorer]:
+    """
+    Charge le candidat SHADOW_MODEL dans le registre (épinglé : jamais
+    déchargé) et retourne l'évaluateur, ou None si désactivé / indisponible
+    """
+    key = os.getenv("SHADOW_MODEL", "").strip()
+    if not key:
+        return None
+    registry.allowed_keys.add(key)
+    try:
+        entry = await registry.get(key)
+    except Exception as exc:
+        logger.error(
+            "Shadow model unavailable",
+            extra={"model": key, "error": str(exc), "error_type": type(exc).__name__},
+        )
+        return None
+    entry.pinned = True
+    logger.info("Shadow scoring enabled", extra={"model": key})
+    return ShadowScorer(
+        entry.model,
+        key,
+        sample_rate=float(os.getenv("SHADOW_SAMPLE_RATE", "0.1")),
+        max_pending=int(os.getenv("SHADOW_MAX_PENDING", "100")),
+    )
@@ -0,0 +1,193 @@
+"""
+Logging asynchrone et structuré de l'API
+Les handlers appelés sur le chemin de la requête ne font que déposer l'entrée
+dans une file bornée (QueueHandler) ; un thread QueueListener la formate en
+JSON et l'écrit sur stderr. Quand la file est pleine, l'entrée est abandonnée
+et comptée (log_records_dropped_total) au lieu de bloquer la requête. Les
+logs de succès (extra status="success") peuvent être échantillonnés.
+
+Variables d'environnement (lues par setup_logging) :
+- LOG_LEVEL : niveau du logger racine (INFO)
+- LOG_FORMAT : "json" ou "text" (json)
+- LOG_QUEUE_SIZE : taille de la file (10000)
+- LOG_SUCCESS_SAMPLE_RATE : fraction des logs de succès conservée (1.0)
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from .metrics import log_records_dropped
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# Attributs standard d'un LogRecord (le reste vient de `extra=...`)
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Une ligne JSON par entrée, champs `extra` inclus"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc)
+            .isoformat(timespec="milliseconds")
+            .replace("+00:00", "Z"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class SuccessSamplingFilter(logging.Filter):
+    """Ne conserve qu'une fraction `rate` des logs de succès (INFO et moins)"""
+
+    def __init__(self, rate: float = 1.0):
+        super().__init__()
+        if not 0.0 <= rate <= 1.0:
+            raise ValueError("Le taux d'échantillonnage doit être dans [0, 1]")
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.rate >= 1.0 or record.levelno > logging.INFO:
+            return True
+        if getattr(record, "status", None) != "success":
+            return True
+        return random.random() < self.rate
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    QueueHandler non bloquant : file pleine = entrée abandonnée et comptée
+
+    La mise en forme (JSON, traceback) est laissée au thread du listener :
+    seul le message est résolu ici pour figer ses arguments.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            log_records_dropped.inc()
+
+
+class DrainingQueueListener(QueueListener):
+    """
+    QueueListener dont l'arrêt attend une place dans la file pour la
+    sentinelle (file pleine = entrées vidées d'abord) ; arrêt idempotent
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.running = False
+
+    def start(self) -> None:
+        super().start()
+        self.running = True
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
+    def stop(self) -> None:
+        if self.running:
+            self.running = False
+            super().stop()
+
+
+# Configuration courante : un seul listener et un seul handler par processus
+_listener: Optional[DrainingQueueListener] = None
+_queue_handler: Optional[DroppingQueueHandler] = None
+_atexit_registered = False
+
+
+def setup_logging(
+    level: Optional[str] = None,
+    log_format: Optional[str] = None,
+    queue_size: Optional[int] = None,
+    success_sample_rate: Optional[float] = None,
+) -> QueueListener:
+    """
+    Ajoute la file non bloquante au logger racine et démarre le listener
+    (arrêté, file vidée, à la sortie du processus)
+
+    Idempotent : un nouvel appel remplace la configuration précédente de ce
+    module ; les handlers installés par ailleurs (pytest, application hôte)
+    sont conservés.
+
+    Args:
+        level: Niveau (surcharge LOG_LEVEL si fourni)
+        log_format: "json" ou "text" (surcharge LOG_FORMAT si fourni)
+        queue_size: Taille de la file (surcharge LOG_QUEUE_SIZE si fourni)
+        success_sample_rate: Fraction des logs de succès conservée
+            (surcharge LOG_SUCCESS_SAMPLE_RATE si fourni)
+
+    Returns:
+        QueueListener: Listener démarré
+    """
+    global _listener, _queue_handler, _atexit_registered
+
+    level = level or os.getenv("LOG_LEVEL", "INFO")
+    log_format = (log_format or os.getenv("LOG_FORMAT", "json")).lower()
+    queue_size = queue_size or int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+    if success_sample_rate is None:
+        success_sample_rate = float(os.getenv("LOG_SUCCESS_SAMPLE_RATE", "1.0"))
+
+    root = logging.getLogger()
+    if _listener is not None:
+        stop_logging(_listener)
+    if _queue_handler is not None:
+        root.removeHandler(_queue_handler)
+
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(
+        JsonFormatter() if log_format == "json" else logging.Formatter(TEXT_FORMAT)
+    )
+    log_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+    _queue_handler = DroppingQueueHandler(log_queue)
+    _queue_handler.addFilter(SuccessSamplingFilter(success_sample_rate))
+    root.addHandler(_queue_handler)
+    root.setLevel(getattr(logging, level.upper(), logging.INFO))
+
+    _listener = DrainingQueueListener(
+        log_queue, stream_handler, respect_handler_level=True
+    )
+    _listener.start()
+    if not _atexit_registered:
+        atexit.register(stop_logging)
+        _atexit_registered = True
+    return _listener
+
+
+def stop_logging(listener: Optional[QueueListener] = None) -> None:
+    """
+    Vide la file puis arrête le listener (celui de setup_logging par défaut ;
+    sans effet s'il est déjà arrêté)
+    """
+    listener = listener or _listener
+    if listener is not None:
+        listener.stop()
@@ -0,0 +1,118 @@
+"""
+Répartition A/B du trafic entre modèles chargés, avec affectation collante
+Chaque client est haché (crc32 de X-Client-ID, sinon de la clé API, sinon de
+l'adresse IP) dans l'un des BUCKETS seaux ; une table précalculée de BUCKETS
+entrées donne le bras (clé du registre) de chaque seau. Le routage est un
+crc32 et une lecture de tuple : O(1), sans structure construite par requête
+(seul l'encodage de l'identifiant en bytes alloue, crc32 n'acceptant pas str).
+
+Les bras occupent des plages contiguës de seaux, dans l'ordre de déclaration :
+augmenter le poids du dernier bras (montée progressive d'un challenger) ne
+fait que lui ajouter des clients, ceux déjà affectés restent en place.
+
+Les poids peuvent être modifiés à chaud (PUT /admin/traffic-split) : la
+nouvelle table remplace l'ancienne en une seule affectation d'attribut.
+
+Variables d'environnement (lues par from_env) :
+- AB_ARMS : bras et poids, ex. "default:90,IrisClassifier@challenger:10" (vide = désactivé)
+- AB_SEED : graine du hachage (changer de graine = nouvelle expérience)
+"""
+
+import math
+import os
+import zlib
+from typing import Dict, Optional
+
+from fastapi import Request
+
+BUCKETS = 10_000
+CLIENT_ID_HEADER = "X-Client-ID"
+ARM_HEADER = "X-AB-Arm"
+
+
+def parse_arms(spec: str) -> Dict[str, float]:
+    """Analyse "clé:poids,clé:poids" (le poids suit le dernier ':')"""
+    weights: Dict[str, float] = {}
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        key, sep, weight = item.rpartition(":")
+        if not sep or not key:
+            raise ValueError(f"Bras invalide : {item!r} (attendu clé:poids)")
+        weights[key.strip()] = float(weight)
+    return weights
+
+
+def sticky_id(request: Request) -> str:
+    """Identifiant d'affectation : X-Client-ID, sinon clé API, sinon IP"""
+    headers = request.headers
+    client_id = headers.get(CLIENT_ID_HEADER) or headers.get("X-API-Key")
+    if client_id:
+        return client_id
+    return request.client.host if request.client else ""
+
+
+class TrafficSplit:
+    """
+    Table de routage pondérée, collante par client
+
+    Usage:
+        split = TrafficSplit({"default": 90, "IrisClassifier@challenger": 10})
+        arm = split.assign(sticky_id(request))
+        split.set_weights({"default": 50, "IrisClassifier@challenger": 50})
+    """
+
+    def __init__(self, weights: Dict[str, float], seed: int = 0):
+        self.seed = seed
+        self.weights: Dict[str, float] = {}
+        self._table: tuple = ()
+        self.set_weights(weights)
+
+    @classmethod
+    def from_env(cls) -> Optional["TrafficSplit"]:
+        weights = parse_arms(os.getenv("AB_ARMS", ""))
+        if not weights:
+            return None
+        return cls(weights, seed=int(os.getenv("AB_SEED", "0")))
+
+    def set_weights(self, weights: Dict[str, float]) -> None:
+        """
+        Remplace les poids (normalisés) et reconstruit la table des seaux
+
+        Raises:
+            ValueError: Aucun bras, poids non fini ou négatif, ou somme nulle
+        """
+        if not weights:
+            raise ValueError("Au moins un bras est requis")
+        non_finite = [
+            key for key, weight in weights.items() if not math.isfinite(weight)
+        ]
+        if non_finite:
+            raise ValueError(f"Poids non finis (inf/nan) pour : {non_finite}")
+        if any(weight < 0 for weight in weights.values()):
+            raise ValueError("Les poids doivent être positifs")
+        total = float(sum(weights.values()))
+        if total <= 0:
+            raise ValueError("La somme des poids doit être > 0")
+
+        # Plages contiguës : bornes cumulées arrondies, dernier bras jusqu'au bout
+        table = []
+        cumulative = 0.0
+        for key, weight in weights.items():
+            cumulative += weight
+            end = round(cumulative / total * BUCKETS)
+            table.extend([key] * (end - len(table)))
+        table.extend([key] * (BUCKETS - len(table)))
+
+        normalized = {key: weight / total for key, weight in weights.items()}
+        # Affectations atomiques : une requête voit l'ancienne ou la nouvelle table
+        self._table = tuple(table)
+        self.weights = normalized
+
+    def assign(self, client_id: str) -> str:
+        """
+        Bras du client (chemin chaud : un crc32 et un accès au tuple)
+        client_id.encode() alloue un bytes par appel : inévitable pour une str
+        """
+        return self._table[zlib.crc32(client_id.encode(), self.seed) % BUCKETS]
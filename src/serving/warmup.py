@@ -0,0 +1,121 @@
+"""
+Préchauffage du serving avant que l'application ne soit déclarée prête
+La première prédiction après le démarrage est bien plus lente que les
+suivantes : imports paresseux de scikit-learn / numpy, allocations du premier
+appel, démarrage des pools de threads, construction du schéma OpenAPI. Le
+lifespan exécute donc des prédictions synthétiques sur chaque chemin
+d'inférence actif (modèle par défaut, bras A/B, candidat fantôme dans son
+exécuteur) avant de rendre la main au serveur.
+
+Le préchauffage n'emprunte pas la route HTTP : métriques de prédiction,
+dérive et journal d'audit ne voient aucune ligne synthétique.
+
+Variables d'environnement (lues par warm_up) :
+- WARMUP_ITERATIONS : prédictions synthétiques par chemin (20, 0 = désactivé)
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+from fastapi import FastAPI
+
+from .metrics import warmup_duration
+from .models import IrisFeatures, PredictionResponse
+from .registry import DEFAULT_MODEL_KEY
+
+logger = logging.getLogger("iris_api")
+
+FEATURE_NAMES = list(IrisFeatures.model_fields)
+
+
+def synthetic_features(iterations: int, seed: int = 0) -> List[Dict[str, float]]:
+    """Corps de requête synthétiques (plages usuelles des fleurs d'iris)"""
+    rng = np.random.default_rng(seed)
+    rows = rng.uniform([4.0, 2.0, 1.0, 0.1], [8.0, 4.5, 7.0, 2.5], (iterations, 4))
+    return [dict(zip(FEATURE_NAMES, row.tolist())) for row in rows]
+
+
+def _predict_once(model: Any, payload: Dict[str, float]) -> None:
+    """Même séquence que /predict : validation, tableau, probabilités, réponse"""
+    features = IrisFeatures(**payload)
+    features_array = np.array(
+        [getattr(features, name) for name in FEATURE_NAMES], dtype=float
+    ).reshape(1, -1)
+    proba = model.predict_proba(features_array)[0]
+    PredictionResponse(
+        prediction=str(int(np.argmax(proba))),
+        confidence=float(max(proba)),
+        probabilities={str(i): float(p) for i, p in enumerate(proba)},
+    ).model_dump_json()
+
+
+def warm_up_model(model: Any, payloads: List[Dict[str, float]]) -> Tuple[float, float]:
+    """
+    Prédictions synthétiques sur un modèle
+
+    Returns:
+        Tuple[float, float]: durée du premier appel et médiane des suivants (s)
+    """
+    durations = []
+    for payload in payloads:
+        start = time.perf_counter()
+        _predict_once(model, payload)
+        durations.append(time.perf_counter() - start)
+    steady = float(np.median(durations[1:])) if len(durations) > 1 else durations[0]
+    return durations[0], steady
+
+
+async def warm_up(app: FastAPI) -> Dict[str, Tuple[float, float]]:
+    """
+    Préchauffe chaque chemin d'inférence actif de `app.state`
+
+    Returns:
+        Dict[str, Tuple[float, float]]: (premier appel, régime établi) par chemin
+    """
+    iterations = int(os.getenv("WARMUP_ITERATIONS", "20"))
+    state = app.state
+    if iterations <= 0 or getattr(state, "model", None) is None:
+        return {}
+
+    start = time.perf_counter()
+    payloads = synthetic_features(iterations)
+    timings = {DEFAULT_MODEL_KEY: warm_up_model(state.model, payloads)}
+
+    split = getattr(state, "traffic_split", None)
+    registry = getattr(state, "registry", None)
+    if split is not None and registry is not None:
+        for key in split.weights:
+            if key != DEFAULT_MODEL_KEY and key not in timings:
+                entry = await registry.get(key)
+                timings[key] = warm_up_model(entry.model, payloads)
+
+    # Candidat fantôme : dans son propre exécuteur (démarre son thread)
+    shadow = getattr(state, "shadow", None)
+    if shadow is not None:
+        timings[f"shadow:{shadow.key}"] = await asyncio.wrap_future(
+            shadow.run_in_executor(warm_up_model, shadow.model, payloads)
+        )
+
+    # Schéma OpenAPI (Pydantic) construit paresseusement au premier /docs
+    app.openapi()
+
+    elapsed = time.perf_counter() - start
+    warmup_duration.set(elapsed)
+    logger.info(
+        "Warm-up completed",
+        extra={
+            "duration_s": round(elapsed, 3),
+            "paths": {
+                key: {
+                    "first_ms": round(first * 1000, 2),
+                    "steady_ms": round(steady * 1000, 2),
+                }
+                for key, (first, steady) in timings.items()
+            },
+        },
+    )
+    return timings
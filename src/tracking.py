@@ -0,0 +1,205 @@
+"""
+Logging MLflow groupé et asynchrone
+Accumule params, métriques et tags puis les envoie via MlflowClient.log_batch :
+un aller-retour réseau par lot au lieu d'un par valeur contre un serveur distant.
+Le vidage peut être fait en arrière-plan pour ne pas bloquer l'entraînement.
+"""
+
+import atexit
+import logging
+import threading
+import weakref
+from typing import Any, Dict, List, Optional
+
+import mlflow
+from mlflow.entities import Metric, Param, RunTag
+from mlflow.tracking import MlflowClient
+from mlflow.utils.time import get_current_time_millis
+
+logger = logging.getLogger(__name__)
+
+# Limites imposées par l'API log_batch de MLflow
+MAX_ENTITIES_PER_BATCH = 1000
+MAX_PARAMS_TAGS_PER_BATCH = 100
+
+# Loggers ouverts, vidés à la sortie du processus (garantie flush-on-exit)
+_open_loggers: "weakref.WeakSet[BatchedMlflowLogger]" = weakref.WeakSet()
+
+
+class BatchedMlflowLogger:
+    """
+    Accumulateur de params/métriques/tags pour un run MLflow
+
+    Usage:
+        with BatchedMlflowLogger() as tracker:
+            tracker.log_params({"n_estimators": 100})
+            tracker.log_metric("accuracy", 0.97)
+        # vidé en un seul appel log_batch à la sortie du bloc
+    """
+
+    def __init__(
+        self,
+        run_id: Optional[str] = None,
+        client: Optional[MlflowClient] = None,
+        background: bool = False,
+        flush_interval_s: float = 5.0,
+    ):
+        """
+        Args:
+            run_id: Run cible (défaut: run actif, démarré si nécessaire comme
+                le fait l'API fluent mlflow.log_metric)
+            client: Client MLflow (défaut: client sur le tracking URI courant)
+            background: Vider périodiquement depuis un thread dédié
+            flush_interval_s: Intervalle de vidage en arrière-plan
+        """
+        if run_id is None:
+            run = mlflow.active_run() or mlflow.start_run()
+            run_id = run.info.run_id
+        self.run_id = run_id
+        self.client = client or MlflowClient()
+        self.flush_interval_s = flush_interval_s
+
+        self._params: Dict[str, Param] = {}
+        self._tags: Dict[str, RunTag] = {}
+        self._metrics: List[Metric] = []
+        self._buffer_lock = threading.Lock()
+        # Sérialise les envois pour préserver l'ordre des métriques
+        self._send_lock = threading.Lock()
+        self._closed = False
+
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        if background:
+            self._thread = threading.Thread(
+                target=self._flush_loop, name="mlflow-batch-logger", daemon=True
+            )
+            self._thread.start()
+
+        _open_loggers.add(self)
+
+    # ------------------------------------------------------------------
+    # Accumulation
+    # ------------------------------------------------------------------
+    def log_param(self, key: str, value: Any) -> None:
+        with self._buffer_lock:
+            self._params[key] = Param(key, str(value))
+
+    def log_params(self, params: Dict[str, Any]) -> None:
+        for key, value in params.items():
+            self.log_param(key, value)
+
+    def log_metric(self, key: str, value: float, step: int = 0) -> None:
+        metric = Metric(key, float(value), get_current_time_millis(), step)
+        with self._buffer_lock:
+            self._metrics.append(metric)
+
+    def log_metrics(self, metrics: Dict[str, float], step: int = 0) -> None:
+        timestamp = get_current_time_millis()
+        batch = [Metric(k, float(v), timestamp, step) for k, v in metrics.items()]
+        with self._buffer_lock:
+            self._metrics.extend(batch)
+
+    def set_tag(self, key: str, value: Any) -> None:
+        with self._buffer_lock:
+            self._tags[key] = RunTag(key, str(value))
+
+    def set_tags(self, tags: Dict[str, Any]) -> None:
+        for key, value in tags.items():
+            self.set_tag(key, value)
+
+    # ------------------------------------------------------------------
+    # Vidage
+    # ------------------------------------------------------------------
+    def flush(self) -> int:
+        """
+        Envoie tout ce qui est en attente (bloquant)
+
+        Returns:
+            int: Nombre d'appels log_batch effectués
+        """
+        with self._send_lock:
+            with self._buffer_lock:
+                params = list(self._params.values())
+                tags = list(self._tags.values())
+                metrics = self._metrics
+                self._params, self._tags, self._metrics = {}, {}, []
+
+            batches = _split_batches(params, tags, metrics)
+            n_calls = 0
+            try:
+                for batch in batches:
+                    self.client.log_batch(self.run_id, **batch)
+                    n_calls += 1
+            except Exception:
+                # Remettre en file les lots non acceptés (à partir de celui en
+                # échec) : renvoyer les précédents dupliquerait des points
+                pending = batches[n_calls:]
+                with self._buffer_lock:
+                    for batch in pending:
+                        for param in batch["params"]:
+                            self._params.setdefault(param.key, param)
+                        for tag in batch["tags"]:
+                            self._tags.setdefault(tag.key, tag)
+                    self._metrics = [
+                        metric for batch in pending for metric in batch["metrics"]
+                    ] + self._metrics
+                raise
+            return n_calls
+
+    def close(self) -> None:
+        """
+        Arrête le thread d'arrière-plan et vide le reste (idempotent)
+        Si le vidage échoue, le logger reste ouvert et enregistré : un nouvel
+        appel (ou le hook de sortie) retente l'envoi des valeurs en attente
+        """
+        if self._closed:
+            return
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join()
+            self._thread = None
+        self.flush()
+        self._closed = True
+        _open_loggers.discard(self)
+
+    def _flush_loop(self) -> None:
+        while not self._stop_event.wait(self.flush_interval_s):
+            try:
+                self.flush()
+            except Exception as exc:
+                logger.warning(f"Échec du vidage MLflow en arrière-plan: {exc}")
+
+    def __enter__(self) -> "BatchedMlflowLogger":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+def _split_batches(
+    params: List[Param], tags: List[RunTag], metrics: List[Metric]
+) -> List[Dict[str, list]]:
+    """Découpe en lots respectant les limites de log_batch"""
+    batches = []
+    while params or tags or metrics:
+        batch_params = params[:MAX_PARAMS_TAGS_PER_BATCH]
+        batch_tags = tags[:MAX_PARAMS_TAGS_PER_BATCH]
+        n_metrics = MAX_ENTITIES_PER_BATCH - len(batch_params) - len(batch_tags)
+        batch_metrics = metrics[:n_metrics]
+        batches.append(
+            {"params": batch_params, "tags": batch_tags, "metrics": batch_metrics}
+        )
+        params = params[len(batch_params) :]
+        tags = tags[len(batch_tags) :]
+        metrics = metrics[len(batch_metrics) :]
+    return batches
+
+
+@atexit.register
+def _flush_open_loggers() -> None:
+    """Garantit qu'aucune valeur en attente n'est perdue à la sortie du processus"""
+    for batch_logger in list(_open_loggers):
+        try:
+            batch_logger.close()
+        except Exception as exc:
+            logger.error(f"Échec du vidage MLflow à la sortie: {exc}")
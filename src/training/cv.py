@@ -0,0 +1,288 @@
+"""
+Validation croisée k-fold stratifiée, parallèle, avec découpage mis en cache
+Les indices de folds sont calculés une seule fois puis conservés dans un
+fichier clé par empreinte des données et graine (data/cache/folds/). Les
+folds sont ajustés en parallèle dans un pool de processus (données installées
+une fois par worker) et évalués avec le moteur de métriques en une passe
+(matrice de confusion). Moyenne et écart-type sont loggés dans MLflow et
+models/cv_metrics.json.
+
+Usage:
+    poetry run python -m src.training.cv --n-splits 5 --workers 4
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import StratifiedKFold
+
+from src.config import get_config
+from src.data.manifest import load_manifest
+from src.data.schema import TARGET_COLUMN
+from src.evaluation.metrics import (
+    ConfusionMatrixAccumulator,
+    compute_classification_metrics,
+)
+
+logger = logging.getLogger(__name__)
+
+# Métriques agrégées sur les folds (clé MLflow -> attribut ClassificationMetrics)
+CV_METRICS = {
+    "accuracy": "accuracy",
+    "precision": "precision_weighted",
+    "recall": "recall_weighted",
+    "f1_score": "f1_weighted",
+}
+
+
+def data_fingerprint(
+    X: np.ndarray, y: np.ndarray, manifest: Optional[dict] = None
+) -> str:
+    """
+    Empreinte des données : SHA-256 des fichiers du manifeste si disponible
+    (rien à relire), sinon des tableaux eux-mêmes
+    """
+    digest = hashlib.sha256()
+    if manifest is not None:
+        for split in sorted(manifest["files"]):
+            digest.update(manifest["files"][split]["sha256"].encode())
+    else:
+        digest.update(np.ascontiguousarray(X).tobytes())
+        digest.update(np.ascontiguousarray(y).tobytes())
+    return digest.hexdigest()
+
+
+def fold_assignments(
+    y: np.ndarray,
+    n_splits: int,
+    seed: int,
+    data_hash: str,
+    cache_dir: Optional[Path] = None,
+) -> np.ndarray:
+    """
+    Numéro de fold de chaque ligne (folds stratifiés), lu depuis le cache si
+    le même découpage a déjà été calculé
+
+    Returns:
+        np.ndarray: Tableau int8 de longueur len(y), valeurs 0..n_splits-1
+    """
+    cache_path = None
+    if cache_dir is not None:
+        cache_path = Path(cache_dir) / f"folds_{data_hash[:16]}_k{n_splits}_s{seed}.npy"
+        if cache_path.exists():
+            folds = np.load(cache_path)
+            if len(folds) == len(y):
+                logger.info(f"   ♻️  Folds lus depuis le cache : {cache_path}")
+                return folds
+
+    splitter = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=seed)
+    folds = np.empty(len(y), dtype=np.int8)
+    for fold, (_, test_idx) in enumerate(splitter.split(np.zeros(len(y)), y)):
+        folds[test_idx] = fold
+
+    if cache_path is not None:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        np.save(cache_path, folds)
+        logger.info(f"   💾 Folds mis en cache : {cache_path}")
+    return folds
+
+
+# Données installées une fois par processus du pool (évite de les renvoyer
+# à chaque fold)
+_worker_data: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+
+
+def _init_worker(X: np.ndarray, y: np.ndarray, folds: np.ndarray) -> None:
+    global _worker_data
+    _worker_data = (X, y, folds)
+
+
+def _fit_fold(
+    fold: int, params: Dict, n_classes: int, data=None
+) -> Tuple[np.ndarray, float]:
+    """Ajuste et évalue un fold ; retourne sa matrice de confusion et son temps"""
+    X, y, folds = data if data is not None else _worker_data
+    test_mask = folds == fold
+    model = RandomForestClassifier(**params, n_jobs=1)
+    start = time.perf_counter()
+    model.fit(X[~test_mask], y[~test_mask])
+    fit_time = time.perf_counter() - start
+
+    acc = ConfusionMatrixAccumulator(n_classes)
+    acc.update(y[test_mask], model.predict(X[test_mask]))
+    return acc.matrix, fit_time
+
+
+def cross_validate(
+    X: np.ndarray,
+    y: np.ndarray,
+    params: Dict,
+    n_splits: int = 5,
+    seed: int = 42,
+    n_workers: int = 1,
+    cache_dir: Optional[Path] = None,
+    data_hash: Optional[str] = None,
+) -> Dict:
+    """
+    Validation croisée stratifiée (folds en parallèle)
+
+    Args:
+        X, y: Données (y encodé 0..n_classes-1)
+        params: Paramètres du RandomForestClassifier (hors n_jobs)
+        n_splits: Nombre de folds
+        seed: Graine du découpage
+        n_workers: Processus du pool (1 = séquentiel, -1 = tous les coeurs)
+        cache_dir: Dossier du cache des folds (None = pas de cache)
+        data_hash: Empreinte des données (calculée si None)
+
+    Returns:
+        Dict: cv_<métrique>_mean / cv_<métrique>_std, cv_folds, cv_time_s
+    """
+    if n_splits < 2:
+        raise ValueError("n_splits doit être >= 2")
+    n_classes = int(y.max()) + 1
+    data_hash = data_hash or data_fingerprint(X, y)
+    folds = fold_assignments(y, n_splits, seed, data_hash, cache_dir)
+
+    if n_workers == -1:
+        n_workers = os.cpu_count() or 1
+    n_workers = max(1, min(n_workers, n_splits))
+
+    start = time.perf_counter()
+    if n_workers == 1:
+        results = [
+            _fit_fold(fold, params, n_classes, data=(X, y, folds))
+            for fold in range(n_splits)
+        ]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=n_workers, initializer=_init_worker, initargs=(X, y, folds)
+        ) as executor:
+            futures = [
+                executor.submit(_fit_fold, fold, params, n_classes)
+                for fold in range(n_splits)
+            ]
+            results = [future.result() for future in futures]
+    elapsed = time.perf_counter() - start
+
+    per_fold = [compute_classification_metrics(matrix) for matrix, _ in results]
+    summary: Dict = {"cv_folds": n_splits, "cv_time_s": elapsed}
+    for name, attribute in CV_METRICS.items():
+        values = np.array([getattr(m, attribute) for m in per_fold])
+        summary[f"cv_{name}_mean"] = float(values.mean())
+        summary[f"cv_{name}_std"] = float(values.std())
+    summary["cv_fit_time_s_mean"] = float(np.mean([t for _, t in results]))
+
+    logger.info(
+        f"   CV {n_splits} folds ({n_workers} workers, {elapsed:.2f}s) : "
+        f"accuracy={summary['cv_accuracy_mean']:.4f} "
+        f"± {summary['cv_accuracy_std']:.4f}"
+    )
+    return summary
+
+
+def load_cv_data(
+    processed_dir: Path = Path("data/processed"),
+) -> Tuple[np.ndarray, np.ndarray, Optional[str]]:
+    """
+    Données de la CV : train + test préparés (toutes les lignes étiquetées)
+
+    Returns:
+        Tuple[X, y, data_hash]: data_hash est None sans manifeste
+    """
+    from src.training.train import load_data
+
+    config = get_config()
+    train_df, test_df, iris_metadata = load_data(
+        config.data.test_size, config.data.random_state
+    )
+    df = pd.concat([train_df, test_df], ignore_index=True)
+    X = df[iris_metadata["feature_names"]].to_numpy()
+    y = df[TARGET_COLUMN].to_numpy()
+    manifest = load_manifest(processed_dir)
+    data_hash = data_fingerprint(X, y, manifest) if manifest is not None else None
+    return X, y, data_hash
+
+
+def run_cv_stage(
+    n_splits: Optional[int] = None,
+    n_workers: Optional[int] = None,
+    output_path: Path = Path("models/cv_metrics.json"),
+) -> Dict:
+    """
+    Étape DVC : validation croisée avec les paramètres de params.yaml,
+    loggée dans un run MLflow dédié et écrite dans models/cv_metrics.json
+
+    Args:
+        n_splits: Nombre de folds (surcharge params.yaml si fourni)
+        n_workers: Processus du pool (surcharge params.yaml si fourni)
+        output_path: Fichier JSON des métriques
+    """
+    import mlflow
+
+    from src.tracking import BatchedMlflowLogger
+    from src.training.train import configure_mlflow
+
+    config = get_config()
+    n_splits = n_splits or config.cv.n_splits
+    n_workers = n_workers or config.cv.n_workers
+    X, y, data_hash = load_cv_data()
+    params = {
+        "n_estimators": config.train.n_estimators,
+        "max_depth": config.train.max_depth,
+        "random_state": config.train.random_state,
+    }
+
+    configure_mlflow("iris-cv")
+    with mlflow.start_run(run_name=f"cv_k{n_splits}"), BatchedMlflowLogger(
+        background=config.tracking.background_flush,
+        flush_interval_s=config.tracking.flush_interval_s,
+    ) as tracker:
+        summary = cross_validate(
+            X,
+            y,
+            params,
+            n_splits=n_splits,
+            seed=config.cv.seed,
+            n_workers=n_workers,
+            cache_dir=Path(config.cv.cache_dir),
+            data_hash=data_hash,
+        )
+        tracker.log_params(
+            {**params, "cv.n_splits": n_splits, "cv.seed": config.cv.seed}
+        )
+        tracker.log_metrics(summary)
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    logger.info(f"💾 Métriques de validation croisée : {output_path}")
+    return summary
+
+
+if __name__ == "__main__":
+    import argparse
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    parser = argparse.ArgumentParser(description="Validation croisée k-fold")
+    parser.add_argument("--n-splits", type=int, help="Nombre de folds (>= 2)")
+    parser.add_argument("--workers", type=int, help="Processus (-1 = tous les coeurs)")
+    parser.add_argument("--output", type=Path, default=Path("models/cv_metrics.json"))
+    args = parser.parse_args()
+
+    if args.n_splits is not None and args.n_splits < 2:
+        parser.error("--n-splits doit être >= 2")
+    run_cv_stage(
+        n_splits=args.n_splits, n_workers=args.workers, output_path=args.output
+    )
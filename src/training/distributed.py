@@ -0,0 +1,263 @@
+"""
+Entraînement distribué d'une forêt par sous-forêts (sharding des arbres)
+Un coordinateur répartit le budget d'arbres (et en option des shards de
+données stratifiés) entre des workers, chacun ajuste une sous-forêt avec sa
+propre graine, puis les `estimators_` sont fusionnés en un seul
+RandomForestClassifier (loggé dans MLflow comme un modèle classique).
+
+Deux types de workers :
+- processus locaux (ProcessPoolExecutor)
+- noeuds distants joignables via multiprocessing.connection (authentifiés
+  par une clé partagée), lancés avec :
+      TRAIN_WORKER_AUTHKEY=... poetry run python -m src.training.distributed \
+          --host 0.0.0.0 --port 6000
+"""
+
+import copy
+import logging
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import StratifiedKFold
+
+logger = logging.getLogger(__name__)
+
+AUTHKEY_ENV = "TRAIN_WORKER_AUTHKEY"
+
+
+def split_tree_budget(n_estimators: int, n_workers: int) -> List[int]:
+    """Répartit n_estimators arbres entre workers (écart d'au plus un arbre)"""
+    if n_workers <= 0:
+        raise ValueError("n_workers doit être > 0")
+    n_workers = min(n_workers, n_estimators)
+    base, extra = divmod(n_estimators, n_workers)
+    return [base + (i < extra) for i in range(n_workers)]
+
+
+def worker_seeds(random_state: int, n_workers: int) -> List[int]:
+    """Graines indépendantes par worker, dérivées de random_state"""
+    children = np.random.SeedSequence(random_state).spawn(n_workers)
+    return [int(child.generate_state(1)[0]) for child in children]
+
+
+def shard_indices(y: np.ndarray, n_shards: int, random_state: int) -> List[np.ndarray]:
+    """Shards de données disjoints et stratifiés (chaque shard voit toutes les classes)"""
+    splitter = StratifiedKFold(
+        n_splits=n_shards, shuffle=True, random_state=random_state
+    )
+    return [test for _, test in splitter.split(np.zeros(len(y)), y)]
+
+
+def fit_subforest(task: Dict) -> RandomForestClassifier:
+    """Ajuste une sous-forêt (exécuté dans un worker local ou distant)"""
+    model = RandomForestClassifier(
+        n_estimators=task["n_estimators"],
+        max_depth=task["max_depth"],
+        random_state=task["seed"],
+        n_jobs=task.get("n_jobs", 1),
+    )
+    return model.fit(task["X"], task["y"])
+
+
+def merge_forests(forests: Sequence[RandomForestClassifier]) -> RandomForestClassifier:
+    """
+    Fusionne des sous-forêts en une seule forêt (concaténation des arbres)
+
+    Raises:
+        ValueError: Si les sous-forêts n'ont pas les mêmes classes / features
+    """
+    if not forests:
+        raise ValueError("Aucune sous-forêt à fusionner")
+    reference = forests[0]
+    for forest in forests[1:]:
+        if not np.array_equal(forest.classes_, reference.classes_):
+            raise ValueError("Sous-forêts ajustées sur des classes différentes")
+        if forest.n_features_in_ != reference.n_features_in_:
+            raise ValueError("Sous-forêts ajustées sur des features différentes")
+
+    merged = copy.deepcopy(reference)
+    merged.estimators_ = [tree for forest in forests for tree in forest.estimators_]
+    merged.n_estimators = len(merged.estimators_)
+    return merged
+
+
+def _run_local(tasks: List[Dict], n_workers: int) -> List[RandomForestClassifier]:
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        return list(executor.map(fit_subforest, tasks))
+
+
+def _parse_address(address: str) -> Tuple[str, int]:
+    host, port = address.rsplit(":", 1)
+    return host, int(port)
+
+
+def _fit_remote(address: str, authkey: bytes, task: Dict) -> RandomForestClassifier:
+    with Client(_parse_address(address), authkey=authkey) as conn:
+        conn.send(("fit", task))
+        status, payload = conn.recv()
+    if status != "ok":
+        raise RuntimeError(f"Worker {address} en échec : {payload}")
+    return payload
+
+
+def _run_remote(
+    tasks: List[Dict], addresses: Sequence[str], authkey: bytes
+) -> List[RandomForestClassifier]:
+    # Une tâche par noeud à la fois, attribution circulaire
+    with ThreadPoolExecutor(max_workers=len(addresses)) as executor:
+        futures = [
+            executor.submit(_fit_remote, addresses[i % len(addresses)], authkey, task)
+            for i, task in enumerate(tasks)
+        ]
+        return [future.result() for future in futures]
+
+
+def train_sharded(
+    X: np.ndarray,
+    y: np.ndarray,
+    n_estimators: int,
+    max_depth: Optional[int],
+    random_state: int,
+    n_workers: int = 2,
+    worker_addresses: Optional[Sequence[str]] = None,
+    authkey: Optional[bytes] = None,
+    shard_data: bool = False,
+) -> RandomForestClassifier:
+    """
+    Coordinateur : répartit les arbres entre workers puis fusionne les sous-forêts
+
+    Args:
+        X, y: Données d'entraînement
+        n_estimators: Nombre total d'arbres
+        max_depth: Profondeur maximale des arbres
+        random_state: Graine (détermine les graines des workers)
+        n_workers: Nombre de sous-forêts / processus locaux
+        worker_addresses: Noeuds distants "host:port" (None = processus locaux)
+        authkey: Clé partagée des noeuds distants (défaut: $TRAIN_WORKER_AUTHKEY)
+        shard_data: Chaque worker n'ajuste que son shard de données (stratifié)
+
+    Returns:
+        RandomForestClassifier: Forêt fusionnée de n_estimators arbres
+    """
+    budgets = split_tree_budget(n_estimators, n_workers)
+    seeds = worker_seeds(random_state, len(budgets))
+    shards = (
+        shard_indices(y, len(budgets), random_state)
+        if shard_data
+        else [slice(None)] * len(budgets)
+    )
+    tasks = [
+        {
+            "X": X[shard],
+            "y": y[shard],
+            "n_estimators": budget,
+            "max_depth": max_depth,
+            "seed": seed,
+            # Noeud distant : tous ses coeurs ; processus local : un coeur chacun
+            "n_jobs": -1 if worker_addresses else 1,
+        }
+        for budget, seed, shard in zip(budgets, seeds, shards)
+    ]
+
+    if worker_addresses:
+        authkey = authkey or os.environ.get(AUTHKEY_ENV, "").encode()
+        if not authkey:
+            raise ValueError(f"Clé partagée requise ({AUTHKEY_ENV})")
+        logger.info(f"🛰️  {len(tasks)} sous-forêts sur {len(worker_addresses)} noeuds")
+        forests = _run_remote(tasks, list(worker_addresses), authkey)
+    else:
+        logger.info(f"🧩 {len(tasks)} sous-forêts sur {len(tasks)} processus locaux")
+        forests = _run_local(tasks, len(tasks))
+    return merge_forests(forests)
+
+
+def serve_worker(listener: Listener, max_tasks: Optional[int] = None) -> None:
+    """
+    Boucle d'un noeud worker : reçoit des tâches ("fit", task) et renvoie la
+    sous-forêt ; ("stop", None) arrête la boucle
+
+    Args:
+        listener: Listener déjà ouvert (authentifié par sa clé)
+        max_tasks: Nombre de tâches à traiter avant de s'arrêter (None = illimité)
+    """
+    served = 0
+    while max_tasks is None or served < max_tasks:
+        try:
+            conn = listener.accept()
+        except AuthenticationError:
+            logger.warning("Connexion refusée : clé d'authentification invalide")
+            continue
+        except (EOFError, ConnectionError) as exc:
+            logger.warning(f"Connexion interrompue pendant l'authentification : {exc}")
+            continue
+        with conn:
+            # Coordinateur déconnecté : connexion fermée, retour à accept()
+            try:
+                command, task = conn.recv()
+            except (EOFError, ConnectionError) as exc:
+                logger.warning(f"Coordinateur déconnecté avant la tâche : {exc}")
+                continue
+            if command == "stop":
+                return
+            try:
+                result = ("ok", fit_subforest(task))
+            except Exception as exc:  # renvoyé au coordinateur
+                result = ("error", f"{type(exc).__name__}: {exc}")
+            try:
+                conn.send(result)
+            except (EOFError, ConnectionError) as exc:
+                logger.warning(f"Coordinateur déconnecté avant le résultat : {exc}")
+                continue
+        served += 1
+
+
+def start_local_worker(authkey: bytes) -> Tuple[str, threading.Thread]:
+    """
+    Noeud worker local (thread) sur un port libre : remplaçant d'un noeud
+    distant pour les tests et le développement
+
+    Returns:
+        Tuple[str, Thread]: Adresse "host:port" et thread du worker
+    """
+    listener = Listener(("127.0.0.1", 0), authkey=authkey)
+    host, port = listener.address
+
+    def _serve() -> None:
+        with listener:
+            serve_worker(listener)
+
+    thread = threading.Thread(target=_serve, name="train-worker", daemon=True)
+    thread.start()
+    return f"{host}:{port}", thread
+
+
+def stop_worker(address: str, authkey: bytes) -> None:
+    """Demande l'arrêt d'un noeud worker"""
+    with Client(_parse_address(address), authkey=authkey) as conn:
+        conn.send(("stop", None))
+
+
+if __name__ == "__main__":
+    import argparse
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    parser = argparse.ArgumentParser(description="Noeud worker d'entraînement")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6000)
+    args = parser.parse_args()
+
+    key = os.environ.get(AUTHKEY_ENV, "").encode()
+    if not key:
+        parser.error(f"Variable d'environnement {AUTHKEY_ENV} requise")
+    with Listener((args.host, args.port), authkey=key) as worker_listener:
+        logger.info(f"🛰️  Worker d'entraînement à l'écoute sur {args.host}:{args.port}")
+        serve_worker(worker_listener)
@@ -0,0 +1,145 @@
+"""
+Arrêt anticipé sur le nombre d'arbres à partir du score out-of-bag (OOB)
+La forêt croît par incréments (warm_start) ; après chaque incrément, la
+précision et le log-loss OOB sont calculés sans jeu de validation. La
+croissance s'arrête quand la métrique suivie ne s'améliore plus de `tol`
+pendant `patience` incréments, et la forêt est ramenée au plus petit nombre
+d'arbres ayant atteint le plateau (latence de serving plus faible).
+"""
+
+import logging
+import warnings
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+
+logger = logging.getLogger(__name__)
+
+# Probabilité minimale pour le log-loss (comme sklearn, évite log(0))
+_EPS = 1e-15
+
+
+@dataclass
+class OOBCurve:
+    """Courbe OOB : une entrée par incrément d'arbres"""
+
+    n_estimators: List[int] = field(default_factory=list)
+    accuracy: List[float] = field(default_factory=list)
+    log_loss: List[float] = field(default_factory=list)
+    best_n_estimators: int = 0
+    stopped_early: bool = False
+
+
+def oob_metrics(model: RandomForestClassifier, y: np.ndarray) -> tuple:
+    """
+    Précision et log-loss OOB du modèle courant
+
+    Les échantillons jamais hors-sac (petites forêts) sont ignorés : sklearn
+    leur attribue une ligne de probabilités nulles.
+
+    Returns:
+        tuple: (accuracy, log_loss), NaN si aucun échantillon n'est hors-sac
+    """
+    proba = model.oob_decision_function_
+    valid = proba.sum(axis=1) > 0
+    if not valid.any():
+        return float("nan"), float("nan")
+    proba, y_valid = proba[valid], y[valid]
+    codes = np.searchsorted(model.classes_, y_valid)
+    accuracy = float((proba.argmax(axis=1) == codes).mean())
+    p_true = np.clip(proba[np.arange(len(codes)), codes], _EPS, 1.0)
+    return accuracy, float(-np.log(p_true).mean())
+
+
+def fit_with_oob_early_stopping(
+    model: RandomForestClassifier,
+    X: np.ndarray,
+    y: np.ndarray,
+    step: int = 10,
+    tol: float = 1e-3,
+    patience: int = 3,
+    metric: str = "log_loss",
+    tracker=None,
+) -> OOBCurve:
+    """
+    Ajuste `model` par incréments de `step` arbres jusqu'au plateau OOB
+
+    `model.n_estimators` sert de budget maximal. Le modèle est modifié en place
+    et tronqué au meilleur nombre d'arbres.
+
+    Args:
+        model: Forêt non ajustée (bootstrap=True)
+        X, y: Données d'entraînement
+        step: Arbres ajoutés à chaque incrément
+        tol: Amélioration minimale de la métrique pour repousser le plateau
+        patience: Incréments sans amélioration avant l'arrêt
+        metric: "log_loss" (minimisé) ou "accuracy" (maximisée)
+        tracker: BatchedMlflowLogger optionnel (historique oob_* par nb d'arbres)
+
+    Returns:
+        OOBCurve: Courbe OOB et nombre d'arbres retenu
+    """
+    if metric not in ("log_loss", "accuracy"):
+        raise ValueError(f"Métrique OOB inconnue : {metric}")
+    if step <= 0 or patience <= 0:
+        raise ValueError("step et patience doivent être > 0")
+    if not model.bootstrap:
+        raise ValueError("Le score OOB nécessite bootstrap=True")
+
+    max_estimators = model.n_estimators
+    sign = 1.0 if metric == "log_loss" else -1.0  # on minimise sign * métrique
+    curve = OOBCurve()
+    best_value: Optional[float] = None
+    stale_steps = 0
+
+    model.set_params(oob_score=True, warm_start=True)
+    n_estimators = 0
+    while n_estimators < max_estimators:
+        n_estimators = min(n_estimators + step, max_estimators)
+        model.set_params(n_estimators=n_estimators)
+        with warnings.catch_warnings():
+            # Petites forêts : certains échantillons ne sont jamais hors-sac
+            warnings.simplefilter("ignore", UserWarning)
+            model.fit(X, y)
+
+        accuracy, log_loss = oob_metrics(model, y)
+        curve.n_estimators.append(n_estimators)
+        curve.accuracy.append(accuracy)
+        curve.log_loss.append(log_loss)
+        if np.isnan(accuracy):
+            # Aucun échantillon hors-sac : point ignoré pour la décision
+            continue
+        if tracker is not None:
+            tracker.log_metrics(
+                {"oob_accuracy": accuracy, "oob_log_loss": log_loss}, step=n_estimators
+            )
+
+        value = sign * (log_loss if metric == "log_loss" else accuracy)
+        if best_value is None or value < best_value - tol:
+            best_value = value
+            curve.best_n_estimators = n_estimators
+            stale_steps = 0
+        else:
+            stale_steps += 1
+            if stale_steps >= patience:
+                curve.stopped_early = n_estimators < max_estimators
+                break
+
+    # Plus petite forêt ayant atteint le plateau
+    best = curve.best_n_estimators or n_estimators
+    curve.best_n_estimators = best
+    model.estimators_ = model.estimators_[:best]
+    model.set_params(n_estimators=best, warm_start=False)
+    best_index = curve.n_estimators.index(best)
+    model.oob_score_ = curve.accuracy[best_index]
+    # La fonction de décision OOB correspondait à la forêt non tronquée
+    del model.oob_decision_function_
+
+    logger.info(
+        f"   OOB : {best} arbres retenus sur {n_estimators} ajustés "
+        f"(accuracy={curve.accuracy[best_index]:.4f}, "
+        f"log_loss={curve.log_loss[best_index]:.4f})"
+    )
+    return curve
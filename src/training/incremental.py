@@ -0,0 +1,249 @@
+"""
+Entraînement incrémental : croissance de la forêt de production (warm_start)
+Charge le modèle référencé par models/metadata.json, ajuste K arbres
+supplémentaires sur les données courantes en conservant les arbres existants,
+évalue, puis enregistre le nouveau modèle avec sa lignée (run MLflow parent).
+
+Usage:
+    poetry run python -m src.training.incremental --n-new-trees 50
+"""
+
+import json
+import logging
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Tuple
+
+import mlflow
+import mlflow.sklearn
+import numpy as np
+from sklearn.base import clone
+from sklearn.ensemble import RandomForestClassifier
+
+from src.config import get_config
+from src.data.schema import TARGET_COLUMN
+from src.evaluation.evaluate import evaluate_model
+from src.tracking import BatchedMlflowLogger
+from src.training.train import (
+    configure_mlflow,
+    load_data,
+    parallel_context,
+    save_production_model,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def load_production_model(
+    model_dir: Path = Path("models"),
+) -> Tuple[RandomForestClassifier, dict]:
+    """
+    Charge le modèle de production et ses métadonnées
+
+    Raises:
+        FileNotFoundError: Si models/metadata.json n'existe pas
+        ValueError: Si les métadonnées ne référencent pas de run MLflow
+    """
+    metadata_path = Path(model_dir) / "metadata.json"
+    if not metadata_path.exists():
+        raise FileNotFoundError(f"Métadonnées non trouvées : {metadata_path}")
+    metadata = json.loads(metadata_path.read_text(encoding="utf-8"))
+    if not metadata.get("mlflow_run_id"):
+        raise ValueError("mlflow_run_id non trouvé dans metadata.json")
+
+    # URI d'artefact absolue si disponible (indépendante du tracking URI courant)
+    model_uri = metadata.get("mlflow_run_uri") or (
+        f"runs:/{metadata['mlflow_run_id']}/model"
+    )
+    logger.info(f"📥 Chargement du modèle parent : {model_uri}")
+    return mlflow.sklearn.load_model(model_uri), metadata
+
+
+def grow_forest(
+    model: RandomForestClassifier, X: np.ndarray, y: np.ndarray, n_new_trees: int
+) -> RandomForestClassifier:
+    """
+    Ajoute `n_new_trees` arbres ajustés sur (X, y) ; les arbres existants
+    sont conservés tels quels
+
+    Raises:
+        ValueError: Si les classes de y diffèrent de celles du modèle
+            (les anciens arbres ne prédiraient pas les mêmes colonnes)
+    """
+    if n_new_trees <= 0:
+        raise ValueError("n_new_trees doit être > 0")
+    if not np.array_equal(np.unique(y), model.classes_):
+        raise ValueError(
+            f"Classes des nouvelles données {np.unique(y).tolist()} différentes "
+            f"de celles du modèle {model.classes_.tolist()}"
+        )
+
+    model.set_params(warm_start=True, n_estimators=len(model.estimators_) + n_new_trees)
+    model.fit(X, y)
+    # Le modèle enregistré se comporte ensuite comme un modèle classique
+    model.set_params(warm_start=False)
+    return model
+
+
+def train_incremental(
+    n_new_trees: Optional[int] = None,
+    model_dir: Path = Path("models"),
+    experiment_name: str = "iris-classification",
+    run_name: Optional[str] = None,
+    compare_full_retrain: bool = True,
+) -> Tuple[RandomForestClassifier, dict]:
+    """
+    Fait croître le modèle de production puis l'enregistre comme nouveau modèle
+
+    Args:
+        n_new_trees: Arbres à ajouter (surcharge params.yaml si fourni)
+        model_dir: Dossier de metadata.json (modèle parent, puis nouveau modèle)
+        experiment_name: Nom de l'experiment MLflow
+        run_name: Nom du run MLflow (auto-généré si None)
+        compare_full_retrain: Mesurer aussi un réentraînement complet de même
+            taille pour rapporter le gain de temps
+
+    Returns:
+        Tuple[RandomForestClassifier, dict]: Modèle agrandi et métadonnées
+    """
+    config = get_config()
+    n_new_trees = n_new_trees or config.train.incremental_trees
+    configure_mlflow(experiment_name)
+
+    model, parent_metadata = load_production_model(model_dir)
+    parent_run_id = parent_metadata["mlflow_run_id"]
+    n_parent_trees = len(model.estimators_)
+    n_estimators = n_parent_trees + n_new_trees
+
+    if run_name is None:
+        timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        run_name = f"incremental_{n_parent_trees}+{n_new_trees}_{timestamp}"
+
+    with mlflow.start_run(run_name=run_name), BatchedMlflowLogger(
+        background=config.tracking.background_flush,
+        flush_interval_s=config.tracking.flush_interval_s,
+    ) as tracker:
+        train_df, test_df, iris_metadata = load_data(
+            config.data.test_size, config.train.random_state
+        )
+        feature_cols = iris_metadata["feature_names"]
+        X_train = train_df[feature_cols].values
+        y_train = train_df[TARGET_COLUMN].values
+        X_test = test_df[feature_cols].values
+        y_test = test_df[TARGET_COLUMN].values
+
+        lineage = parent_metadata.get("lineage", []) + [parent_run_id]
+        tracker.log_params(
+            {
+                "training_mode": "incremental",
+                "n_estimators": n_estimators,
+                "n_parent_trees": n_parent_trees,
+                "n_new_trees": n_new_trees,
+                "max_depth": model.max_depth or "None",
+                "random_state": model.random_state,
+                "n_jobs": config.train.n_jobs,
+            }
+        )
+        tracker.set_tags(
+            {
+                "model_type": "RandomForestClassifier",
+                "training_mode": "incremental",
+                "parent_run_id": parent_run_id,
+                "lineage": ",".join(lineage),
+            }
+        )
+
+        logger.info(
+            f"🌳 Ajout de {n_new_trees} arbres au modèle parent "
+            f"({n_parent_trees} arbres, run {parent_run_id})"
+        )
+        model.set_params(n_jobs=config.train.n_jobs)
+        # Référence pour la comparaison : même modèle, ajusté de zéro
+        full_model = clone(model).set_params(n_estimators=n_estimators)
+
+        fit_start = time.perf_counter()
+        with parallel_context(config.train):
+            grow_forest(model, X_train, y_train, n_new_trees)
+        fit_time = time.perf_counter() - fit_start
+        tracker.log_metric("fit_time_s", fit_time)
+        logger.info(f"   Croissance terminée en {fit_time:.2f}s")
+
+        if compare_full_retrain:
+            full_start = time.perf_counter()
+            with parallel_context(config.train):
+                full_model.fit(X_train, y_train)
+            full_time = time.perf_counter() - full_start
+            tracker.log_metrics(
+                {
+                    "full_retrain_time_s": full_time,
+                    "speedup_vs_full_retrain": full_time / max(fit_time, 1e-9),
+                }
+            )
+            logger.info(
+                f"   Réentraînement complet : {full_time:.2f}s "
+                f"(x{full_time / max(fit_time, 1e-9):.1f} plus lent)"
+            )
+
+        metrics, metadata = evaluate_model(
+            model, X_test, y_test, iris_metadata, tracker=tracker
+        )
+
+        metadata = save_production_model(
+            model,
+            metadata,
+            metrics,
+            input_example=X_test[0:1],
+            experiment_name=experiment_name,
+            run_name=run_name,
+            model_info={
+                "model_type": "RandomForestClassifier",
+                "n_estimators": n_estimators,
+                "max_depth": model.max_depth,
+                "random_state": model.random_state,
+                "n_features": X_train.shape[1],
+                "n_samples": len(X_train) + len(X_test),
+                "training_mode": "incremental",
+                "parent_run_id": parent_run_id,
+                "lineage": lineage,
+            },
+            models_dir=Path(model_dir),
+        )
+
+    logger.info("✅ Entraînement incrémental terminé avec succès !")
+    return model, metadata
+
+
+if __name__ == "__main__":
+    import argparse
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    parser = argparse.ArgumentParser(
+        description="Ajoute des arbres au modèle de production (warm_start)"
+    )
+    parser.add_argument("--n-new-trees", type=int, help="Arbres à ajouter")
+    parser.add_argument("--model-dir", type=Path, default=Path("models"))
+    parser.add_argument(
+        "--experiment-name", default="iris-classification", help="Nom experiment MLflow"
+    )
+    parser.add_argument("--run-name", help="Nom du run MLflow")
+    parser.add_argument(
+        "--no-compare",
+        action="store_true",
+        help="Ne pas mesurer le réentraînement complet de référence",
+    )
+    args = parser.parse_args()
+
+    if args.n_new_trees is not None and args.n_new_trees <= 0:
+        parser.error("--n-new-trees doit être > 0")
+
+    train_incremental(
+        n_new_trees=args.n_new_trees,
+        model_dir=args.model_dir,
+        experiment_name=args.experiment_name,
+        run_name=args.run_name,
+        compare_full_retrain=not args.no_compare,
+    )
@@ -0,0 +1,452 @@
+"""
+Balayage d'hyperparamètres avec frontière de Pareto coût / précision
+Remplace l'enchaînement séquentiel de scripts/run_trainings.sh :
+- recherche en grille ou aléatoire sur n_estimators / max_depth / test_size
+  (découpe stratifiée du dataset Iris propre à chaque test_size : le split
+  figé du manifeste DVC rendrait cet axe sans effet)
+- entraînement parallèle des configurations dans un pool de processus
+- mesure de la précision et de la taille du modèle sérialisé, puis, une fois
+  le pool vidé, de la latence unitaire (p50/p99) et du débit en batch, en série
+- logging MLflow groupé (un appel log_batch par configuration)
+"""
+
+import itertools
+import json
+import logging
+import os
+import pickle
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import mlflow
+import numpy as np
+from mlflow.entities import Metric, Param, RunTag
+from mlflow.tracking import MlflowClient
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import accuracy_score
+
+from src.config import get_config
+from src.data.schema import TARGET_COLUMN
+from src.training.train import _sklearn_split
+
+# Configuration du logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+# Objectifs de la frontière de Pareto : précision maximale, latence p99 minimale
+PARETO_MAXIMIZE = ("accuracy",)
+PARETO_MINIMIZE = ("latency_p99_ms",)
+
+
+def build_grid(
+    n_estimators: Sequence[int],
+    max_depth: Sequence[Optional[int]],
+    test_size: Sequence[float],
+) -> List[Dict]:
+    """
+    Construit la grille complète (produit cartésien) des configurations
+
+    Returns:
+        List[Dict]: Configurations {n_estimators, max_depth, test_size}
+    """
+    return [
+        {"n_estimators": n, "max_depth": d, "test_size": t}
+        for n, d, t in itertools.product(n_estimators, max_depth, test_size)
+    ]
+
+
+def sample_random(
+    n_estimators: Sequence[int],
+    max_depth: Sequence[Optional[int]],
+    test_size: Sequence[float],
+    n_iter: int,
+    seed: int = 42,
+) -> List[Dict]:
+    """
+    Tire n_iter configurations aléatoires (reproductibles via seed)
+    n_estimators est tiré uniformément entre le min et le max fournis,
+    max_depth et test_size parmi les valeurs fournies
+
+    Returns:
+        List[Dict]: Configurations distinctes {n_estimators, max_depth, test_size}
+    """
+    rng = random.Random(seed)
+    low, high = min(n_estimators), max(n_estimators)
+    seen = set()
+    configs = []
+    # Borne le nombre de tirages pour ne pas boucler si l'espace est petit
+    for _ in range(n_iter * 20):
+        if len(configs) >= n_iter:
+            break
+        config = (
+            rng.randint(low, high),
+            rng.choice(list(max_depth)),
+            rng.choice(list(test_size)),
+        )
+        if config in seen:
+            continue
+        seen.add(config)
+        configs.append(
+            {"n_estimators": config[0], "max_depth": config[1], "test_size": config[2]}
+        )
+    return configs
+
+
+def train_config(
+    params: Dict, random_state: int = 42
+) -> Tuple[Dict, RandomForestClassifier, np.ndarray]:
+    """
+    Entraîne une configuration et mesure précision, taille et temps
+    d'ajustement (exécuté dans un processus du pool)
+
+    Args:
+        params: Configuration {n_estimators, max_depth, test_size}
+        random_state: Graine aléatoire
+
+    Returns:
+        Tuple[Dict, RandomForestClassifier, np.ndarray]: Mesures, modèle ajusté
+            et features de test (pour la mesure de latence)
+    """
+    train_df, test_df, iris_metadata = _sklearn_split(params["test_size"], random_state)
+    feature_cols = iris_metadata["feature_names"]
+    X_train = train_df[feature_cols].values
+    y_train = train_df[TARGET_COLUMN].values
+    X_test = test_df[feature_cols].values
+    y_test = test_df[TARGET_COLUMN].values
+
+    # n_jobs=1 : le parallélisme est porté par le pool, pas par la forêt
+    model = RandomForestClassifier(
+        n_estimators=params["n_estimators"],
+        max_depth=params["max_depth"],
+        random_state=random_state,
+        n_jobs=1,
+    )
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_time = time.perf_counter() - start
+
+    accuracy = accuracy_score(y_test, model.predict(X_test))
+    result = {
+        **params,
+        "accuracy": float(accuracy),
+        "model_size_bytes": len(pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL)),
+        "fit_time_s": float(fit_time),
+    }
+    return result, model, X_test
+
+
+def measure_latency(
+    model: RandomForestClassifier,
+    X_test: np.ndarray,
+    latency_samples: int = 200,
+    batch_size: int = 1024,
+) -> Dict:
+    """
+    Latence unitaire (p50/p99) et débit en batch d'un modèle ajusté
+
+    À exécuter sans autre charge sur la machine (après l'entraînement du
+    pool) : les configurations sont classées sur ces mesures.
+
+    Returns:
+        Dict: {latency_p50_ms, latency_p99_ms, batch_throughput_rows_per_s}
+    """
+    # Latence unitaire : une ligne par appel, comme /predict
+    latencies = np.empty(latency_samples)
+    for i in range(latency_samples):
+        row = X_test[i % len(X_test) : i % len(X_test) + 1]
+        start = time.perf_counter()
+        model.predict_proba(row)
+        latencies[i] = time.perf_counter() - start
+    latencies_ms = latencies * 1000.0
+
+    # Débit en batch : lignes de test répétées jusqu'à batch_size
+    batch = np.resize(X_test, (batch_size, X_test.shape[1]))
+    start = time.perf_counter()
+    model.predict_proba(batch)
+    batch_time = time.perf_counter() - start
+
+    return {
+        "latency_p50_ms": float(np.percentile(latencies_ms, 50)),
+        "latency_p99_ms": float(np.percentile(latencies_ms, 99)),
+        "batch_throughput_rows_per_s": float(batch_size / batch_time),
+    }
+
+
+def evaluate_config(
+    params: Dict,
+    random_state: int = 42,
+    latency_samples: int = 200,
+    batch_size: int = 1024,
+) -> Dict:
+    """
+    Entraîne et mesure une configuration, dans le processus courant
+
+    Returns:
+        Dict: Paramètres et mesures (accuracy, latences, débit, taille)
+    """
+    result, model, X_test = train_config(params, random_state)
+    return {**result, **measure_latency(model, X_test, latency_samples, batch_size)}
+
+
+def pareto_front(
+    results: List[Dict],
+    maximize: Sequence[str] = PARETO_MAXIMIZE,
+    minimize: Sequence[str] = PARETO_MINIMIZE,
+) -> List[Dict]:
+    """
+    Extrait les configurations non dominées
+
+    Une configuration est dominée si une autre est au moins aussi bonne sur tous
+    les objectifs et strictement meilleure sur au moins un.
+
+    Returns:
+        List[Dict]: Frontière de Pareto triée par latence croissante
+    """
+    if not results:
+        return []
+
+    # Tous les objectifs ramenés à une minimisation
+    costs = np.array(
+        [[-r[k] for k in maximize] + [r[k] for k in minimize] for r in results]
+    )
+    front = []
+    for i, cost in enumerate(costs):
+        dominated = np.any(np.all(costs <= cost, axis=1) & np.any(costs < cost, axis=1))
+        if not dominated:
+            front.append(results[i])
+
+    sort_key = minimize[0] if minimize else maximize[0]
+    return sorted(front, key=lambda r: r[sort_key])
+
+
+def select_for_budget(front: List[Dict], latency_budget_ms: float) -> Optional[Dict]:
+    """
+    Sélectionne la configuration la plus précise dont la latence p99 tient le budget
+
+    Returns:
+        Optional[Dict]: Configuration retenue (None si aucune ne tient le budget)
+    """
+    eligible = [r for r in front if r["latency_p99_ms"] <= latency_budget_ms]
+    if not eligible:
+        return None
+    return max(eligible, key=lambda r: (r["accuracy"], -r["latency_p99_ms"]))
+
+
+def log_sweep_to_mlflow(
+    results: List[Dict], front: List[Dict], experiment_name: str, sweep_name: str
+) -> str:
+    """
+    Log le balayage dans MLflow : un run parent et un run enfant par configuration
+    Chaque run enfant est écrit en un seul appel log_batch (params + métriques + tags)
+
+    Returns:
+        str: ID du run parent
+    """
+    client = MlflowClient()
+    experiment = mlflow.set_experiment(experiment_name)
+    experiment_id = experiment.experiment_id
+
+    parent = client.create_run(
+        experiment_id,
+        tags={"mlflow.runName": sweep_name, "experiment_type": "pareto_sweep"},
+    )
+    parent_id = parent.info.run_id
+    front_ids = {id(r) for r in front}
+    timestamp = int(time.time() * 1000)
+
+    for result in results:
+        run_name = (
+            f"n_est-{result['n_estimators']}_maxd-{result['max_depth'] or 'None'}"
+            f"_ts-{result['test_size']}"
+        )
+        child = client.create_run(
+            experiment_id,
+            tags={"mlflow.runName": run_name, "mlflow.parentRunId": parent_id},
+        )
+        params = [
+            Param("n_estimators", str(result["n_estimators"])),
+            Param("max_depth", str(result["max_depth"] or "None")),
+            Param("data.test_size", str(result["test_size"])),
+        ]
+        metrics = [
+            Metric(key, float(result[key]), timestamp, 0)
+            for key in (
+                "accuracy",
+                "latency_p50_ms",
+                "latency_p99_ms",
+                "batch_throughput_rows_per_s",
+                "model_size_bytes",
+                "fit_time_s",
+            )
+        ]
+        tags = [
+            RunTag("model_type", "RandomForestClassifier"),
+            RunTag("pareto_optimal", str(id(result) in front_ids).lower()),
+        ]
+        client.log_batch(child.info.run_id, metrics=metrics, params=params, tags=tags)
+        client.set_terminated(child.info.run_id)
+
+    client.log_batch(
+        parent_id,
+        params=[Param("n_configs", str(len(results)))],
+        metrics=[Metric("pareto_front_size", float(len(front)), timestamp, 0)],
+    )
+    client.log_dict(
+        parent_id, {"results": results, "pareto_front": front}, "sweep.json"
+    )
+    client.set_terminated(parent_id)
+    return parent_id
+
+
+def run_sweep(
+    configs: List[Dict],
+    max_workers: Optional[int] = None,
+    random_state: Optional[int] = None,
+    latency_samples: int = 200,
+    batch_size: int = 1024,
+    experiment_name: str = "iris-sweep",
+    output_path: Optional[str] = "models/sweep.json",
+    latency_budget_ms: Optional[float] = None,
+) -> Dict:
+    """
+    Entraîne les configurations en parallèle, mesure leur latence en série,
+    puis calcule et log la frontière de Pareto
+
+    Args:
+        configs: Configurations à évaluer (voir build_grid / sample_random)
+        max_workers: Nombre de processus (défaut: nombre de CPU)
+        random_state: Graine aléatoire (surcharge params.yaml si fourni)
+        latency_samples: Nombre d'appels unitaires pour les percentiles de latence
+        batch_size: Taille du batch pour la mesure de débit
+        experiment_name: Nom de l'experiment MLflow
+        output_path: Fichier JSON des résultats (None = pas d'écriture)
+        latency_budget_ms: Budget de latence p99 pour recommander une configuration
+
+    Returns:
+        Dict: {"results", "pareto_front", "selected", "mlflow_parent_run_id"}
+    """
+    config = get_config()
+    random_state = (
+        random_state if random_state is not None else config.train.random_state
+    )
+    max_workers = max_workers or os.cpu_count() or 1
+
+    mlflow_tracking_uri = os.getenv("MLFLOW_TRACKING_URI")
+    if mlflow_tracking_uri:
+        mlflow.set_tracking_uri(mlflow_tracking_uri)
+
+    logger.info(
+        f"🔎 Balayage de {len(configs)} configurations sur {max_workers} processus..."
+    )
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(train_config, params, random_state) for params in configs
+        ]
+        trained = [future.result() for future in futures]
+    logger.info(f"   Entraînement terminé en {time.perf_counter() - start:.1f}s")
+
+    # Latences mesurées une fois le pool vidé, en série dans ce processus :
+    # pas de concurrence avec les entraînements pour fausser le classement
+    results = [
+        {**result, **measure_latency(model, X_test, latency_samples, batch_size)}
+        for result, model, X_test in trained
+    ]
+    del trained
+
+    front = pareto_front(results)
+    selected = (
+        select_for_budget(front, latency_budget_ms)
+        if latency_budget_ms is not None
+        else None
+    )
+
+    logger.info("📈 Frontière de Pareto (précision vs latence p99) :")
+    for r in front:
+        logger.info(
+            f"   n_est={r['n_estimators']:<4} max_depth={str(r['max_depth']):<5} "
+            f"test_size={r['test_size']:<5} accuracy={r['accuracy']:.3f} "
+            f"p99={r['latency_p99_ms']:.2f}ms size={r['model_size_bytes'] / 1024:.0f}KiB"
+        )
+    if latency_budget_ms is not None:
+        logger.info(f"🎯 Budget p99 {latency_budget_ms}ms → {selected}")
+
+    sweep_name = f"sweep_{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+    parent_run_id = log_sweep_to_mlflow(results, front, experiment_name, sweep_name)
+
+    summary = {
+        "results": results,
+        "pareto_front": front,
+        "selected": selected,
+        "mlflow_parent_run_id": parent_run_id,
+    }
+    if output_path:
+        path = Path(output_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+        logger.info(f"💾 Résultats du balayage sauvegardés dans : {path}")
+
+    return summary
+
+
+def _parse_max_depth(value: str) -> Optional[int]:
+    """Convertit 'None' en None pour l'argument --max-depth"""
+    return None if value.lower() == "none" else int(value)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Balayage d'hyperparamètres avec frontière de Pareto"
+    )
+    parser.add_argument("--mode", choices=["grid", "random"], default="grid")
+    parser.add_argument(
+        "--n-estimators", type=int, nargs="+", default=[10, 50, 100, 200]
+    )
+    parser.add_argument(
+        "--max-depth", type=_parse_max_depth, nargs="+", default=[3, 5, 10, None]
+    )
+    parser.add_argument("--test-size", type=float, nargs="+", default=[0.2])
+    parser.add_argument(
+        "--n-iter", type=int, default=10, help="Nombre de tirages (mode random)"
+    )
+    parser.add_argument("--seed", type=int, default=42, help="Graine (mode random)")
+    parser.add_argument("--workers", type=int, help="Nombre de processus")
+    parser.add_argument("--latency-samples", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=1024)
+    parser.add_argument("--latency-budget-ms", type=float)
+    parser.add_argument("--experiment-name", default="iris-sweep")
+    parser.add_argument("--output", default="models/sweep.json")
+
+    args = parser.parse_args()
+
+    if any(not 0 < t < 1 for t in args.test_size):
+        parser.error("--test-size doit être entre 0 et 1")
+    if any(n <= 0 for n in args.n_estimators):
+        parser.error("--n-estimators doit être > 0")
+    if any(d is not None and d <= 0 for d in args.max_depth):
+        parser.error("--max-depth doit être > 0")
+
+    if args.mode == "grid":
+        sweep_configs = build_grid(args.n_estimators, args.max_depth, args.test_size)
+    else:
+        sweep_configs = sample_random(
+            args.n_estimators, args.max_depth, args.test_size, args.n_iter, args.seed
+        )
+
+    run_sweep(
+        sweep_configs,
+        max_workers=args.workers,
+        latency_samples=args.latency_samples,
+        batch_size=args.batch_size,
+        experiment_name=args.experiment_name,
+        output_path=args.output,
+        latency_budget_ms=args.latency_budget_ms,
+    )
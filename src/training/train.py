@@ -8,19 +8,38 @@ Lit les paramètres depuis params.yaml avec validation Pydantic
 import json
 import logging
 import os
+import time
+from contextlib import ExitStack, contextmanager
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Iterator, Optional, Tuple
 
+import joblib
 import mlflow
 import mlflow.sklearn
+import numpy as np
 import pandas as pd
 from sklearn.datasets import load_iris
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.model_selection import train_test_split
-
-from src.config import get_config
+from threadpoolctl import threadpool_limits
+
+from src.config import TrainConfig, get_config
+from src.data.manifest import dataset_metadata, load_manifest
+from src.data.profile import (
+    PROFILE_FILENAME,
+    build_reference_profile,
+    load_reference_profile,
+    write_reference_profile,
+)
+from src.data.schema import FEATURE_COLUMNS, TARGET_COLUMN, TRAIN_FILENAME
 from src.evaluation.evaluate import evaluate_model
+from src.profiling import TIMINGS_FILENAME, PipelineProfiler
+from src.tracking import BatchedMlflowLogger
+from src.training.cv import cross_validate
+from src.training.distributed import train_sharded
+from src.training.early_stopping import fit_with_oob_early_stopping
 
 # Configuration du logging
 logging.basicConfig(
@@ -29,40 +48,189 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=8)
+def _read_split(path: str, sha256: str, mtime_ns: int, size: int) -> pd.DataFrame:
+    """
+    Lecture Parquet mémoïsée par empreinte de contenu (+ mtime/taille pour
+    détecter un fichier réécrit sans mise à jour du manifeste).
+    Le DataFrame retourné est partagé : ne pas le modifier en place.
+    """
+    return pd.read_parquet(path, columns=FEATURE_COLUMNS + [TARGET_COLUMN])
+
+
+def _load_split(processed_dir: Path, entry: dict) -> pd.DataFrame:
+    """Charge un split décrit par le manifeste (via le cache)"""
+    path = processed_dir / entry["path"]
+    stat = path.stat()
+    return _read_split(str(path), entry["sha256"], stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=8)
+def _sklearn_split(
+    test_size: float, random_state: int
+) -> Tuple[pd.DataFrame, pd.DataFrame, dict]:
+    """Split stratifié du dataset scikit-learn (repli sans pipeline DVC), mémoïsé"""
+    iris = load_iris()
+    df = pd.DataFrame(iris.data, columns=iris.feature_names)
+    df["target"] = iris.target
+    train_df, test_df = train_test_split(
+        df, test_size=test_size, random_state=random_state, stratify=df["target"]
+    )
+    iris_metadata = {
+        "feature_names": list(iris.feature_names),
+        "target_names": list(iris.target_names),
+    }
+    return train_df, test_df, iris_metadata
+
+
 def load_data(
     test_size: float, random_state: int
 ) -> Tuple[pd.DataFrame, pd.DataFrame, dict]:
     """
-    Charge les données depuis CSV (DVC pipeline) ou scikit-learn
+    Charge les données depuis Parquet (DVC pipeline) ou scikit-learn
+    Les métadonnées viennent du manifeste écrit par prepare ; les lectures sont
+    mémoïsées par empreinte de contenu (sweeps et tests relisent sans reparser)
 
     Returns:
         Tuple[train_df, test_df, iris_metadata]
     """
-    train_path = Path("data/processed/train.csv")
-    test_path = Path("data/processed/test.csv")
+    processed_dir = Path("data/processed")
+    manifest = load_manifest(processed_dir)
+
+    if manifest is not None:
+        logger.info("   📂 Chargement depuis les fichiers Parquet (manifeste DVC)...")
+        train_df = _load_split(processed_dir, manifest["files"]["train"])
+        test_df = _load_split(processed_dir, manifest["files"]["test"])
+        return train_df, test_df, dataset_metadata(manifest)
+
+    if (processed_dir / TRAIN_FILENAME).exists():
+        logger.warning(
+            "   ⚠️  Fichiers Parquet sans manifeste : relancer l'étape prepare"
+        )
+    logger.info("   📦 Chargement depuis scikit-learn...")
+    return _sklearn_split(test_size, random_state)
+
+
+def reference_profile_for(train_df: pd.DataFrame, target_names: list) -> dict:
+    """
+    Profil de référence écrit par prepare (data/processed/), recalculé sur le
+    split train s'il est absent (repli scikit-learn, ancien pipeline)
+    """
+    path = Path("data/processed") / PROFILE_FILENAME
+    if path.exists():
+        return load_reference_profile(path)
+    logger.info("   📐 Profil de référence absent : calcul sur le split train")
+    return build_reference_profile(train_df, target_names)
 
-    # Charger les métadonnées Iris une seule fois (utilisées dans les deux cas)
-    iris = load_iris()
-    iris_metadata = {
-        "feature_names": list(iris.feature_names),
-        "target_names": list(iris.target_names),
-    }
 
-    if train_path.exists() and test_path.exists():
-        logger.info("   📂 Chargement depuis les fichiers CSV (DVC pipeline)...")
-        train_df = pd.read_csv(train_path)
-        test_df = pd.read_csv(test_path)
-        return train_df, test_df, iris_metadata
+@contextmanager
+def parallel_context(train_config: TrainConfig) -> Iterator[None]:
+    """
+    Applique la configuration de parallélisme le temps de l'entraînement :
+    backend joblib et limites de threads BLAS/OpenMP (évite la sursouscription
+    quand chaque coeur ajuste déjà un arbre)
+    """
+    with ExitStack() as stack:
+        stack.enter_context(joblib.parallel_backend(train_config.joblib_backend))
+        if train_config.blas_threads is not None:
+            stack.enter_context(
+                threadpool_limits(limits=train_config.blas_threads, user_api="blas")
+            )
+        if train_config.openmp_threads is not None:
+            stack.enter_context(
+                threadpool_limits(limits=train_config.openmp_threads, user_api="openmp")
+            )
+        yield
+
+
+def configure_mlflow(experiment_name: str) -> None:
+    """Configure le tracking MLflow (toujours activé) et l'expérience"""
+    # Support GCS backend en production via variable d'environnement
+    mlflow_tracking_uri = os.getenv("MLFLOW_TRACKING_URI")
+    if mlflow_tracking_uri:
+        mlflow.set_tracking_uri(mlflow_tracking_uri)
+        logger.info(f"📊 MLflow Tracking URI: {mlflow_tracking_uri}")
     else:
-        logger.info("   📦 Chargement depuis scikit-learn...")
-        df = pd.DataFrame(iris.data, columns=iris.feature_names)
-        df["target"] = iris.target
+        logger.info("📊 MLflow Tracking URI: local (mlruns/)")
+
+    # Configurer l'expérience (doit être fait même sans tracking URI personnalisé)
+    mlflow.set_experiment(experiment_name)
+
+
+def save_production_model(
+    model: RandomForestClassifier,
+    metadata: dict,
+    metrics: dict,
+    input_example,
+    experiment_name: str,
+    run_name: str,
+    model_info: dict,
+    models_dir: Path = Path("models"),
+    profiler: Optional[PipelineProfiler] = None,
+    reference_profile: Optional[dict] = None,
+) -> dict:
+    """
+    Enregistre le modèle dans MLflow (run actif) et écrit models/metadata.json
+    et models/metrics.json qui pointent vers ce run, ainsi que le profil de
+    référence du monitoring (models/reference_profile.json) si fourni
+
+    Returns:
+        dict: Métadonnées enrichies (modèle + informations MLflow)
+    """
+    # Créer le dossier models pour sauvegarder metadata.json et metrics.json
+    models_dir.mkdir(exist_ok=True)
+
+    profiler = profiler or PipelineProfiler("save_model")
+
+    # Le serving prédit ligne par ligne : le parallélisme d'entraînement
+    # (n_jobs=-1) ajouterait un aller-retour joblib par requête
+    model.set_params(n_jobs=None)
 
-        train_df, test_df = train_test_split(
-            df, test_size=test_size, random_state=random_state, stratify=df["target"]
+    # Sauvegarde dans MLflow (source de vérité)
+    with profiler.stage("log_model"):
+        mlflow.sklearn.log_model(
+            model,
+            "model",
+            registered_model_name="IrisClassifier",
+            input_example=input_example,
         )
+    # Capturer l'URI du run MLflow pour référence
+    mlflow_run_uri = mlflow.get_artifact_uri("model")
+    logger.info(f"📊 Modèle enregistré dans MLflow: {mlflow_run_uri}")
+
+    # Récupérer les informations du run MLflow actif
+    active_run = mlflow.active_run()
+    mlflow_run_id = active_run.info.run_id if active_run else None
+    mlflow_experiment_id = active_run.info.experiment_id if active_run else None
+    mlflow_relative_path = (
+        f"mlruns/{mlflow_experiment_id}/{mlflow_run_id}" if active_run else None
+    )
+
+    # Enrichir et sauvegarder les métadonnées (toutes les infos en une seule fois)
+    metadata.update(
+        {
+            **model_info,
+            # Informations MLflow
+            "mlflow_run_uri": mlflow_run_uri,
+            "mlflow_experiment_name": experiment_name,
+            "mlflow_run_name": run_name,
+            "mlflow_run_id": mlflow_run_id,
+            "mlflow_relative_path": mlflow_relative_path,
+        }
+    )
 
-        return train_df, test_df, iris_metadata
+    # Sauvegarder metadata.json et metrics.json dans models/
+    with profiler.stage("write_metadata"):
+        for filename, data in [("metadata.json", metadata), ("metrics.json", metrics)]:
+            path = models_dir / filename
+            path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+
+        mlflow.log_dict(metadata, "metadata.json")
+        if reference_profile is not None:
+            write_reference_profile(reference_profile, models_dir)
+            mlflow.log_dict(reference_profile, PROFILE_FILENAME)
+    logger.info("🔗 MLflow UI: mlflow ui")
+    return metadata
 
 
 def train_model(
@@ -73,6 +241,9 @@ def train_model(
     experiment_name: str = "iris-classification",
     run_name: Optional[str] = None,
     tags: Optional[dict] = None,
+    n_jobs: Optional[int] = None,
+    distributed_workers: Optional[int] = None,
+    early_stopping: Optional[bool] = None,
 ) -> Tuple[RandomForestClassifier, dict]:
     """
     Entraîne un modèle RandomForest sur le dataset Iris avec tracking MLflow
@@ -86,6 +257,10 @@ def train_model(
         experiment_name: Nom de l'experiment MLflow (par défaut: "iris-classification")
         run_name: Nom du run MLflow (auto-généré si None)
         tags: Tags MLflow (ex: {"experiment_type": "baseline", "status": "testing"})
+        n_jobs: Nombre de coeurs pour l'ajustement (surcharge params.yaml si fourni)
+        distributed_workers: Sous-forêts ajustées en parallèle (surcharge params.yaml si fourni)
+        early_stopping: Arrêt anticipé OOB, n_estimators devient le budget maximal
+            (surcharge params.yaml si fourni)
 
     Returns:
         Tuple[RandomForestClassifier, dict]: Modèle entraîné et métadonnées
@@ -95,18 +270,19 @@ def train_model(
     max_depth = max_depth or config.train.max_depth
     random_state = random_state or config.train.random_state
     test_size = test_size or config.data.test_size
+    n_jobs = n_jobs or config.train.n_jobs
+    distributed_workers = distributed_workers or config.train.distributed_workers
+    worker_addresses = config.train.worker_addresses
+    sharded = distributed_workers > 1 or bool(worker_addresses)
+    early_stopping = (
+        early_stopping if early_stopping is not None else config.train.early_stopping
+    )
+    if early_stopping and sharded:
+        raise ValueError(
+            "early_stopping et l'entraînement distribué sont incompatibles"
+        )
 
-    # Configuration MLflow (toujours activé)
-    # Support GCS backend en production via variable d'environnement
-    mlflow_tracking_uri = os.getenv("MLFLOW_TRACKING_URI")
-    if mlflow_tracking_uri:
-        mlflow.set_tracking_uri(mlflow_tracking_uri)
-        logger.info(f"📊 MLflow Tracking URI: {mlflow_tracking_uri}")
-    else:
-        logger.info("📊 MLflow Tracking URI: local (mlruns/)")
-
-    # Configurer l'expérience (doit être fait même sans tracking URI personnalisé)
-    mlflow.set_experiment(experiment_name)
+    configure_mlflow(experiment_name)
 
     # Générer le nom du run si non fourni
     if run_name is None:
@@ -114,21 +290,30 @@ def train_model(
         run_name = f"n_est-{n_estimators}_maxd-{max_depth or 'None'}_{timestamp}"
 
     # Utiliser context manager pour garantir le nettoyage même en cas d'erreur
-    with mlflow.start_run(run_name=run_name):
+    # Params, tags et métriques sont accumulés puis envoyés par lot (log_batch),
+    # le tracker est vidé avant la fermeture du run
+    profiler = PipelineProfiler(
+        "train",
+        profiler=config.profiling.profiler,
+        sampling_interval_ms=config.profiling.sampling_interval_ms,
+    )
+    with profiler, mlflow.start_run(run_name=run_name), BatchedMlflowLogger(
+        background=config.tracking.background_flush,
+        flush_interval_s=config.tracking.flush_interval_s,
+    ) as tracker:
         logger.info("🌱 Chargement du dataset Iris...")
-        train_df, test_df, iris_metadata = load_data(test_size, random_state)
-
-        # Séparer features et target
-        feature_cols = [
-            "sepal length (cm)",
-            "sepal width (cm)",
-            "petal length (cm)",
-            "petal width (cm)",
-        ]
+        with profiler.stage("load_data"):
+            train_df, test_df, iris_metadata = load_data(test_size, random_state)
+            reference_profile = reference_profile_for(
+                train_df, iris_metadata["target_names"]
+            )
+
+        # Séparer features et target (colonnes décrites par le manifeste)
+        feature_cols = iris_metadata["feature_names"]
         X_train = train_df[feature_cols].values
-        y_train = train_df["target"].values
+        y_train = train_df[TARGET_COLUMN].values
         X_test = test_df[feature_cols].values
-        y_test = test_df["target"].values
+        y_test = test_df[TARGET_COLUMN].values
 
         # Hyperparamètres et dimensions
         hyperparams = {
@@ -140,8 +325,8 @@ def train_model(
         n_samples = len(X_train) + len(X_test)
 
         # Logging MLflow
-        mlflow.log_params(hyperparams)
-        mlflow.log_params(
+        tracker.log_params(hyperparams)
+        tracker.log_params(
             {
                 "algorithm": "RandomForestClassifier",
                 "dataset": "Iris",
@@ -149,77 +334,134 @@ def train_model(
                 "n_samples": n_samples,
                 "n_classes": len(iris_metadata["target_names"]),
                 "data.test_size": test_size,
+                "n_jobs": n_jobs,
+                "effective_n_jobs": joblib.effective_n_jobs(n_jobs),
+                "n_cpus": os.cpu_count(),
+                "joblib_backend": config.train.joblib_backend,
+                "blas_threads": config.train.blas_threads or "None",
+                "openmp_threads": config.train.openmp_threads or "None",
+                "distributed_workers": distributed_workers,
+                "worker_nodes": len(worker_addresses),
+                "shard_data": config.train.shard_data,
+                "early_stopping": early_stopping,
             }
         )
         if tags:
-            for key, value in tags.items():
-                mlflow.set_tag(key, str(value))
-        mlflow.set_tags(
+            tracker.set_tags(tags)
+        tracker.set_tags(
             {
                 "model_type": "RandomForestClassifier",
                 "experiment_name": experiment_name,
             }
         )
 
-        logger.info(f"🤖 Entraînement RandomForest: {hyperparams}")
-        model = RandomForestClassifier(
-            n_estimators=n_estimators,
-            max_depth=max_depth,
-            random_state=random_state,
+        logger.info(
+            f"🤖 Entraînement RandomForest: {hyperparams} "
+            f"(n_jobs={n_jobs}, backend={config.train.joblib_backend})"
         )
-        model.fit(X_train, y_train)
+        with profiler.stage("fit"):
+            fit_start = time.perf_counter()
+            if sharded:
+                # Sous-forêts ajustées par des workers puis fusionnées
+                model = train_sharded(
+                    X_train,
+                    y_train,
+                    n_estimators=n_estimators,
+                    max_depth=max_depth,
+                    random_state=random_state,
+                    n_workers=max(distributed_workers, len(worker_addresses)),
+                    worker_addresses=worker_addresses or None,
+                    shard_data=config.train.shard_data,
+                )
+                model.set_params(n_jobs=n_jobs)
+            else:
+                # random_state fixe : les graines des arbres sont tirées avant la
+                # répartition sur les coeurs, le modèle est identique quel que soit n_jobs
+                model = RandomForestClassifier(
+                    n_estimators=n_estimators,
+                    max_depth=max_depth,
+                    random_state=random_state,
+                    n_jobs=n_jobs,
+                )
+                with parallel_context(config.train):
+                    if early_stopping:
+                        curve = fit_with_oob_early_stopping(
+                            model,
+                            X_train,
+                            y_train,
+                            step=config.train.oob_step,
+                            tol=config.train.oob_tol,
+                            patience=config.train.oob_patience,
+                            metric=config.train.oob_metric,
+                            tracker=tracker,
+                        )
+                        # n_estimators = plus petite forêt ayant atteint le plateau
+                        n_estimators = curve.best_n_estimators
+                        tracker.log_params(
+                            {
+                                "oob_step": config.train.oob_step,
+                                "oob_tol": config.train.oob_tol,
+                                "oob_patience": config.train.oob_patience,
+                                "oob_metric": config.train.oob_metric,
+                                "n_estimators_selected": n_estimators,
+                            }
+                        )
+                        tracker.set_tag("oob_stopped_early", curve.stopped_early)
+                    else:
+                        model.fit(X_train, y_train)
+            fit_time = time.perf_counter() - fit_start
+        tracker.log_metric("fit_time_s", fit_time)
+        logger.info(f"   Ajustement terminé en {fit_time:.2f}s")
 
         # Évaluation
-        metrics, metadata = evaluate_model(model, X_test, y_test, iris_metadata)
-
-        # Créer le dossier models pour sauvegarder metadata.json et metrics.json
-        models_dir = Path("models")
-        models_dir.mkdir(exist_ok=True)
-
-        # Sauvegarde dans MLflow (source de vérité)
-        mlflow.sklearn.log_model(
+        with profiler.stage("evaluate"):
+            metrics, metadata = evaluate_model(
+                model, X_test, y_test, iris_metadata, tracker=tracker
+            )
+
+        if config.cv.in_train:
+            # Estimation moins bruitée que le split unique : CV sur toutes les lignes
+            with profiler.stage("cross_validation"):
+                cv_metrics = cross_validate(
+                    np.concatenate([X_train, X_test]),
+                    np.concatenate([y_train, y_test]),
+                    {
+                        "n_estimators": n_estimators,
+                        "max_depth": max_depth,
+                        "random_state": random_state,
+                    },
+                    n_splits=config.cv.n_splits,
+                    seed=config.cv.seed,
+                    n_workers=config.cv.n_workers,
+                    cache_dir=Path(config.cv.cache_dir),
+                )
+            tracker.log_metrics(cv_metrics)
+            metrics.update(cv_metrics)
+
+        metadata = save_production_model(
             model,
-            "model",
-            registered_model_name="IrisClassifier",
+            metadata,
+            metrics,
             input_example=X_test[0:1],
-        )
-        # Capturer l'URI du run MLflow pour référence
-        mlflow_run_uri = mlflow.get_artifact_uri("model")
-        logger.info(f"📊 Modèle enregistré dans MLflow: {mlflow_run_uri}")
-
-        # Récupérer les informations du run MLflow actif
-        active_run = mlflow.active_run()
-        mlflow_run_id = active_run.info.run_id if active_run else None
-        mlflow_experiment_id = active_run.info.experiment_id if active_run else None
-        mlflow_relative_path = (
-            f"mlruns/{mlflow_experiment_id}/{mlflow_run_id}" if active_run else None
-        )
-
-        # Enrichir et sauvegarder les métadonnées (toutes les infos en une seule fois)
-        metadata.update(
-            {
+            experiment_name=experiment_name,
+            run_name=run_name,
+            model_info={
                 "model_type": "RandomForestClassifier",
                 "n_estimators": n_estimators,
                 "max_depth": max_depth,
                 "random_state": random_state,
                 "n_features": n_features,
                 "n_samples": n_samples,
-                # Informations MLflow
-                "mlflow_run_uri": mlflow_run_uri,
-                "mlflow_experiment_name": experiment_name,
-                "mlflow_run_name": run_name,
-                "mlflow_run_id": mlflow_run_id,
-                "mlflow_relative_path": mlflow_relative_path,
-            }
+            },
+            profiler=profiler,
+            reference_profile=reference_profile,
         )
 
-        # Sauvegarder metadata.json et metrics.json dans models/
-        for filename, data in [("metadata.json", metadata), ("metrics.json", metrics)]:
-            path = models_dir / filename
-            path.write_text(json.dumps(data, indent=2), encoding="utf-8")
-
-        mlflow.log_dict(metadata, "metadata.json")
-        logger.info("🔗 MLflow UI: mlflow ui")
+        # Temps par étape : métriques MLflow, profil détaillé et timings.json (DVC)
+        profiler.stop()
+        profiler.log_to_mlflow(tracker, profile_dir=Path("models/profile"))
+        timings_path = profiler.write_timings(Path("models") / TIMINGS_FILENAME)
+        mlflow.log_artifact(str(timings_path))
 
         logger.info("✅ Entraînement terminé avec succès !")
         return model, metadata
@@ -237,6 +479,7 @@ if __name__ == "__main__":
     parser.add_argument("--max-depth", type=int, help="Profondeur maximale")
     parser.add_argument("--test-size", type=float, help="Proportion test (0-1)")
     parser.add_argument("--random-state", type=int, help="Graine aléatoire")
+    parser.add_argument("--n-jobs", type=int, help="Nombre de coeurs (-1 = tous)")
     parser.add_argument(
         "--tag", action="append", nargs=2, metavar=("KEY", "VALUE"), help="Tags MLflow"
     )
@@ -250,6 +493,8 @@ if __name__ == "__main__":
         parser.error("--n-estimators doit être > 0")
     if args.max_depth is not None and args.max_depth <= 0:
         parser.error("--max-depth doit être > 0")
+    if args.n_jobs is not None and (args.n_jobs == 0 or args.n_jobs < -1):
+        parser.error("--n-jobs doit être -1 (tous les coeurs) ou >= 1")
 
     tags = dict(args.tag) if args.tag else {}
     train_model(
@@ -260,4 +505,5 @@ if __name__ == "__main__":
         experiment_name=args.experiment_name,
         run_name=args.run_name,
         tags=tags,
+        n_jobs=args.n_jobs,
     )
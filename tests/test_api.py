@@ -371,3 +371,122 @@ class TestAPIMetrics:
         content = response.text
         # Vérifier que model_loaded est présent
         assert "model_loaded" in content
+
+
+class TestAPILifespan:
+    """Tests du chargement des métadonnées au démarrage"""
+
+    def test_metadata_filled_from_manifest(self, tmp_path):
+        """Test du repli sur le manifeste du dataset pour les noms de classes"""
+        from src.serving.lifespan import _fill_from_manifest
+
+        manifest = {
+            "feature_names": ["a", "b", "c", "d"],
+            "target_names": ["setosa", "versicolor", "virginica"],
+        }
+        (tmp_path / "manifest.json").write_text(json.dumps(manifest))
+
+        metadata = _fill_from_manifest({"mlflow_run_id": "abc"}, tmp_path)
+        assert metadata["target_names"] == manifest["target_names"]
+        assert metadata["feature_names"] == manifest["feature_names"]
+
+        # Les valeurs de metadata.json restent prioritaires
+        kept = _fill_from_manifest({"target_names": ["x"]}, tmp_path)
+        assert kept["target_names"] == ["x"]
+
+
+class TestAPIAdminProfiling:
+    """Tests de l'endpoint de profilage à la demande (/admin/profile)"""
+
+    ADMIN_KEY = "admin-key-for-tests-0123456789abcdef"
+
+    @pytest.fixture
+    def admin_key(self, monkeypatch):
+        monkeypatch.setenv("ADMIN_API_KEY", self.ADMIN_KEY)
+        return self.ADMIN_KEY
+
+    def test_disabled_without_admin_key(self, api_client, monkeypatch):
+        """Test que l'endpoint est désactivé sans ADMIN_API_KEY"""
+        monkeypatch.delenv("ADMIN_API_KEY", raising=False)
+        response = api_client.post("/admin/profile", headers={"X-Admin-Key": "x"})
+        assert response.status_code == 403
+
+    def test_requires_valid_admin_key(self, api_client, admin_key):
+        """Test de l'authentification admin (clé API classique refusée)"""
+        assert api_client.post("/admin/profile").status_code == 401
+        response = api_client.post(
+            "/admin/profile", headers={"X-Admin-Key": "mauvaise-cle"}
+        )
+        assert response.status_code == 403
+
+    def test_duration_capped(self, api_client, admin_key, monkeypatch):
+        """Test du plafond de durée"""
+        monkeypatch.setenv("PROFILE_MAX_DURATION_S", "1")
+        response = api_client.post(
+            "/admin/profile?duration_s=5", headers={"X-Admin-Key": admin_key}
+        )
+        assert response.status_code == 422
+        response = api_client.post(
+            "/admin/profile?mode=perf", headers={"X-Admin-Key": admin_key}
+        )
+        assert response.status_code == 422
+
+    def test_sampling_capture(self, api_client, admin_key):
+        """Test d'une capture par échantillonnage (piles folded en pièce jointe)"""
+        response = api_client.post(
+            "/admin/profile?mode=sampling&duration_s=0.2&interval_ms=2",
+            headers={"X-Admin-Key": admin_key},
+        )
+        assert response.status_code == 200
+        assert "attachment" in response.headers["content-disposition"]
+        assert response.headers["content-disposition"].endswith('.folded"')
+        lines = response.text.strip().splitlines()
+        assert lines and all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+
+    def test_cprofile_capture(self, api_client, admin_key, tmp_path):
+        """Test d'une capture cProfile relisible par pstats"""
+        import pstats
+
+        response = api_client.post(
+            "/admin/profile?mode=cprofile&duration_s=0.1",
+            headers={"X-Admin-Key": admin_key},
+        )
+        assert response.status_code == 200
+        path = tmp_path / "profile.prof"
+        path.write_bytes(response.content)
+        assert pstats.Stats(str(path)).total_calls >= 0
+
+    def test_tracemalloc_capture(self, api_client, admin_key):
+        """Test de la différence d'instantanés tracemalloc"""
+        import tracemalloc
+
+        response = api_client.post(
+            "/admin/profile?mode=tracemalloc&duration_s=0.1",
+            headers={"X-Admin-Key": admin_key},
+        )
+        assert response.status_code == 200
+        assert response.text.startswith("Différence d'allocations")
+        # Traçage arrêté après la capture (aucun surcoût au repos)
+        assert not tracemalloc.is_tracing()
+
+    def test_concurrent_capture_rejected(self, admin_key):
+        """Test qu'une seule capture tourne à la fois (409 pour la seconde)"""
+        import asyncio
+
+        import httpx
+
+        async def _run():
+            async with httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=app), base_url="http://test"
+            ) as client:
+                headers = {"X-Admin-Key": admin_key}
+                first = asyncio.create_task(
+                    client.post("/admin/profile?duration_s=0.5", headers=headers)
+                )
+                await asyncio.sleep(0.1)
+                second = await client.post(
+                    "/admin/profile?duration_s=0.1", headers=headers
+                )
+                return (await first).status_code, second.status_code
+
+        assert asyncio.run(_run()) == (200, 409)
@@ -0,0 +1,126 @@
+"""
+Tests unitaires pour le journal d'audit des prédictions (serving/audit.py)
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.serving.app import app
+from src.serving.audit import AuditLogWriter, new_prediction_id, read_audit_log
+from src.serving.middleware import limiter
+
+
+def _row(index: int = 0) -> dict:
+    return {
+        "prediction_id": new_prediction_id(),
+        "timestamp": datetime.now(timezone.utc),
+        "model_run_id": "run-1",
+        "sepal_length": 5.1,
+        "sepal_width": 3.5,
+        "petal_length": 1.4,
+        "petal_width": 0.2 + index,
+        "prediction": "setosa",
+        "confidence": 0.9,
+        "class_names": ["setosa", "versicolor", "virginica"],
+        "probabilities": [0.9, 0.05, 0.05],
+        "latency_ms": 1.5,
+    }
+
+
+class TestAuditLogWriter:
+    """Tests de l'écriture par lots, de la rotation et de la contre-pression"""
+
+    def test_rotation_and_close(self, tmp_path):
+        """Test de la rotation par nombre de lignes et du vidage à l'arrêt"""
+        writer = AuditLogWriter(
+            tmp_path, batch_size=4, flush_interval_s=60, segment_max_rows=5
+        )
+        writer.start()
+        for index in range(12):
+            assert writer.record(_row(index))
+        writer.close()
+
+        segments = sorted(tmp_path.iterdir())
+        assert [path.suffix for path in segments] == [".parquet"] * 3
+        table = read_audit_log(tmp_path)
+        assert table.num_rows == 12
+        assert writer.written == 12 and writer.dropped == 0
+        assert table.column("prediction").to_pylist() == ["setosa"] * 12
+        assert table.column("petal_width").to_pylist()[-1] == pytest.approx(11.2)
+
+    def test_segment_in_progress_hidden(self, tmp_path):
+        """Test : le segment ouvert n'est pas relu tant qu'il n'est pas fermé"""
+        writer = AuditLogWriter(tmp_path, batch_size=1, segment_max_rows=100)
+        writer.start()
+        writer.record(_row())
+        # Lot écrit mais segment encore ouvert
+        for _ in range(100):
+            if writer.written:
+                break
+            writer._thread.join(0.01)
+        assert writer.written == 1
+        assert read_audit_log(tmp_path).num_rows == 0
+        writer.close()
+        assert read_audit_log(tmp_path).num_rows == 1
+
+    def test_backpressure_drops(self, tmp_path):
+        """Test : tampon plein, la ligne est abandonnée et comptée après attente"""
+        writer = AuditLogWriter(tmp_path, buffer_size=1, put_timeout_s=0.01)
+        assert writer.try_record(_row())
+        assert not writer.try_record(_row())
+        assert not writer.record(_row())
+        assert writer.dropped == 1
+
+    def test_from_env(self, monkeypatch, tmp_path):
+        """Test de la configuration par variables d'environnement"""
+        monkeypatch.setenv("AUDIT_LOG_DIR", "")
+        assert AuditLogWriter.from_env() is None
+        monkeypatch.setenv("AUDIT_LOG_DIR", str(tmp_path))
+        monkeypatch.setenv("AUDIT_SEGMENT_MAX_ROWS", "7")
+        writer = AuditLogWriter.from_env()
+        assert writer.directory == tmp_path
+        assert writer.segment_max_rows == 7
+
+    def test_start_failure_does_not_block_startup(self, monkeypatch, tmp_path):
+        """Test : dossier d'audit impossible à créer, l'API démarre sans audit"""
+        blocker = tmp_path / "not-a-directory"
+        blocker.write_text("")
+        monkeypatch.setenv("AUDIT_LOG_DIR", str(blocker / "audit"))
+        monkeypatch.setenv("MODEL_DIR", str(tmp_path / "models"))
+        monkeypatch.setenv("WARMUP_ITERATIONS", "0")
+        monkeypatch.setattr(limiter, "enabled", False)
+
+        with TestClient(app) as client:
+            assert app.state.audit is None
+            assert client.get("/health").status_code == 200
+
+
+class TestAuditPredictRoute:
+    """Tests de la journalisation depuis /predict"""
+
+    def test_predict_writes_audit_row(
+        self, api_client_with_model, api_key, valid_iris_data, tmp_path, monkeypatch
+    ):
+        """Test de la ligne d'audit et du header X-Prediction-ID"""
+        # Les autres tests ont pu épuiser le quota de /predict
+        monkeypatch.setattr(limiter, "enabled", False)
+        writer = AuditLogWriter(tmp_path)
+        writer.start()
+        app.state.audit = writer
+        try:
+            response = api_client_with_model.post(
+                "/predict", json=valid_iris_data, headers={"X-API-Key": api_key}
+            )
+        finally:
+            app.state.audit = None
+            writer.close()
+
+        assert response.status_code == 200
+        rows = read_audit_log(tmp_path).to_pylist()
+        assert len(rows) == 1
+        assert rows[0]["prediction_id"] == response.headers["X-Prediction-ID"]
+        assert rows[0]["prediction"] == response.json()["prediction"]
+        assert sum(rows[0]["probabilities"]) == pytest.approx(1.0, abs=1e-5)
+        assert rows[0]["latency_ms"] >= 0
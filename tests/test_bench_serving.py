@@ -0,0 +1,117 @@
+"""
+Tests unitaires pour le benchmark de charge du serving (benchmarks/serving)
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from benchmarks.serving import compare_to_baseline, load_replay, summarize
+from benchmarks.serving.__main__ import main, run_benchmark
+from benchmarks.serving.loadgen import LoadResult
+from src.serving.middleware import limiter
+
+
+def _summary(p50: float, p99: float, rps: float, error_rate: float = 0.0) -> dict:
+    return {
+        "requests": 100,
+        "error_rate": error_rate,
+        "throughput_rps": rps,
+        "latency_ms": {"p50": p50, "p99": p99},
+    }
+
+
+class TestReport:
+    """Tests pour la synthèse et le garde-fou de régression"""
+
+    def test_summarize(self):
+        """Test des percentiles, du débit et du comptage des erreurs"""
+        result = LoadResult(
+            latencies_s=[i / 1000 for i in range(1, 101)],
+            statuses=[200] * 97 + [503, 422, "ConnectError"],
+            elapsed_s=2.0,
+        )
+        summary = summarize(result)
+
+        assert summary["requests"] == 100
+        assert summary["errors"] == 3
+        assert summary["throughput_rps"] == 50
+        assert summary["latency_ms"]["p50"] == pytest.approx(50.5)
+        assert summary["latency_ms"]["max"] == pytest.approx(100)
+        assert summary["latency_ms"]["p999"] <= summary["latency_ms"]["max"]
+        assert summary["status_counts"]["ConnectError"] == 1
+
+    def test_compare_to_baseline(self):
+        """Test des régressions de latence, de débit et d'erreurs"""
+        baseline = {"asgi/predict": _summary(5, 10, 200)}
+
+        assert (
+            compare_to_baseline({"asgi/predict": _summary(5.5, 11, 190)}, baseline)
+            == []
+        )
+        regressions = compare_to_baseline(
+            {"asgi/predict": _summary(5, 13, 150, error_rate=0.05)}, baseline
+        )
+        assert len(regressions) == 3
+        assert any("p99" in r for r in regressions)
+        assert any("throughput_rps" in r for r in regressions)
+        assert any("error_rate" in r for r in regressions)
+        # Scénario absent de la référence : ignoré
+        assert (
+            compare_to_baseline({"uvicorn/predict": _summary(50, 99, 1)}, baseline)
+            == []
+        )
+
+    def test_load_replay(self, tmp_path):
+        """Test de la lecture des requêtes enregistrées"""
+        path = tmp_path / "requests.jsonl"
+        path.write_text(
+            '{"path": "/health"}\n\n'
+            '{"path": "/predict", "json": {"sepal_length": 5.1}}\n'
+        )
+        specs = load_replay(path)
+        assert [(s.method, s.path) for s in specs] == [
+            ("GET", "/health"),
+            ("POST", "/predict"),
+        ]
+
+        path.write_text('{"method": "GET"}\n')
+        with pytest.raises(ValueError):
+            load_replay(path)
+
+
+class TestLoadGenerator:
+    """Tests de bout en bout du générateur de charge (application en mémoire)"""
+
+    def test_run_benchmark_asgi(self):
+        """Test d'une charge courte : aucune erreur, limiter restauré"""
+        report = asyncio.run(
+            run_benchmark(
+                transports=("asgi",),
+                rate=50,
+                duration_s=0.2,
+                warmup_requests=0,
+            )
+        )
+
+        results = report["results"]
+        # Pas de prédicteur par lot dans l'API : scénario ignoré
+        assert set(results) == {"asgi/predict", "asgi/health"}
+        for summary in results.values():
+            assert summary["requests"] == 10
+            assert summary["errors"] == 0
+        assert limiter.enabled
+
+    def test_main_regression_exit_code(self, tmp_path):
+        """Test du code de sortie face à une référence inatteignable"""
+        output = tmp_path / "results.json"
+        baseline = tmp_path / "baseline.json"
+        args = ["--scenarios", "health", "--rate", "50", "--duration", "0.2"]
+        args += ["--warmup", "0", "--output", str(output), "--baseline", str(baseline)]
+
+        assert main(args + ["--save-baseline"]) == 0
+        reference = json.loads(baseline.read_text())
+        reference["results"]["asgi/health"]["latency_ms"]["p99"] = 1e-6
+        baseline.write_text(json.dumps(reference))
+        assert main(args) == 1
@@ -0,0 +1,135 @@
+"""
+Tests de parité du moteur de métriques (evaluation/metrics.py) avec scikit-learn
+"""
+
+import numpy as np
+import pytest
+from sklearn.metrics import (
+    accuracy_score,
+    classification_report,
+    confusion_matrix,
+    f1_score,
+    precision_score,
+    recall_score,
+)
+
+from src.evaluation.metrics import (
+    ConfusionMatrixAccumulator,
+    accumulate_confusion_matrix,
+    compute_classification_metrics,
+    encode_labels,
+    format_classification_report,
+)
+
+
+def _random_predictions(n_samples: int, n_classes: int, seed: int):
+    rng = np.random.default_rng(seed)
+    y_true = rng.integers(0, n_classes, n_samples)
+    # ~70% de bonnes prédictions pour avoir des métriques non triviales
+    y_pred = np.where(
+        rng.random(n_samples) < 0.7, y_true, rng.integers(0, n_classes, n_samples)
+    )
+    return y_true, y_pred
+
+
+class TestClassificationMetrics:
+    """Tests du moteur de métriques en une passe"""
+
+    @pytest.mark.parametrize("seed", [0, 1, 2])
+    def test_parity_with_sklearn(self, seed):
+        """Test de parité de toutes les métriques avec scikit-learn"""
+        y_true, y_pred = _random_predictions(1000, 3, seed)
+
+        acc = ConfusionMatrixAccumulator(3)
+        acc.update(y_true, y_pred)
+        result = compute_classification_metrics(acc.matrix)
+
+        np.testing.assert_array_equal(
+            result.confusion_matrix, confusion_matrix(y_true, y_pred)
+        )
+        assert result.accuracy == pytest.approx(accuracy_score(y_true, y_pred))
+        for average in ("weighted", "macro"):
+            assert getattr(result, f"precision_{average}") == pytest.approx(
+                precision_score(y_true, y_pred, average=average)
+            )
+            assert getattr(result, f"recall_{average}") == pytest.approx(
+                recall_score(y_true, y_pred, average=average)
+            )
+            assert getattr(result, f"f1_{average}") == pytest.approx(
+                f1_score(y_true, y_pred, average=average)
+            )
+        np.testing.assert_allclose(
+            result.precision_per_class, precision_score(y_true, y_pred, average=None)
+        )
+        np.testing.assert_allclose(
+            result.recall_per_class, recall_score(y_true, y_pred, average=None)
+        )
+        np.testing.assert_allclose(
+            result.f1_per_class, f1_score(y_true, y_pred, average=None)
+        )
+
+    def test_chunked_equals_full(self):
+        """Test que l'accumulation par morceaux donne la même matrice"""
+        y_true, y_pred = _random_predictions(10_007, 3, 42)
+        chunks = (
+            (y_true[i : i + 1000], y_pred[i : i + 1000])
+            for i in range(0, len(y_true), 1000)
+        )
+        acc = accumulate_confusion_matrix(chunks, 3)
+
+        np.testing.assert_array_equal(acc.matrix, confusion_matrix(y_true, y_pred))
+        assert acc.n_samples == len(y_true)
+
+    def test_merge(self):
+        """Test de la fusion de matrices calculées séparément"""
+        y_true, y_pred = _random_predictions(500, 3, 7)
+        left, right = ConfusionMatrixAccumulator(3), ConfusionMatrixAccumulator(3)
+        left.update(y_true[:200], y_pred[:200])
+        right.update(y_true[200:], y_pred[200:])
+        left.merge(right)
+        np.testing.assert_array_equal(left.matrix, confusion_matrix(y_true, y_pred))
+
+    def test_zero_division(self):
+        """Test d'une classe jamais prédite (zero_division=0 comme sklearn)"""
+        y_true = np.array([0, 1, 2, 2])
+        y_pred = np.array([0, 1, 1, 1])
+        acc = ConfusionMatrixAccumulator(3)
+        acc.update(y_true, y_pred)
+        result = compute_classification_metrics(acc.matrix)
+
+        assert result.precision_per_class[2] == 0.0
+        assert result.f1_weighted == pytest.approx(
+            f1_score(y_true, y_pred, average="weighted", zero_division=0)
+        )
+        assert result.precision_macro == pytest.approx(
+            precision_score(y_true, y_pred, average="macro", zero_division=0)
+        )
+
+    def test_report_matches_sklearn(self):
+        """Test que le rapport texte reproduit classification_report"""
+        y_true, y_pred = _random_predictions(300, 3, 3)
+        names = ["setosa", "versicolor", "virginica"]
+        acc = ConfusionMatrixAccumulator(3)
+        acc.update(y_true, y_pred)
+        report = format_classification_report(
+            compute_classification_metrics(acc.matrix), names
+        )
+        assert report == classification_report(y_true, y_pred, target_names=names)
+
+    def test_invalid_inputs(self):
+        """Test des entrées invalides"""
+        acc = ConfusionMatrixAccumulator(3)
+        with pytest.raises(ValueError):
+            acc.update(np.array([0, 3]), np.array([0, 1]))
+        with pytest.raises(ValueError):
+            acc.update(np.array([0, 1]), np.array([0]))
+        with pytest.raises(ValueError):
+            ConfusionMatrixAccumulator(0)
+
+    def test_encode_labels(self):
+        """Test de l'encodage de labels arbitraires"""
+        labels = np.array(["setosa", "versicolor", "virginica"])
+        codes = encode_labels(np.array(["virginica", "setosa"]), labels)
+        np.testing.assert_array_equal(codes, [2, 0])
+        with pytest.raises(ValueError):
+            encode_labels(np.array(["rose"]), labels)
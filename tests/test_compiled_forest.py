@@ -0,0 +1,78 @@
+"""
+Tests unitaires pour la forêt compilée (models/compiled_forest.py) et le
+microbenchmark d'inférence
+"""
+
+import json
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from benchmarks.bench_inference import append_history, run_benchmark
+from src.models.compiled_forest import compile_forest
+
+
+class TestCompiledForest:
+    """Tests de parité avec RandomForestClassifier"""
+
+    @pytest.mark.parametrize("max_depth", [None, 1, 3])
+    def test_matches_sklearn(self, iris_dataset, max_depth):
+        """Test des feuilles et probabilités de sklearn, y compris hors distribution"""
+        X, y, _, _ = iris_dataset
+        model = RandomForestClassifier(
+            n_estimators=30, max_depth=max_depth, random_state=0
+        ).fit(X, y)
+        compiled = compile_forest(model)
+
+        rng = np.random.default_rng(0)
+        X_new = np.vstack([X, rng.uniform(-1, 10, size=(500, X.shape[1]))])
+        np.testing.assert_array_equal(
+            compiled.apply(X_new).T - compiled.roots, model.apply(X_new)
+        )
+        np.testing.assert_allclose(
+            compiled.predict_proba(X_new), model.predict_proba(X_new), rtol=1e-12
+        )
+        np.testing.assert_array_equal(compiled.predict(X_new), model.predict(X_new))
+        assert compiled.n_estimators == 30
+
+    def test_string_labels(self, iris_dataset):
+        """Test des classes non numériques"""
+        X, y, _, target_names = iris_dataset
+        labels = np.asarray(target_names)[y]
+        model = RandomForestClassifier(n_estimators=5, random_state=0).fit(X, labels)
+        assert (compile_forest(model).predict(X[:10]) == model.predict(X[:10])).all()
+
+    def test_invalid_inputs(self, iris_dataset):
+        """Test des modèles non ajustés et des formes invalides"""
+        X, y, _, _ = iris_dataset
+        with pytest.raises(ValueError):
+            compile_forest(RandomForestClassifier())
+        compiled = compile_forest(RandomForestClassifier(n_estimators=2).fit(X, y))
+        with pytest.raises(ValueError):
+            compiled.predict_proba(X[:, :2])
+
+
+class TestInferenceBenchmark:
+    """Tests du microbenchmark (grille réduite)"""
+
+    def test_run_and_history(self, iris_dataset, tmp_path):
+        """Test des mesures par moteur et de l'historique JSONL"""
+        X, y, _, _ = iris_dataset
+        model = RandomForestClassifier(n_estimators=10, random_state=0).fit(X, y)
+        results = run_benchmark(
+            batch_sizes=[1, 4], n_estimators=[5, 50], repeat=1, model=model
+        )
+
+        # 50 arbres > taille du modèle : ignoré
+        assert {row["n_estimators"] for row in results["engines"]} == {5}
+        assert len(results["engines"]) == 2 * 3
+        for row in results["engines"] + results["feature_array"]:
+            assert row["ns_per_row"] > 0
+            assert row["peak_alloc_bytes"] >= 0
+
+        history = tmp_path / "history.jsonl"
+        assert append_history(results, history) is None
+        previous = append_history(results, history)
+        assert previous["results"] == json.loads(json.dumps(results))
+        assert len(history.read_text().splitlines()) == 2
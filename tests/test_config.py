@@ -80,6 +80,29 @@ class TestConfig:
         config = TrainConfig(n_estimators=1000)
         assert config.n_estimators == 1000
 
+    def test_config_validation_parallelism(self):
+        """Test de validation des paramètres de parallélisme"""
+        config = TrainConfig()
+        assert config.n_jobs == -1
+        assert config.joblib_backend == "threading"
+        assert config.blas_threads is None
+
+        # n_jobs=0 n'a pas de sens, < -1 non supporté
+        with pytest.raises(ValidationError):
+            TrainConfig(n_jobs=0)
+        with pytest.raises(ValidationError):
+            TrainConfig(n_jobs=-2)
+
+        # Backend inconnu et limites de threads invalides
+        with pytest.raises(ValidationError):
+            TrainConfig(joblib_backend="dask")
+        with pytest.raises(ValidationError):
+            TrainConfig(blas_threads=0)
+
+        config = TrainConfig(n_jobs=4, joblib_backend="loky", openmp_threads=2)
+        assert config.n_jobs == 4
+        assert config.openmp_threads == 2
+
     def test_load_config_from_file(self):
         """Test de chargement de configuration depuis un fichier YAML"""
         # Créer un fichier YAML temporaire
@@ -0,0 +1,72 @@
+"""
+Tests unitaires pour la validation croisée (training/cv.py)
+"""
+
+import json
+
+import mlflow
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import StratifiedKFold, cross_val_score
+
+from src.training.cv import cross_validate, data_fingerprint, fold_assignments
+
+PARAMS = {"n_estimators": 10, "max_depth": 3, "random_state": 0}
+
+
+class TestCrossValidation:
+    """Tests pour la CV k-fold parallèle"""
+
+    def test_fold_assignments_cached(self, iris_dataset, tmp_path):
+        """Test du cache des folds (clé empreinte + graine)"""
+        X, y, _, _ = iris_dataset
+        data_hash = data_fingerprint(X, y)
+        folds = fold_assignments(y, 5, 42, data_hash, cache_dir=tmp_path)
+
+        cached = list(tmp_path.glob("folds_*_k5_s42.npy"))
+        assert len(cached) == 1
+        # Folds stratifiés : 10 lignes de chaque classe par fold
+        for fold in range(5):
+            assert np.bincount(y[folds == fold]).tolist() == [10, 10, 10]
+
+        # Le fichier en cache est réutilisé tel quel
+        np.save(cached[0], np.zeros(len(y), dtype=np.int8))
+        reused = fold_assignments(y, 5, 42, data_hash, cache_dir=tmp_path)
+        assert (reused == 0).all()
+        # Autre graine : nouveau découpage
+        other = fold_assignments(y, 5, 7, data_hash, cache_dir=tmp_path)
+        assert not np.array_equal(other, folds)
+
+    @pytest.mark.parametrize("n_workers", [1, 2])
+    def test_matches_sklearn_cross_val_score(self, iris_dataset, n_workers):
+        """Test de parité avec cross_val_score sur les mêmes folds"""
+        X, y, _, _ = iris_dataset
+        summary = cross_validate(X, y, PARAMS, n_splits=5, seed=42, n_workers=n_workers)
+
+        cv = StratifiedKFold(n_splits=5, shuffle=True, random_state=42)
+        scores = cross_val_score(RandomForestClassifier(**PARAMS), X, y, cv=cv)
+        assert summary["cv_accuracy_mean"] == pytest.approx(scores.mean())
+        assert summary["cv_accuracy_std"] == pytest.approx(scores.std())
+        assert summary["cv_folds"] == 5
+        assert 0 < summary["cv_f1_score_mean"] <= 1
+
+    def test_train_model_with_cv(self, tmp_path, monkeypatch):
+        """Test de la CV lancée depuis train_model (MLflow + metrics.json)"""
+        from src.config import get_config
+        from src.training.train import train_model
+
+        monkeypatch.chdir(tmp_path)
+        mlflow.set_tracking_uri(f"file://{tmp_path}/mlruns")
+        monkeypatch.setattr(get_config().cv, "in_train", True)
+        monkeypatch.setattr(get_config().cv, "n_workers", 1)
+
+        _, metadata = train_model(n_estimators=10, experiment_name="test-cv")
+
+        metrics = json.loads((tmp_path / "models" / "metrics.json").read_text())
+        assert metrics["cv_folds"] == 5
+        run = mlflow.get_run(metadata["mlflow_run_id"])
+        assert run.data.metrics["cv_accuracy_mean"] == pytest.approx(
+            metrics["cv_accuracy_mean"]
+        )
+        assert list((tmp_path / "data" / "cache" / "folds").glob("*.npy"))
@@ -6,10 +6,16 @@ import os
 import tempfile
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import pytest
 
-from src.data.prepare import prepare_iris_data
+from src.data.manifest import file_sha256, load_manifest
+from src.data.prepare import hash_split_mask, prepare_iris_data
+from src.data.profile import build_reference_profile, load_reference_profile
+from src.data.schema import FEATURE_COLUMNS
+from src.data.synthetic import generate_synthetic_dataset
+from src.training.train import load_data
 
 
 class TestDataPrepare:
@@ -29,11 +35,11 @@ class TestDataPrepare:
                 # Vérifier que les fichiers existent
                 assert train_path.exists()
                 assert test_path.exists()
-                assert Path("data/raw/iris.csv").exists()
+                assert Path("data/raw/iris.parquet").exists()
 
                 # Vérifier le contenu
-                train_df = pd.read_csv(train_path)
-                test_df = pd.read_csv(test_path)
+                train_df = pd.read_parquet(train_path)
+                test_df = pd.read_parquet(test_path)
 
                 assert len(train_df) > 0
                 assert len(test_df) > 0
@@ -63,8 +69,8 @@ class TestDataPrepare:
                     test_size=0.3, random_state=123
                 )
 
-                train_df = pd.read_csv(train_path)
-                test_df = pd.read_csv(test_path)
+                train_df = pd.read_parquet(train_path)
+                test_df = pd.read_parquet(test_path)
 
                 # Vérifier la proportion approximative (0.3 = 30% pour test)
                 total = len(train_df) + len(test_df)
@@ -85,10 +91,11 @@ class TestDataPrepare:
 
                 prepare_iris_data()
 
-                # Vérifier les fichiers
-                assert Path("data/raw/iris.csv").exists()
-                assert Path("data/processed/train.csv").exists()
-                assert Path("data/processed/test.csv").exists()
+                # Vérifier les fichiers (Parquet uniquement par défaut)
+                assert Path("data/raw/iris.parquet").exists()
+                assert Path("data/processed/train.parquet").exists()
+                assert Path("data/processed/test.parquet").exists()
+                assert not Path("data/processed/train.csv").exists()
 
             finally:
                 os.chdir(original_dir)
@@ -105,9 +112,9 @@ class TestDataPrepare:
                 prepare_iris_data()
 
                 # Charger les données
-                raw_df = pd.read_csv("data/raw/iris.csv")
-                train_df = pd.read_csv("data/processed/train.csv")
-                test_df = pd.read_csv("data/processed/test.csv")
+                raw_df = pd.read_parquet("data/raw/iris.parquet")
+                train_df = pd.read_parquet("data/processed/train.parquet")
+                test_df = pd.read_parquet("data/processed/test.parquet")
 
                 # Vérifier qu'il n'y a pas de doublons entre train et test
                 # Utiliser les valeurs des features pour identifier les doublons
@@ -140,3 +147,158 @@ class TestDataPrepare:
 
             finally:
                 os.chdir(original_dir)
+
+    def test_prepare_iris_data_schema(self):
+        """Test du schéma typé (float32 / int8 / catégoriel)"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            original_dir = os.getcwd()
+            try:
+                os.chdir(temp_dir)
+
+                train_path, _ = prepare_iris_data()
+                train_df = pd.read_parquet(train_path)
+
+                for col in FEATURE_COLUMNS:
+                    assert train_df[col].dtype == np.float32
+                assert train_df["target"].dtype == np.int8
+                assert isinstance(train_df["target_name"].dtype, pd.CategoricalDtype)
+                assert list(train_df["target_name"].cat.categories) == [
+                    "setosa",
+                    "versicolor",
+                    "virginica",
+                ]
+                # Nom de classe cohérent avec la cible
+                codes = train_df["target_name"].cat.codes.to_numpy()
+                np.testing.assert_array_equal(codes, train_df["target"].to_numpy())
+
+            finally:
+                os.chdir(original_dir)
+
+    def test_prepare_iris_data_csv_export(self):
+        """Test de l'export CSV optionnel"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            original_dir = os.getcwd()
+            try:
+                os.chdir(temp_dir)
+
+                train_path, test_path = prepare_iris_data(export_csv=True)
+
+                assert Path("data/raw/iris.csv").exists()
+                assert train_path.with_suffix(".csv").exists()
+                csv_df = pd.read_csv(test_path.with_suffix(".csv"))
+                parquet_df = pd.read_parquet(test_path)
+                assert len(csv_df) == len(parquet_df)
+                np.testing.assert_allclose(
+                    csv_df[FEATURE_COLUMNS].to_numpy(),
+                    parquet_df[FEATURE_COLUMNS].to_numpy(),
+                    rtol=1e-6,
+                )
+
+            finally:
+                os.chdir(original_dir)
+
+    def test_prepare_streaming(self):
+        """Test du mode flux : découpe par hachage reproductible et stratifiée"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            original_dir = os.getcwd()
+            try:
+                os.chdir(temp_dir)
+                source = generate_synthetic_dataset(
+                    n_rows=20_000, chunk_size=5000, seed=3, output_path="source.parquet"
+                )
+
+                train_path, test_path = prepare_iris_data(
+                    test_size=0.2,
+                    random_state=0,
+                    source_path=str(source),
+                    chunk_size=3000,
+                )
+                train_df = pd.read_parquet(train_path)
+                test_df = pd.read_parquet(test_path)
+                # Fichier brut = source typée, cohérent avec les splits
+                raw_df = pd.read_parquet("data/raw/iris.parquet")
+                assert len(raw_df) == len(train_df) + len(test_df) == 20_000
+                np.testing.assert_array_equal(
+                    raw_df["target"], pd.read_parquet(source)["target"]
+                )
+                fractions = (
+                    test_df["target"].value_counts()
+                    / pd.read_parquet(source)["target"].value_counts()
+                )
+                np.testing.assert_allclose(fractions.values, 0.2, atol=0.02)
+                assert train_df["target_name"].dtype == "category"
+
+                # Profil fusionné par morceaux = profil du train complet
+                profile = load_reference_profile(
+                    Path("data/processed/reference_profile.json")
+                )
+                expected = build_reference_profile(
+                    train_df, ["setosa", "versicolor", "virginica"]
+                )
+                assert profile["n_rows"] == len(train_df)
+                assert profile["class_counts"] == expected["class_counts"]
+                for name in FEATURE_COLUMNS:
+                    actual, reference = (
+                        profile["features"][name],
+                        expected["features"][name],
+                    )
+                    assert actual["histogram"] == reference["histogram"]
+                    assert actual["mean"] == pytest.approx(reference["mean"])
+                    assert actual["variance"] == pytest.approx(reference["variance"])
+                    assert actual["quantiles"] == pytest.approx(reference["quantiles"])
+
+                # Même résultat quel que soit le découpage en morceaux
+                _, other_test = prepare_iris_data(
+                    test_size=0.2,
+                    random_state=0,
+                    source_path=str(source),
+                    chunk_size=7000,
+                )
+                pd.testing.assert_frame_equal(test_df, pd.read_parquet(other_test))
+            finally:
+                os.chdir(original_dir)
+
+    def test_hash_split_mask(self):
+        """Test de l'affectation par hachage (déterministe, dépend de la graine)"""
+        codes = np.repeat(np.arange(3), 10_000)
+        ranks = np.tile(np.arange(10_000), 3)
+
+        mask = hash_split_mask(codes, ranks, test_size=0.3, random_state=1)
+        np.testing.assert_array_equal(
+            mask, hash_split_mask(codes, ranks, test_size=0.3, random_state=1)
+        )
+        assert not np.array_equal(
+            mask, hash_split_mask(codes, ranks, test_size=0.3, random_state=2)
+        )
+        for k in range(3):
+            assert mask[codes == k].mean() == pytest.approx(0.3, abs=0.02)
+
+    def test_manifest_and_memoized_load(self):
+        """Test du manifeste écrit par prepare et du chargement mémoïsé"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            original_dir = os.getcwd()
+            try:
+                os.chdir(temp_dir)
+                train_path, test_path = prepare_iris_data(test_size=0.2)
+
+                manifest = load_manifest(Path("data/processed"))
+                assert manifest["target_names"] == ["setosa", "versicolor", "virginica"]
+                assert manifest["feature_names"] == FEATURE_COLUMNS
+                assert manifest["files"]["train"]["rows"] == 120
+                assert manifest["files"]["test"]["rows"] == 30
+                assert manifest["files"]["test"]["sha256"] == file_sha256(test_path)
+
+                train_df, test_df, metadata = load_data(0.2, 42)
+                assert metadata["target_names"] == manifest["target_names"]
+                assert len(train_df) == 120 and len(test_df) == 30
+
+                # Second appel : mêmes objets (pas de nouvelle lecture Parquet)
+                train_again, _, _ = load_data(0.2, 42)
+                assert train_again is train_df
+
+                # Fichier réécrit : le cache est invalidé
+                prepare_iris_data(test_size=0.3)
+                train_new, _, _ = load_data(0.3, 42)
+                assert len(train_new) == 105
+            finally:
+                os.chdir(original_dir)
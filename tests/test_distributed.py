@@ -0,0 +1,137 @@
+"""
+Tests unitaires pour l'entraînement distribué par sous-forêts
+(training/distributed.py)
+"""
+
+from multiprocessing.connection import Client
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from src.training.distributed import (
+    merge_forests,
+    split_tree_budget,
+    start_local_worker,
+    stop_worker,
+    train_sharded,
+)
+
+
+class TestDistributedTraining:
+    """Tests pour le coordinateur et la fusion des sous-forêts"""
+
+    def test_split_tree_budget(self):
+        """Test de la répartition des arbres entre workers"""
+        assert split_tree_budget(10, 3) == [4, 3, 3]
+        assert split_tree_budget(2, 4) == [1, 1]
+        with pytest.raises(ValueError):
+            split_tree_budget(10, 0)
+
+    def test_merge_matches_subforest_average(self, iris_dataset):
+        """Test que la forêt fusionnée moyenne les probabilités des sous-forêts"""
+        X, y, _, _ = iris_dataset
+        forests = [
+            RandomForestClassifier(n_estimators=5, random_state=seed).fit(X, y)
+            for seed in (0, 1)
+        ]
+        merged = merge_forests(forests)
+
+        assert len(merged.estimators_) == merged.n_estimators == 10
+        expected = (forests[0].predict_proba(X) + forests[1].predict_proba(X)) / 2
+        np.testing.assert_allclose(merged.predict_proba(X), expected)
+
+        other = RandomForestClassifier(n_estimators=2).fit(X[y < 2], y[y < 2])
+        with pytest.raises(ValueError):
+            merge_forests([forests[0], other])
+
+    @pytest.mark.parametrize("shard_data", [False, True])
+    def test_train_sharded_local(self, iris_dataset, shard_data):
+        """Test de l'entraînement sur processus locaux (déterministe)"""
+        X, y, _, _ = iris_dataset
+        kwargs = dict(
+            n_estimators=12,
+            max_depth=5,
+            random_state=42,
+            n_workers=3,
+            shard_data=shard_data,
+        )
+        model = train_sharded(X, y, **kwargs)
+        again = train_sharded(X, y, **kwargs)
+
+        assert len(model.estimators_) == 12
+        assert (model.predict(X) == y).mean() > 0.9
+        np.testing.assert_array_equal(model.predict_proba(X), again.predict_proba(X))
+
+    def test_train_sharded_remote(self, iris_dataset):
+        """Test avec des noeuds workers (stand-in local sur socket authentifiée)"""
+        X, y, _, _ = iris_dataset
+        authkey = b"test-key"
+        nodes = [start_local_worker(authkey) for _ in range(2)]
+        addresses = [address for address, _ in nodes]
+        try:
+            remote = train_sharded(
+                X,
+                y,
+                n_estimators=12,
+                max_depth=5,
+                random_state=42,
+                n_workers=3,
+                worker_addresses=addresses,
+                authkey=authkey,
+            )
+            local = train_sharded(
+                X, y, n_estimators=12, max_depth=5, random_state=42, n_workers=3
+            )
+            # Mêmes graines : même forêt quel que soit le type de worker
+            np.testing.assert_array_equal(
+                remote.predict_proba(X), local.predict_proba(X)
+            )
+        finally:
+            for address, thread in nodes:
+                stop_worker(address, authkey)
+                thread.join(timeout=5)
+        assert not any(thread.is_alive() for _, thread in nodes)
+
+    def test_worker_survives_coordinator_disconnect(self, iris_dataset):
+        """Test : un coordinateur qui se déconnecte ne tue pas la boucle du worker"""
+        X, y, _, _ = iris_dataset
+        authkey = b"test-key"
+        address, thread = start_local_worker(authkey)
+        host, port = address.rsplit(":", 1)
+        try:
+            # Connexion authentifiée puis fermée sans envoyer de tâche
+            Client((host, int(port)), authkey=authkey).close()
+            model = train_sharded(
+                X,
+                y,
+                n_estimators=4,
+                max_depth=3,
+                random_state=0,
+                n_workers=1,
+                worker_addresses=[address],
+                authkey=authkey,
+            )
+            assert len(model.estimators_) == 4
+        finally:
+            stop_worker(address, authkey)
+            thread.join(timeout=5)
+        assert not thread.is_alive()
+
+    def test_train_model_sharded(self, tmp_path, monkeypatch):
+        """Test de l'intégration dans train_model (modèle loggé comme d'habitude)"""
+        import mlflow
+
+        from src.training.train import train_model
+
+        monkeypatch.chdir(tmp_path)
+        mlflow.set_tracking_uri(f"file://{tmp_path}/mlruns")
+        model, metadata = train_model(
+            n_estimators=10, experiment_name="test-sharded", distributed_workers=2
+        )
+
+        assert len(model.estimators_) == 10
+        run = mlflow.get_run(metadata["mlflow_run_id"])
+        assert run.data.params["distributed_workers"] == "2"
+        loaded = mlflow.sklearn.load_model(metadata["mlflow_run_uri"])
+        assert len(loaded.estimators_) == 10
@@ -0,0 +1,204 @@
+"""
+Tests unitaires pour le profil de référence (data/profile.py) et le moniteur
+de dérive en ligne (serving/drift.py)
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from src.data.profile import (
+    HISTOGRAM_BINS,
+    QUANTILES,
+    ProfileAccumulator,
+    bin_indices,
+    build_reference_profile,
+    load_reference_profile,
+    write_reference_profile,
+)
+from src.data.schema import FEATURE_COLUMNS, TARGET_COLUMN, apply_schema
+from src.serving.app import app
+from src.serving.drift import DriftMonitor, kl_divergence, psi
+from src.serving.metrics import feature_drift_psi
+from src.serving.middleware import limiter
+from src.serving.registry import ModelRegistry
+
+
+@pytest.fixture
+def reference_df(iris_dataset):
+    X, y, _, target_names = iris_dataset
+    df = pd.DataFrame(X, columns=FEATURE_COLUMNS)
+    df[TARGET_COLUMN] = y
+    return apply_schema(df, list(target_names)), list(target_names)
+
+
+@pytest.fixture
+def reference_profile(reference_df):
+    df, target_names = reference_df
+    return build_reference_profile(df, target_names)
+
+
+class TestReferenceProfile:
+    """Tests du profil écrit par l'étape prepare"""
+
+    def test_bin_indices(self):
+        """Test des bornes : plage [0, 20], valeurs hors plage rabattues"""
+        bins = bin_indices(np.array([-1.0, 0.0, 0.49, 0.5, 19.99, 20.0, 25.0]))
+        assert bins.tolist() == [0, 0, 0, 1, 39, 39, 39]
+
+    def test_build_and_roundtrip(self, reference_profile, tmp_path):
+        """Test des statistiques et de la relecture"""
+        assert reference_profile["n_rows"] == 150
+        assert reference_profile["class_counts"] == [50, 50, 50]
+        for stats in reference_profile["features"].values():
+            assert len(stats["histogram"]) == HISTOGRAM_BINS
+            assert sum(stats["histogram"]) == 150
+
+        path = write_reference_profile(reference_profile, tmp_path)
+        assert load_reference_profile(path) == reference_profile
+
+    def test_quantiles_and_range(self, reference_df, reference_profile):
+        """Test des min / max et des quantiles (erreur bornée par le binning fin)"""
+        df, _ = reference_df
+        for name, stats in reference_profile["features"].items():
+            values = df[name].to_numpy(dtype=np.float64)
+            assert stats["min"] == values.min()
+            assert stats["max"] == values.max()
+            expected = np.quantile(values, [0.25, 0.5, 0.75])
+            actual = [stats["quantiles"][str(q)] for q in (0.25, 0.5, 0.75)]
+            np.testing.assert_allclose(actual, expected, atol=0.06)
+            assert list(stats["quantiles"]) == [str(q) for q in QUANTILES]
+        assert reference_profile["class_frequencies"] == pytest.approx([1 / 3] * 3)
+
+    def test_merge_matches_single_pass(self, reference_df, reference_profile):
+        """Test : profil fusionné par morceaux = profil en un seul passage"""
+        df, target_names = reference_df
+        accumulator = ProfileAccumulator(target_names)
+        for start in range(0, len(df), 37):
+            accumulator.update(df.iloc[start : start + 37])
+        merged = accumulator.to_profile()
+
+        assert merged["class_counts"] == reference_profile["class_counts"]
+        for name, stats in reference_profile["features"].items():
+            assert merged["features"][name]["histogram"] == stats["histogram"]
+            assert merged["features"][name]["quantiles"] == pytest.approx(
+                stats["quantiles"]
+            )
+            assert merged["features"][name]["variance"] == pytest.approx(
+                stats["variance"]
+            )
+
+    def test_incompatible_histogram(self, reference_profile, tmp_path):
+        """Test du refus d'un profil aux classes d'histogramme différentes"""
+        path = write_reference_profile(
+            {**reference_profile, "histogram_bins": 10}, tmp_path
+        )
+        with pytest.raises(ValueError):
+            load_reference_profile(path)
+
+
+class TestDriftMonitor:
+    """Tests des statistiques en ligne et des scores de dérive"""
+
+    def test_divergences(self):
+        """Test de PSI / KL : nuls à l'identique, positifs et finis sinon"""
+        assert psi([10, 20, 30], [1, 2, 3]) == pytest.approx(0.0)
+        assert kl_divergence([10, 20, 30], [1, 2, 3]) == pytest.approx(0.0)
+        assert 0 < psi([10, 0, 0], [0, 0, 10]) < np.inf
+        assert 0 < kl_divergence([10, 0, 0], [0, 0, 10]) < np.inf
+
+    def test_welford_matches_numpy(self, reference_df, reference_profile):
+        """Test de la moyenne / variance en ligne et de l'absence de dérive"""
+        df, _ = reference_df
+        monitor = DriftMonitor(reference_profile)
+        X = df[FEATURE_COLUMNS].to_numpy(dtype=np.float64)
+        for row, code in zip(X, df[TARGET_COLUMN]):
+            monitor.update(row.tolist(), int(code))
+
+        np.testing.assert_allclose(monitor.variance(), X.var(axis=0))
+        scores = monitor.scores()
+        assert scores["samples"] == 150
+        for values in scores["features"].values():
+            assert values["psi"] == pytest.approx(0.0, abs=1e-9)
+            assert values["mean_shift"] == pytest.approx(0.0, abs=1e-9)
+        assert scores["prediction"]["psi"] == pytest.approx(0.0, abs=1e-9)
+
+    def test_shift_detected(self, reference_profile):
+        """Test d'un trafic décalé : PSI élevé et écart de moyenne positif"""
+        monitor = DriftMonitor(reference_profile)
+        for _ in range(200):
+            monitor.update([9.0, 6.0, 9.0, 4.0], 2)
+        scores = monitor.scores()
+        for values in scores["features"].values():
+            assert values["psi"] > 1.0
+            assert values["mean_shift"] > 1.0
+        assert scores["prediction"]["psi"] > 0.2
+
+    def test_from_reference_missing(self, tmp_path):
+        """Test : profil absent, pas de moniteur"""
+        assert DriftMonitor.from_reference(tmp_path / "absent.json") is None
+
+
+class TestDriftMetricsRoute:
+    """Tests de la mise à jour depuis /predict et de l'export au scrape"""
+
+    def test_predict_updates_and_scrape_exports(
+        self,
+        api_client_with_model,
+        api_key,
+        valid_iris_data,
+        reference_profile,
+        monkeypatch,
+    ):
+        """Test des gauges de dérive exposées par /metrics"""
+        monkeypatch.setattr(limiter, "enabled", False)
+        monitor = DriftMonitor(reference_profile)
+        app.state.drift = monitor
+        try:
+            response = api_client_with_model.post(
+                "/predict", json=valid_iris_data, headers={"X-API-Key": api_key}
+            )
+            assert response.status_code == 200
+            assert monitor.n == 1
+
+            metrics = api_client_with_model.get("/metrics").text
+        finally:
+            app.state.drift = None
+
+        assert "feature_drift_psi" in metrics
+        assert "prediction_drift_kl" in metrics
+        expected = monitor.scores()["features"][FEATURE_COLUMNS[0]]["psi"]
+        sample = feature_drift_psi.labels(feature=FEATURE_COLUMNS[0])
+        assert sample._value.get() == pytest.approx(expected)
+
+    def test_other_models_not_monitored(
+        self,
+        api_client_with_model,
+        api_key,
+        valid_iris_data,
+        reference_profile,
+        iris_dataset,
+        monkeypatch,
+    ):
+        """Test : seules les prédictions du modèle par défaut alimentent la dérive"""
+        monkeypatch.setattr(limiter, "enabled", False)
+        X, y, _, _ = iris_dataset
+        challenger = RandomForestClassifier(n_estimators=5, random_state=1).fit(X, y)
+        monitor = DriftMonitor(reference_profile)
+        app.state.drift = monitor
+        app.state.registry = ModelRegistry(
+            ["IrisClassifier@challenger"], loader=lambda key: (challenger, None)
+        )
+        try:
+            response = api_client_with_model.post(
+                "/models/IrisClassifier@challenger/predict",
+                json=valid_iris_data,
+                headers={"X-API-Key": api_key},
+            )
+        finally:
+            app.state.drift = None
+            app.state.registry = None
+
+        assert response.status_code == 200
+        assert monitor.n == 0
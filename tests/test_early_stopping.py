@@ -0,0 +1,104 @@
+"""
+Tests unitaires pour l'arrêt anticipé OOB (training/early_stopping.py)
+"""
+
+import warnings
+
+import mlflow
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from src.training.early_stopping import fit_with_oob_early_stopping, oob_metrics
+
+
+class TestOOBEarlyStopping:
+    """Tests pour la croissance par incréments jusqu'au plateau OOB"""
+
+    def test_stops_on_plateau(self, iris_dataset):
+        """Test de l'arrêt avant le budget et de la troncature au meilleur point"""
+        X, y, _, _ = iris_dataset
+        model = RandomForestClassifier(n_estimators=500, random_state=42)
+        curve = fit_with_oob_early_stopping(
+            model, X, y, step=10, tol=0.01, patience=2, metric="accuracy"
+        )
+
+        assert curve.stopped_early
+        assert curve.n_estimators[-1] < 500
+        assert len(model.estimators_) == model.n_estimators == curve.best_n_estimators
+        assert model.warm_start is False
+        best = curve.n_estimators.index(curve.best_n_estimators)
+        assert model.oob_score_ == curve.accuracy[best]
+        assert (model.predict(X) == y).mean() > 0.9
+
+    @staticmethod
+    def _expected_oob_log_loss(model, X, y):
+        """Log-loss OOB recalculé sur les échantillons laissés hors-sac par un arbre"""
+        in_bag = np.zeros((len(model.estimators_), len(y)), dtype=bool)
+        for i, samples in enumerate(model.estimators_samples_):
+            in_bag[i, samples] = True
+        seen_oob = (~in_bag).any(axis=0)
+        proba = model.oob_decision_function_[seen_oob]
+        codes = np.searchsorted(model.classes_, y[seen_oob])
+        # Même borne que sklearn < 1.5 (1e-15) pour les probabilités nulles
+        p_true = np.clip(proba[np.arange(len(codes)), codes], 1e-15, 1.0)
+        return seen_oob, float(-np.log(p_true).mean())
+
+    def test_curve_matches_direct_oob(self, iris_dataset):
+        """Test que chaque point de la courbe vaut le score OOB d'une forêt de même taille"""
+        X, y, _, _ = iris_dataset
+        model = RandomForestClassifier(n_estimators=40, random_state=0)
+        curve = fit_with_oob_early_stopping(model, X, y, step=20, tol=0.0, patience=5)
+        assert curve.n_estimators == [20, 40]
+
+        direct = RandomForestClassifier(n_estimators=40, random_state=0, oob_score=True)
+        direct.fit(X, y)
+        seen_oob, expected_log_loss = self._expected_oob_log_loss(direct, X, y)
+        assert seen_oob.all()
+        assert curve.accuracy[-1] == pytest.approx(direct.oob_score_)
+        assert curve.log_loss[-1] == pytest.approx(expected_log_loss)
+
+    def test_samples_never_out_of_bag_ignored(self, iris_dataset):
+        """Test d'une petite forêt : lignes nulles de sklearn exclues des métriques"""
+        X, y, _, _ = iris_dataset
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", UserWarning)
+            direct = RandomForestClassifier(
+                n_estimators=5, random_state=0, oob_score=True
+            ).fit(X, y)
+        seen_oob, expected_log_loss = self._expected_oob_log_loss(direct, X, y)
+        assert not seen_oob.all()
+
+        accuracy, oob_log_loss = oob_metrics(direct, y)
+        proba = direct.oob_decision_function_[seen_oob]
+        expected_accuracy = (
+            direct.classes_[proba.argmax(axis=1)] == y[seen_oob]
+        ).mean()
+        assert accuracy == pytest.approx(expected_accuracy)
+        assert oob_log_loss == pytest.approx(expected_log_loss)
+        assert oob_log_loss < 2.0
+
+    def test_invalid_arguments(self, iris_dataset):
+        """Test des paramètres invalides"""
+        X, y, _, _ = iris_dataset
+        with pytest.raises(ValueError):
+            fit_with_oob_early_stopping(RandomForestClassifier(), X, y, metric="f1")
+        with pytest.raises(ValueError):
+            fit_with_oob_early_stopping(RandomForestClassifier(bootstrap=False), X, y)
+
+    def test_train_model_logs_oob_history(self, tmp_path, monkeypatch):
+        """Test de l'historique OOB loggé dans MLflow par train_model"""
+        from src.training.train import train_model
+
+        monkeypatch.chdir(tmp_path)
+        mlflow.set_tracking_uri(f"file://{tmp_path}/mlruns")
+        model, metadata = train_model(
+            n_estimators=100, experiment_name="test-oob", early_stopping=True
+        )
+
+        assert metadata["n_estimators"] == len(model.estimators_) <= 100
+        client = mlflow.tracking.MlflowClient()
+        history = client.get_metric_history(metadata["mlflow_run_id"], "oob_log_loss")
+        steps = [m.step for m in history]
+        assert steps == sorted(steps) and steps[0] == 10
+        assert len(history) >= 1
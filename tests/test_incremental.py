@@ -0,0 +1,79 @@
+"""
+Tests unitaires pour l'entraînement incrémental (training/incremental.py)
+"""
+
+import os
+import tempfile
+
+import mlflow
+import numpy as np
+import pytest
+
+from src.training.incremental import grow_forest, train_incremental
+from src.training.train import train_model
+
+
+@pytest.fixture
+def production_model():
+    """Modèle de production (20 arbres) entraîné dans un répertoire temporaire"""
+    temp_dir = tempfile.mkdtemp()
+    original_dir = os.getcwd()
+    os.chdir(temp_dir)
+    mlflow.set_tracking_uri(f"file://{temp_dir}/mlruns")
+    try:
+        yield train_model(n_estimators=20, experiment_name="test-incremental")
+    finally:
+        os.chdir(original_dir)
+
+
+class TestIncrementalTraining:
+    """Tests pour la croissance du modèle de production"""
+
+    def test_grow_keeps_existing_trees(self, production_model):
+        """Test que les arbres existants sont conservés et K arbres ajoutés"""
+        parent, parent_metadata = production_model
+        parent_thresholds = [t.tree_.threshold.copy() for t in parent.estimators_]
+
+        model, metadata = train_incremental(
+            n_new_trees=10, experiment_name="test-incremental"
+        )
+
+        assert len(model.estimators_) == 30
+        assert model.warm_start is False
+        for tree, thresholds in zip(model.estimators_[:20], parent_thresholds):
+            np.testing.assert_array_equal(tree.tree_.threshold, thresholds)
+
+        # Lignée et nouveau modèle de production
+        assert metadata["parent_run_id"] == parent_metadata["mlflow_run_id"]
+        assert metadata["lineage"] == [parent_metadata["mlflow_run_id"]]
+        assert metadata["mlflow_run_id"] != parent_metadata["mlflow_run_id"]
+
+        run = mlflow.get_run(metadata["mlflow_run_id"])
+        assert run.data.tags["parent_run_id"] == parent_metadata["mlflow_run_id"]
+        assert run.data.params["n_new_trees"] == "10"
+        assert run.data.metrics["accuracy"] > 0.8
+        assert run.data.metrics["full_retrain_time_s"] > 0
+        assert "speedup_vs_full_retrain" in run.data.metrics
+
+        # Deuxième génération : la lignée s'allonge
+        _, child_metadata = train_incremental(
+            n_new_trees=5,
+            experiment_name="test-incremental",
+            compare_full_retrain=False,
+        )
+        assert child_metadata["lineage"] == [
+            parent_metadata["mlflow_run_id"],
+            metadata["mlflow_run_id"],
+        ]
+        assert child_metadata["n_estimators"] == 35
+
+    def test_grow_rejects_new_classes(self, iris_dataset):
+        """Test du refus de données dont les classes diffèrent du modèle"""
+        from sklearn.ensemble import RandomForestClassifier
+
+        X, y, _, _ = iris_dataset
+        model = RandomForestClassifier(n_estimators=5, random_state=0).fit(X, y)
+        with pytest.raises(ValueError):
+            grow_forest(model, X[y < 2], y[y < 2], 5)
+        with pytest.raises(ValueError):
+            grow_forest(model, X, y, 0)
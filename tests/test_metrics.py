@@ -58,8 +58,8 @@ class TestMetrics:
     def test_model_predictions_counter(self):
         """Test du compteur model_predictions"""
         # Incrémenter le compteur
-        model_predictions.labels(predicted_class="setosa").inc()
-        model_predictions.labels(predicted_class="versicolor").inc()
+        model_predictions.labels(predicted_class="setosa", model="default").inc()
+        model_predictions.labels(predicted_class="versicolor", model="default").inc()
 
         # Vérifier que les métriques sont enregistrées
         content = generate_latest().decode("utf-8")
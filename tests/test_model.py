@@ -8,12 +8,16 @@ import os
 import tempfile
 
 import joblib
+import mlflow
 import numpy as np
 import pytest
 from sklearn.datasets import load_iris
+from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import accuracy_score
 from sklearn.model_selection import train_test_split
 
+from src.config import TrainConfig, get_config
+from src.training.train import parallel_context
 from src.training.train import train_model as train_iris_model
 
 
@@ -205,3 +209,44 @@ class TestModel:
         proba1 = model.predict_proba(sample)
         proba2 = model.predict_proba(sample)
         np.testing.assert_array_almost_equal(proba1, proba2)
+
+    def test_model_deterministic_across_cores(self, iris_dataset):
+        """Test que le modèle est identique quel que soit le nombre de coeurs"""
+        X, y, feature_names, target_names = iris_dataset
+
+        probas = []
+        for n_jobs in (1, 2, -1):
+            model = RandomForestClassifier(
+                n_estimators=20, random_state=42, n_jobs=n_jobs
+            )
+            with parallel_context(TrainConfig(n_jobs=n_jobs, blas_threads=1)):
+                model.fit(X, y)
+            probas.append(model.predict_proba(X))
+
+        np.testing.assert_array_equal(probas[0], probas[1])
+        np.testing.assert_array_equal(probas[0], probas[2])
+
+    def test_model_parallelism_logged(self, trained_model):
+        """Test que le temps d'ajustement et le nombre de coeurs sont tracés"""
+        model, metadata = trained_model
+
+        # Le tracking URI global a pu être modifié par d'autres tests
+        tracking_uri = metadata["mlflow_run_uri"].split("/mlruns/")[0] + "/mlruns"
+        client = mlflow.tracking.MlflowClient(tracking_uri=tracking_uri)
+        run = client.get_run(metadata["mlflow_run_id"])
+        assert "fit_time_s" in run.data.metrics
+        assert run.data.metrics["fit_time_s"] > 0
+        assert "n_cpus" in run.data.params
+        assert "effective_n_jobs" in run.data.params
+        assert run.data.params["n_jobs"] == str(get_config().train.n_jobs)
+        # Le modèle livré au serving n'hérite pas du parallélisme d'entraînement
+        assert model.n_jobs is None
+
+    def test_reference_profile_logged(self, trained_model):
+        """Test du profil de référence livré avec le modèle (artefact MLflow)"""
+        _, metadata = trained_model
+
+        tracking_uri = metadata["mlflow_run_uri"].split("/mlruns/")[0] + "/mlruns"
+        client = mlflow.tracking.MlflowClient(tracking_uri=tracking_uri)
+        artifacts = [a.path for a in client.list_artifacts(metadata["mlflow_run_id"])]
+        assert "reference_profile.json" in artifacts
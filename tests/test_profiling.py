@@ -0,0 +1,100 @@
+"""
+Tests unitaires pour le profilage des étapes du pipeline (profiling.py)
+"""
+
+import json
+import time
+
+import mlflow
+import pytest
+
+from src.profiling import PipelineProfiler, SamplingProfiler
+
+
+def _busy(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        sum(range(1000))
+
+
+class TestPipelineProfiler:
+    """Tests pour la mesure des étapes et les profils détaillés"""
+
+    def test_stages_accumulate(self, tmp_path):
+        """Test du cumul des appels répétés d'une étape et du rapport"""
+        profiler = PipelineProfiler("test")
+        with profiler:
+            for _ in range(2):
+                with profiler.stage("work"):
+                    _busy(0.02)
+            with profiler.stage("other"):
+                pass
+
+        work = profiler.stages["work"]
+        assert work["calls"] == 2
+        assert work["wall_s"] >= 0.04
+        assert work["cpu_s"] > 0
+        assert work["peak_rss_mb"] > 0
+        assert profiler.total_wall_s >= work["wall_s"]
+
+        metrics = profiler.flat_metrics()
+        assert {"time_work_s", "cpu_work_s", "peak_rss_work_mb", "time_total_s"} <= set(
+            metrics
+        )
+
+        path = profiler.write_timings(tmp_path / "timings.json")
+        report = json.loads(path.read_text())
+        assert report["pipeline"] == "test"
+        assert set(report["stages"]) == {"work", "other"}
+
+    def test_stage_recorded_on_error(self):
+        """Test qu'une étape en échec est tout de même mesurée"""
+        profiler = PipelineProfiler("test")
+        with pytest.raises(RuntimeError):
+            with profiler.stage("fail"):
+                raise RuntimeError("échec")
+        assert profiler.stages["fail"]["calls"] == 1
+
+    def test_unknown_profiler(self):
+        """Test du rejet d'un profileur inconnu"""
+        with pytest.raises(ValueError):
+            PipelineProfiler("test", profiler="perf")
+
+    def test_cprofile_writes_files(self, tmp_path):
+        """Test du profil cProfile (.prof + résumé texte)"""
+        profiler = PipelineProfiler("test", profiler="cprofile")
+        with profiler:
+            _busy(0.01)
+        paths = profiler.write_profile(tmp_path)
+
+        assert [p.name for p in paths] == ["test.prof", "test_profile.txt"]
+        assert "_busy" in (tmp_path / "test_profile.txt").read_text()
+
+    def test_sampling_profiler_folded(self):
+        """Test du format folded : piles de la racine vers la feuille"""
+        sampler = SamplingProfiler(interval_s=0.001)
+        sampler.start()
+        _busy(0.1)
+        sampler.stop()
+
+        assert sampler.n_samples > 0
+        stack, count = sampler.folded().splitlines()[0].rsplit(" ", 1)
+        assert int(count) >= 1
+        assert any("_busy" in frame for frame in stack.split(";"))
+        assert sum(f["samples"] for f in sampler.top_functions()) <= sampler.n_samples
+
+    def test_train_model_writes_timings(self, tmp_path, monkeypatch):
+        """Test de timings.json et des métriques par étape loggées par train_model"""
+        from src.training.train import train_model
+
+        monkeypatch.chdir(tmp_path)
+        mlflow.set_tracking_uri(f"file://{tmp_path}/mlruns")
+        _, metadata = train_model(n_estimators=10, experiment_name="test-profiling")
+
+        report = json.loads((tmp_path / "models" / "timings.json").read_text())
+        assert {"load_data", "fit", "evaluate", "log_model", "write_metadata"} <= set(
+            report["stages"]
+        )
+        run = mlflow.get_run(metadata["mlflow_run_id"])
+        assert "time_fit_s" in run.data.metrics
+        assert run.data.tags["profiler"] == "none"
@@ -0,0 +1,184 @@
+"""
+Tests unitaires pour le registre multi-modèles du serving (serving/registry.py)
+"""
+
+import asyncio
+import pickle
+import threading
+
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from src.serving.app import app
+from src.serving.middleware import limiter
+from src.serving.registry import (
+    MODEL_HEADER,
+    ModelRegistry,
+    UnknownModelError,
+    estimate_model_bytes,
+    model_uri_for_key,
+)
+
+RUN_ID = "0123456789abcdef0123456789abcdef"
+
+
+class _CountingLoader:
+    """Chargeur factice : un "modèle" de `size` octets par clé"""
+
+    def __init__(self, size: int = 1000):
+        self.size = size
+        self.calls = []
+
+    def __call__(self, key):
+        self.calls.append(key)
+        return bytearray(self.size), f"run-{key}"
+
+
+class TestModelRegistry:
+    """Tests du cache LRU sous budget mémoire"""
+
+    def test_model_uri_for_key(self):
+        """Test des URI MLflow : run id ou alias du Model Registry"""
+        assert model_uri_for_key(RUN_ID) == f"runs:/{RUN_ID}/model"
+        assert (
+            model_uri_for_key("IrisClassifier@champion")
+            == "models:/IrisClassifier@champion"
+        )
+
+    def test_lru_eviction_under_budget(self):
+        """Test du déchargement du moins récemment utilisé, défaut épinglé"""
+        loader = _CountingLoader()
+        budget = 3 * estimate_model_bytes(bytearray(1000)) + 100
+        registry = ModelRegistry(["a", "b", "c"], budget, loader=loader)
+        registry.register("default", bytearray(1000), default=True)
+
+        async def _run():
+            await registry.get("a")
+            await registry.get("b")
+            await registry.get("a")  # "b" devient le moins récent
+            await registry.get("c")
+
+        asyncio.run(_run())
+        assert registry.loaded_keys() == ["default", "a", "c"]
+        assert registry.memory_bytes <= budget
+        assert loader.calls == ["a", "b", "c"]
+
+    def test_oversized_model_still_served(self):
+        """Test : un modèle plus gros que le budget reste chargé (seul)"""
+        registry = ModelRegistry(["a", "b"], 10, loader=_CountingLoader())
+        entry = asyncio.run(registry.get("a"))
+        assert entry.run_id == "run-a"
+        asyncio.run(registry.get("b"))
+        assert registry.loaded_keys() == ["b"]
+
+    def test_forest_size_from_tree_arrays(self, iris_dataset, monkeypatch):
+        """Test : empreinte d'une forêt sommée sur ses arbres, sans pickle"""
+        X, y, _, _ = iris_dataset
+        forest = RandomForestClassifier(n_estimators=10, random_state=0).fit(X, y)
+        pickled = len(pickle.dumps(forest))
+
+        def _forbidden(*args, **kwargs):
+            raise AssertionError("pickle.dumps appelé")
+
+        monkeypatch.setattr("src.serving.registry.pickle.dumps", _forbidden)
+        size = estimate_model_bytes(forest)
+        assert 0.5 * pickled < size <= pickled
+
+    def test_size_estimated_off_event_loop(self, monkeypatch):
+        """Test : l'empreinte d'un modèle chargé est estimée dans le pool de threads"""
+        threads = []
+
+        def _estimate(model):
+            threads.append(threading.current_thread())
+            return 1000
+
+        monkeypatch.setattr("src.serving.registry.estimate_model_bytes", _estimate)
+        registry = ModelRegistry(["a"], loader=_CountingLoader())
+        entry = asyncio.run(registry.get("a"))
+        assert entry.size_bytes == 1000
+        assert threads and threading.main_thread() not in threads
+
+    def test_unknown_key_rejected(self):
+        """Test : seules les clés de SERVING_MODELS sont chargeables"""
+        loader = _CountingLoader()
+        registry = ModelRegistry(["a"], loader=loader)
+        with pytest.raises(UnknownModelError):
+            asyncio.run(registry.get(RUN_ID))
+        assert loader.calls == []
+
+    def test_concurrent_requests_load_once(self):
+        """Test : requêtes simultanées sur une même clé, un seul chargement"""
+        loader = _CountingLoader()
+        registry = ModelRegistry(["a"], loader=loader)
+
+        async def _run():
+            return await asyncio.gather(*(registry.get("a") for _ in range(5)))
+
+        entries = asyncio.run(_run())
+        assert loader.calls == ["a"]
+        assert all(entry is entries[0] for entry in entries)
+
+    def test_from_env(self, monkeypatch):
+        """Test de la configuration par variables d'environnement"""
+        monkeypatch.setenv("SERVING_MODELS", "IrisClassifier@champion, ,abc")
+        monkeypatch.setenv("MODEL_MEMORY_BUDGET_MB", "2")
+        registry = ModelRegistry.from_env()
+        assert registry.allowed_keys == {"IrisClassifier@champion", "abc"}
+        assert registry.memory_budget_bytes == 2 * 2**20
+
+
+class TestRegistryRouting:
+    """Tests du routage par header et par chemin"""
+
+    @pytest.fixture
+    def challenger_registry(self, iris_dataset, monkeypatch):
+        monkeypatch.setattr(limiter, "enabled", False)
+        X, y, _, _ = iris_dataset
+        challenger = RandomForestClassifier(n_estimators=5, random_state=1).fit(X, y)
+        registry = ModelRegistry(
+            ["IrisClassifier@challenger"],
+            loader=lambda key: (challenger, RUN_ID),
+        )
+        app.state.registry = registry
+        yield registry
+        app.state.registry = None
+
+    def test_header_and_path_routing(
+        self, api_client_with_model, api_key, valid_iris_data, challenger_registry
+    ):
+        """Test du header X-Model et de /models/{clé}/predict"""
+        headers = {"X-API-Key": api_key}
+        default = api_client_with_model.post(
+            "/predict", json=valid_iris_data, headers=headers
+        )
+        assert default.status_code == 200
+        assert default.headers[MODEL_HEADER] == app.state.metadata["mlflow_run_id"]
+
+        by_header = api_client_with_model.post(
+            "/predict",
+            json=valid_iris_data,
+            headers={**headers, MODEL_HEADER: "IrisClassifier@challenger"},
+        )
+        by_path = api_client_with_model.post(
+            "/models/IrisClassifier@challenger/predict",
+            json=valid_iris_data,
+            headers=headers,
+        )
+        for response in (by_header, by_path):
+            assert response.status_code == 200
+            assert response.headers[MODEL_HEADER] == "IrisClassifier@challenger"
+        assert challenger_registry.loaded_keys() == ["IrisClassifier@challenger"]
+
+        metrics = api_client_with_model.get("/metrics").text
+        assert 'model="IrisClassifier@challenger"' in metrics
+
+    def test_unknown_model_404(
+        self, api_client_with_model, api_key, valid_iris_data, challenger_registry
+    ):
+        """Test d'une version non servable"""
+        response = api_client_with_model.post(
+            f"/models/{RUN_ID}/predict",
+            json=valid_iris_data,
+            headers={"X-API-Key": api_key},
+        )
+        assert response.status_code == 404
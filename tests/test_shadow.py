@@ -0,0 +1,175 @@
+"""
+Tests unitaires pour l'inférence fantôme (serving/shadow.py)
+"""
+
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from src.serving.app import app
+from src.serving.metrics import shadow_predictions, shadow_requests
+from src.serving.middleware import limiter
+from src.serving.registry import ModelRegistry
+from src.serving.shadow import ShadowScorer, shadow_from_env
+
+
+def _count(counter, **labels) -> float:
+    return counter.labels(**labels)._value.get()
+
+
+class _FixedModel:
+    """Modèle factice : probabilités fixes, éventuellement bloquant"""
+
+    def __init__(self, proba, gate: threading.Event = None):
+        self.proba = np.asarray(proba)
+        self.gate = gate
+
+    def predict_proba(self, X):
+        if self.gate is not None:
+            self.gate.wait(5)
+        return self.proba[None, :]
+
+
+class TestShadowScorer:
+    """Tests de l'évaluation hors chemin de la réponse"""
+
+    def test_agreement_recorded(self):
+        """Test des métriques d'accord / désaccord avec le modèle principal"""
+        primary = np.array([0.8, 0.1, 0.1])
+        agree_before = _count(shadow_predictions, agreement="agree")
+        disagree_before = _count(shadow_predictions, agreement="disagree")
+
+        agreeing = ShadowScorer(_FixedModel([0.7, 0.2, 0.1]), "a", sample_rate=1.0)
+        disagreeing = ShadowScorer(_FixedModel([0.1, 0.8, 0.1]), "b", sample_rate=1.0)
+        for shadow in (agreeing, disagreeing):
+            assert asyncio.run(shadow.submit(np.zeros((1, 4)), primary))
+            shadow.close(wait=True)
+            assert shadow.pending == 0
+
+        assert _count(shadow_predictions, agreement="agree") == agree_before + 1
+        assert _count(shadow_predictions, agreement="disagree") == disagree_before + 1
+
+    def test_dropped_under_load(self):
+        """Test : au-delà de max_pending, l'évaluation est abandonnée"""
+        gate = threading.Event()
+        shadow = ShadowScorer(_FixedModel([1.0, 0.0], gate), "a", max_pending=1)
+        dropped_before = _count(shadow_requests, outcome="dropped")
+
+        async def _run():
+            return [
+                await shadow.submit(np.zeros((1, 4)), np.array([1.0, 0.0]))
+                for _ in range(3)
+            ]
+
+        assert asyncio.run(_run()) == [True, False, False]
+        assert _count(shadow_requests, outcome="dropped") == dropped_before + 2
+        gate.set()
+        shadow.close(wait=True)
+        assert shadow.pending == 0
+
+    def test_incompatible_classes_counted_as_error(self):
+        """Test d'un candidat aux classes différentes"""
+        errors_before = _count(shadow_requests, outcome="error")
+        shadow = ShadowScorer(_FixedModel([0.5, 0.5]), "a")
+        asyncio.run(shadow.submit(np.zeros((1, 4)), np.array([0.2, 0.3, 0.5])))
+        shadow.close(wait=True)
+        assert _count(shadow_requests, outcome="error") == errors_before + 1
+
+    def test_invalid_settings(self):
+        """Test de la validation des paramètres"""
+        with pytest.raises(ValueError):
+            ShadowScorer(_FixedModel([1.0]), "a", sample_rate=1.5)
+        with pytest.raises(ValueError):
+            ShadowScorer(_FixedModel([1.0]), "a", max_pending=0)
+
+    def test_shadow_from_env_pins_candidate(self, monkeypatch):
+        """Test du chargement du candidat, épinglé dans le registre"""
+        registry = ModelRegistry(loader=lambda key: (_FixedModel([1.0]), "run"))
+        monkeypatch.delenv("SHADOW_MODEL", raising=False)
+        assert asyncio.run(shadow_from_env(registry)) is None
+
+        monkeypatch.setenv("SHADOW_MODEL", "IrisClassifier@challenger")
+        monkeypatch.setenv("SHADOW_SAMPLE_RATE", "0.5")
+        shadow = asyncio.run(shadow_from_env(registry))
+        assert shadow.sample_rate == 0.5
+        assert registry.loaded_keys() == ["IrisClassifier@challenger"]
+        assert registry._entries["IrisClassifier@challenger"].pinned
+        shadow.close()
+
+
+class TestShadowRoute:
+    """Tests de l'évaluation fantôme depuis /predict"""
+
+    def test_predict_scores_candidate_after_response(
+        self,
+        api_client_with_model,
+        api_key,
+        valid_iris_data,
+        iris_dataset,
+        monkeypatch,
+    ):
+        """Test : réponse du modèle principal, candidat évalué en arrière-plan"""
+        monkeypatch.setattr(limiter, "enabled", False)
+        X, y, _, _ = iris_dataset
+        candidate = RandomForestClassifier(n_estimators=5, random_state=3).fit(X, y)
+        shadow = ShadowScorer(candidate, "IrisClassifier@challenger", sample_rate=1.0)
+        scored_before = _count(shadow_requests, outcome="scored")
+
+        app.state.shadow = shadow
+        try:
+            response = api_client_with_model.post(
+                "/predict", json=valid_iris_data, headers={"X-API-Key": api_key}
+            )
+        finally:
+            app.state.shadow = None
+            shadow.close(wait=True)
+
+        assert response.status_code == 200
+        expected = app.state.model.predict_proba(
+            np.array([list(valid_iris_data.values())])
+        )[0].max()
+        assert response.json()["confidence"] == pytest.approx(expected)
+        assert _count(shadow_requests, outcome="scored") == scored_before + 1
+
+    def test_challenger_requests_not_shadowed(
+        self,
+        api_client_with_model,
+        api_key,
+        valid_iris_data,
+        iris_dataset,
+        monkeypatch,
+    ):
+        """Test : une requête servie par une autre version n'est pas évaluée"""
+        monkeypatch.setattr(limiter, "enabled", False)
+        X, y, _, _ = iris_dataset
+        challenger = RandomForestClassifier(n_estimators=5, random_state=4).fit(X, y)
+        candidate = RandomForestClassifier(n_estimators=5, random_state=3).fit(X, y)
+        shadow = ShadowScorer(candidate, "IrisClassifier@candidate", sample_rate=1.0)
+        submitted_before = sum(
+            _count(shadow_requests, outcome=outcome)
+            for outcome in ("scored", "dropped", "error")
+        )
+
+        app.state.registry = ModelRegistry(
+            ["IrisClassifier@challenger"], loader=lambda key: (challenger, None)
+        )
+        app.state.shadow = shadow
+        try:
+            response = api_client_with_model.post(
+                "/predict",
+                json=valid_iris_data,
+                headers={"X-API-Key": api_key, "X-Model": "IrisClassifier@challenger"},
+            )
+        finally:
+            app.state.shadow = None
+            app.state.registry = None
+            shadow.close(wait=True)
+
+        assert response.status_code == 200
+        assert submitted_before == sum(
+            _count(shadow_requests, outcome=outcome)
+            for outcome in ("scored", "dropped", "error")
+        )
@@ -0,0 +1,113 @@
+"""
+Tests unitaires pour le logging asynchrone et structuré (serving/structured_logging.py)
+"""
+
+import json
+import logging
+import queue
+import sys
+
+import pytest
+
+from src.serving.structured_logging import (
+    DroppingQueueHandler,
+    JsonFormatter,
+    SuccessSamplingFilter,
+    setup_logging,
+    stop_logging,
+)
+
+
+def _record(message: str = "Prediction made", level: int = logging.INFO, **extra):
+    record = logging.makeLogRecord(
+        {"name": "iris_api", "levelno": level, "levelname": logging.getLevelName(level)}
+    )
+    record.msg = message
+    for key, value in extra.items():
+        setattr(record, key, value)
+    return record
+
+
+@pytest.fixture
+def restore_root_logger():
+    root = logging.getLogger()
+    level = root.level
+    yield
+    # Configuration par défaut de l'app (comme à l'import de src.serving.app)
+    setup_logging()
+    root.setLevel(level)
+
+
+class TestStructuredLogging:
+    """Tests pour le format JSON, l'échantillonnage et la file non bloquante"""
+
+    def test_json_formatter_includes_extra(self):
+        """Test des champs extra et de la trace d'exception"""
+        record = _record(predicted_class="setosa", confidence=0.9, status="success")
+        entry = json.loads(JsonFormatter().format(record))
+        assert entry["message"] == "Prediction made"
+        assert entry["level"] == "INFO"
+        assert entry["predicted_class"] == "setosa"
+        assert entry["confidence"] == 0.9
+        assert entry["timestamp"].endswith("Z")
+
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            record = _record("Error", level=logging.ERROR)
+            record.exc_info = sys.exc_info()
+        entry = json.loads(JsonFormatter().format(record))
+        assert "ValueError: boom" in entry["exception"]
+
+    def test_success_sampling(self):
+        """Test que seuls les logs de succès sont échantillonnés"""
+        drop_all = SuccessSamplingFilter(rate=0.0)
+        assert not drop_all.filter(_record(status="success"))
+        assert drop_all.filter(_record(status="error"))
+        assert drop_all.filter(_record("Startup"))
+        assert drop_all.filter(_record(level=logging.ERROR, status="success"))
+        assert SuccessSamplingFilter(rate=1.0).filter(_record(status="success"))
+        with pytest.raises(ValueError):
+            SuccessSamplingFilter(rate=1.5)
+
+    def test_full_queue_drops(self):
+        """Test qu'une file pleine abandonne l'entrée au lieu de bloquer"""
+        handler = DroppingQueueHandler(queue.Queue(maxsize=1))
+        handler.handle(_record("un %s", status="success"))
+        handler.handle(_record("deux"))
+        assert handler.dropped == 1
+        assert handler.queue.get_nowait().getMessage() == "un %s"
+
+    def test_listener_writes_json(self, capsys, restore_root_logger):
+        """Test de bout en bout : écriture JSON par le thread du listener"""
+        listener = setup_logging(level="INFO", log_format="json", queue_size=100)
+        logging.getLogger("iris_api").info(
+            "Prediction %s", "made", extra={"predicted_class": "setosa"}
+        )
+        stop_logging(listener)
+        stop_logging(listener)  # idempotent
+
+        lines = capsys.readouterr().err.strip().splitlines()
+        entry = json.loads(lines[-1])
+        assert entry["message"] == "Prediction made"
+        assert entry["predicted_class"] == "setosa"
+
+    def test_setup_is_idempotent(self, restore_root_logger, monkeypatch):
+        """Test : un seul handler de file, handlers tiers conservés, atexit unique"""
+        registered = []
+        monkeypatch.setattr(
+            "src.serving.structured_logging.atexit.register", registered.append
+        )
+        monkeypatch.setattr("src.serving.structured_logging._atexit_registered", False)
+        root = logging.getLogger()
+        foreign = logging.NullHandler()
+        root.addHandler(foreign)
+        try:
+            first = setup_logging(queue_size=10)
+            second = setup_logging(queue_size=10)
+            assert not first.running and second.running
+            assert foreign in root.handlers
+            assert sum(isinstance(h, DroppingQueueHandler) for h in root.handlers) == 1
+            assert len(registered) == 1
+        finally:
+            root.removeHandler(foreign)
@@ -0,0 +1,150 @@
+"""
+Tests unitaires pour le balayage d'hyperparamètres (training/sweep.py)
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import mlflow
+import pytest
+
+from src.training import sweep
+from src.training.sweep import (
+    build_grid,
+    pareto_front,
+    run_sweep,
+    sample_random,
+    select_for_budget,
+    train_config,
+)
+
+
+class TestSweep:
+    """Tests pour le balayage et la frontière de Pareto"""
+
+    def test_build_grid(self):
+        """Test du produit cartésien de la grille"""
+        grid = build_grid([10, 50], [None, 5], [0.2, 0.3])
+        assert len(grid) == 8
+        assert {"n_estimators": 10, "max_depth": None, "test_size": 0.2} in grid
+
+    def test_sample_random_reproducible(self):
+        """Test que la recherche aléatoire est reproductible et sans doublon"""
+        configs1 = sample_random([10, 200], [None, 5, 10], [0.2], n_iter=5, seed=1)
+        configs2 = sample_random([10, 200], [None, 5, 10], [0.2], n_iter=5, seed=1)
+        assert configs1 == configs2
+        assert len(configs1) == 5
+        for config in configs1:
+            assert 10 <= config["n_estimators"] <= 200
+        keys = {tuple(c.values()) for c in configs1}
+        assert len(keys) == 5
+
+    def test_pareto_front(self):
+        """Test de l'extraction des configurations non dominées"""
+        results = [
+            {"name": "a", "accuracy": 0.90, "latency_p99_ms": 1.0},
+            {"name": "b", "accuracy": 0.95, "latency_p99_ms": 2.0},
+            {"name": "c", "accuracy": 0.93, "latency_p99_ms": 3.0},  # dominé par b
+            {"name": "d", "accuracy": 0.97, "latency_p99_ms": 5.0},
+            {"name": "e", "accuracy": 0.89, "latency_p99_ms": 1.5},  # dominé par a
+        ]
+        front = pareto_front(results)
+        assert [r["name"] for r in front] == ["a", "b", "d"]
+
+    def test_select_for_budget(self):
+        """Test de la sélection sous budget de latence"""
+        front = [
+            {"accuracy": 0.90, "latency_p99_ms": 1.0},
+            {"accuracy": 0.95, "latency_p99_ms": 2.0},
+            {"accuracy": 0.97, "latency_p99_ms": 5.0},
+        ]
+        assert select_for_budget(front, 2.5)["accuracy"] == 0.95
+        assert select_for_budget(front, 10.0)["accuracy"] == 0.97
+        assert select_for_budget(front, 0.5) is None
+
+    def test_run_sweep(self):
+        """Test d'un petit balayage parallèle de bout en bout"""
+        temp_dir = tempfile.mkdtemp()
+        original_dir = os.getcwd()
+        try:
+            os.chdir(temp_dir)
+            mlflow.set_tracking_uri(f"file://{temp_dir}/mlruns")
+
+            configs = build_grid([5, 20], [3], [0.2])
+            summary = run_sweep(
+                configs,
+                max_workers=2,
+                latency_samples=10,
+                batch_size=64,
+                experiment_name="test-sweep",
+                latency_budget_ms=1000.0,
+            )
+
+            assert len(summary["results"]) == 2
+            for result in summary["results"]:
+                assert 0 <= result["accuracy"] <= 1
+                assert result["latency_p50_ms"] <= result["latency_p99_ms"]
+                assert result["batch_throughput_rows_per_s"] > 0
+                assert result["model_size_bytes"] > 0
+            assert len(summary["pareto_front"]) >= 1
+            assert summary["selected"] is not None
+
+            # Les runs enfants sont rattachés au run parent
+            runs = mlflow.search_runs(
+                experiment_names=["test-sweep"],
+                filter_string=(
+                    f"tags.mlflow.parentRunId = '{summary['mlflow_parent_run_id']}'"
+                ),
+            )
+            assert len(runs) == 2
+            assert "metrics.latency_p99_ms" in runs.columns
+
+            saved = json.loads(open("models/sweep.json", encoding="utf-8").read())
+            assert len(saved["pareto_front"]) == len(summary["pareto_front"])
+        finally:
+            os.chdir(original_dir)
+
+    def test_latency_measured_serially_in_parent(self, monkeypatch):
+        """Test : latences mesurées dans le processus parent, pool vidé"""
+        calls = []
+        measure = sweep.measure_latency
+
+        def _recording(*args, **kwargs):
+            calls.append(os.getpid())
+            return measure(*args, **kwargs)
+
+        monkeypatch.setattr(sweep, "measure_latency", _recording)
+        temp_dir = tempfile.mkdtemp()
+        original_dir = os.getcwd()
+        try:
+            os.chdir(temp_dir)
+            mlflow.set_tracking_uri(f"file://{temp_dir}/mlruns")
+            summary = run_sweep(
+                build_grid([5, 10], [3], [0.2]),
+                max_workers=2,
+                latency_samples=5,
+                batch_size=16,
+                experiment_name="test-sweep-serial",
+                output_path=None,
+            )
+        finally:
+            os.chdir(original_dir)
+
+        assert calls == [os.getpid(), os.getpid()]
+        assert all(r["latency_p99_ms"] > 0 for r in summary["results"])
+
+    def test_test_size_axis_ignores_dvc_split(self, tmp_path, monkeypatch):
+        """Test : chaque test_size a son propre découpage, même avec un manifeste"""
+        monkeypatch.chdir(tmp_path)
+        processed = Path("data/processed")
+        processed.mkdir(parents=True)
+        (processed / "manifest.json").write_text("{}", encoding="utf-8")
+
+        sizes = {}
+        for test_size in (0.2, 0.5):
+            params = {"n_estimators": 5, "max_depth": 3, "test_size": test_size}
+            _, _, X_test = train_config(params, random_state=0)
+            sizes[test_size] = len(X_test)
+        assert sizes == {0.2: 30, 0.5: 75}
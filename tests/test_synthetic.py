@@ -0,0 +1,72 @@
+"""
+Tests unitaires pour le générateur de données synthétiques (data/synthetic.py)
+"""
+
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.datasets import load_iris
+
+from src.data.schema import FEATURE_COLUMNS, TARGET_COLUMN, dtypes
+from src.data.synthetic import (
+    FEATURE_MAX,
+    FEATURE_MIN,
+    generate_synthetic_dataset,
+    iter_synthetic_chunks,
+)
+
+
+class TestSyntheticData:
+    """Tests pour le générateur de datasets synthétiques"""
+
+    def test_deterministic(self):
+        """Test que la même graine donne exactement les mêmes données"""
+        first = pd.concat(iter_synthetic_chunks(5000, chunk_size=1000, seed=7))
+        second = pd.concat(iter_synthetic_chunks(5000, chunk_size=1000, seed=7))
+        other = pd.concat(iter_synthetic_chunks(5000, chunk_size=1000, seed=8))
+
+        pd.testing.assert_frame_equal(first, second)
+        assert not first[FEATURE_COLUMNS].equals(other[FEATURE_COLUMNS])
+
+    def test_distribution_close_to_iris(self):
+        """Test que moyennes par classe et proportions suivent Iris"""
+        iris = load_iris()
+        df = pd.concat(iter_synthetic_chunks(60_000, chunk_size=20_000, seed=0))
+
+        proportions = df[TARGET_COLUMN].value_counts(normalize=True).sort_index()
+        np.testing.assert_allclose(proportions.values, [1 / 3] * 3, atol=0.01)
+        for k in range(3):
+            expected = iris.data[iris.target == k].mean(axis=0)
+            observed = df.loc[df[TARGET_COLUMN] == k, FEATURE_COLUMNS].mean().values
+            np.testing.assert_allclose(observed, expected, atol=0.05)
+
+        values = df[FEATURE_COLUMNS].values
+        assert values.min() >= FEATURE_MIN and values.max() <= FEATURE_MAX
+
+    def test_written_file_matches_schema(self):
+        """Test de l'écriture par morceaux au schéma lu par load_data"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = generate_synthetic_dataset(
+                n_rows=2500,
+                chunk_size=1000,
+                seed=1,
+                output_path=str(Path(temp_dir) / "synthetic" / "data.parquet"),
+            )
+            df = pd.read_parquet(path, columns=FEATURE_COLUMNS + [TARGET_COLUMN])
+
+            assert len(df) == 2500
+            assert df.dtypes.to_dict() == dtypes()
+            expected = pd.concat(iter_synthetic_chunks(2500, chunk_size=1000, seed=1))
+            np.testing.assert_array_equal(
+                df[FEATURE_COLUMNS].values, expected[FEATURE_COLUMNS].values
+            )
+
+    def test_invalid_sizes(self):
+        """Test des tailles invalides"""
+        with pytest.raises(ValueError):
+            next(iter_synthetic_chunks(0))
+        with pytest.raises(ValueError):
+            next(iter_synthetic_chunks(10, chunk_size=0))
@@ -0,0 +1,176 @@
+"""
+Tests unitaires pour le logging MLflow groupé (tracking.py)
+Le tracking utilise un file store local qui compte les appels log_batch
+"""
+
+import tempfile
+import time
+
+import mlflow
+import pytest
+from mlflow.tracking import MlflowClient
+from sklearn.datasets import load_iris
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import train_test_split
+
+from src.evaluation.evaluate import evaluate_model
+from src.tracking import BatchedMlflowLogger, _flush_open_loggers
+
+
+@pytest.fixture
+def counting_store(monkeypatch):
+    """File store local temporaire comptant les appels de tracking"""
+    temp_dir = tempfile.mkdtemp()
+    mlflow.set_tracking_uri(f"file://{temp_dir}/mlruns")
+    mlflow.set_experiment("test-tracking")
+
+    calls = {"log_batch": 0, "fluent": 0}
+    original_log_batch = MlflowClient.log_batch
+
+    def counting_log_batch(self, *args, **kwargs):
+        calls["log_batch"] += 1
+        return original_log_batch(self, *args, **kwargs)
+
+    def forbidden_fluent(*args, **kwargs):
+        calls["fluent"] += 1
+
+    monkeypatch.setattr(MlflowClient, "log_batch", counting_log_batch)
+    # Les appels unitaires de l'API fluent ne doivent plus être utilisés
+    for name in ("log_metric", "log_param", "set_tag"):
+        monkeypatch.setattr(mlflow, name, forbidden_fluent)
+    return calls
+
+
+class TestBatchedMlflowLogger:
+    """Tests pour le logger MLflow groupé"""
+
+    def test_single_batch_for_small_run(self, counting_store):
+        """Test que params, métriques et tags partent en un seul appel"""
+        with mlflow.start_run() as run:
+            with BatchedMlflowLogger() as tracker:
+                tracker.log_params({"n_estimators": 100, "max_depth": None})
+                tracker.log_metrics({"accuracy": 0.9, "f1": 0.8})
+                tracker.set_tags({"model_type": "RandomForestClassifier"})
+                assert counting_store["log_batch"] == 0
+
+        assert counting_store["log_batch"] == 1
+        data = mlflow.get_run(run.info.run_id).data
+        assert data.params["n_estimators"] == "100"
+        assert data.params["max_depth"] == "None"
+        assert data.metrics["accuracy"] == 0.9
+        assert data.tags["model_type"] == "RandomForestClassifier"
+
+    def test_batches_respect_limits(self, counting_store):
+        """Test du découpage selon les limites de log_batch (100 params max)"""
+        with mlflow.start_run() as run:
+            with BatchedMlflowLogger() as tracker:
+                tracker.log_params({f"p{i}": i for i in range(250)})
+
+        assert counting_store["log_batch"] == 3
+        assert len(mlflow.get_run(run.info.run_id).data.params) == 250
+
+    def test_metric_history_steps(self, counting_store):
+        """Test que les métriques à plusieurs steps conservent leur historique"""
+        with mlflow.start_run() as run:
+            with BatchedMlflowLogger() as tracker:
+                for step in range(5):
+                    tracker.log_metric("oob_score", step / 10, step=step)
+
+        history = MlflowClient().get_metric_history(run.info.run_id, "oob_score")
+        assert [m.step for m in history] == [0, 1, 2, 3, 4]
+
+    def test_background_flush(self, counting_store):
+        """Test du vidage périodique en arrière-plan"""
+        with mlflow.start_run() as run:
+            tracker = BatchedMlflowLogger(background=True, flush_interval_s=0.05)
+            tracker.log_metric("accuracy", 0.9)
+            deadline = time.time() + 5
+            while counting_store["log_batch"] == 0 and time.time() < deadline:
+                time.sleep(0.01)
+            assert counting_store["log_batch"] >= 1
+            tracker.close()
+
+        assert mlflow.get_run(run.info.run_id).data.metrics["accuracy"] == 0.9
+
+    def test_flush_on_exit(self, counting_store):
+        """Test que les valeurs en attente sont vidées à la sortie du processus"""
+        with mlflow.start_run() as run:
+            tracker = BatchedMlflowLogger()
+            tracker.log_metric("accuracy", 0.75)
+            # Simule le hook atexit
+            _flush_open_loggers()
+
+        assert counting_store["log_batch"] == 1
+        assert mlflow.get_run(run.info.run_id).data.metrics["accuracy"] == 0.75
+
+    def test_failed_flush_requeues_only_unsent_batches(
+        self, counting_store, monkeypatch
+    ):
+        """Test : après un échec, seuls les lots non acceptés sont renvoyés"""
+        original_log_batch = MlflowClient.log_batch
+        calls = {"n": 0}
+
+        def failing_second_batch(self, *args, **kwargs):
+            calls["n"] += 1
+            if calls["n"] == 2:
+                raise ConnectionError("tracking server unavailable")
+            return original_log_batch(self, *args, **kwargs)
+
+        monkeypatch.setattr(MlflowClient, "log_batch", failing_second_batch)
+        with mlflow.start_run() as run:
+            tracker = BatchedMlflowLogger()
+            tracker.log_params({f"p{i}": i for i in range(150)})
+            for step in range(1500):
+                tracker.log_metric("loss", step, step=step)
+            with pytest.raises(ConnectionError):
+                tracker.flush()
+            tracker.close()
+
+        history = MlflowClient().get_metric_history(run.info.run_id, "loss")
+        assert sorted(m.step for m in history) == list(range(1500))
+        assert len(mlflow.get_run(run.info.run_id).data.params) == 150
+
+    def test_failed_close_flushed_on_exit(self, counting_store, monkeypatch):
+        """Test : un échec du vidage final laisse le hook de sortie réessayer"""
+        original_log_batch = MlflowClient.log_batch
+        calls = {"n": 0}
+
+        def failing_first_call(self, *args, **kwargs):
+            calls["n"] += 1
+            if calls["n"] == 1:
+                raise ConnectionError("tracking server unavailable")
+            return original_log_batch(self, *args, **kwargs)
+
+        monkeypatch.setattr(MlflowClient, "log_batch", failing_first_call)
+        with mlflow.start_run() as run:
+            tracker = BatchedMlflowLogger()
+            tracker.log_metric("accuracy", 0.8)
+            with pytest.raises(ConnectionError):
+                tracker.close()
+            _flush_open_loggers()
+
+        assert calls["n"] == 2
+        assert mlflow.get_run(run.info.run_id).data.metrics["accuracy"] == 0.8
+
+    def test_evaluate_model_single_round_trip(self, counting_store):
+        """Test que evaluate_model envoie toutes ses métriques en un seul appel"""
+        iris = load_iris()
+        X_train, X_test, y_train, y_test = train_test_split(
+            iris.data, iris.target, test_size=0.2, random_state=42, stratify=iris.target
+        )
+        model = RandomForestClassifier(n_estimators=10, random_state=42)
+        model.fit(X_train, y_train)
+        iris_metadata = {
+            "feature_names": list(iris.feature_names),
+            "target_names": list(iris.target_names),
+        }
+
+        with mlflow.start_run() as run:
+            evaluate_model(model, X_test, y_test, iris_metadata)
+
+        assert counting_store["log_batch"] == 1
+        assert counting_store["fluent"] == 0
+        metrics = mlflow.get_run(run.info.run_id).data.metrics
+        # 4 métriques globales + 3 par classe
+        assert len(metrics) == 4 + 3 * 3
+        assert "recall_virginica" in metrics
@@ -0,0 +1,196 @@
+"""
+Tests unitaires pour la répartition A/B du trafic (serving/traffic_split.py)
+"""
+
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from src.serving.app import app
+from src.serving.metrics import ab_requests
+from src.serving.middleware import limiter
+from src.serving.registry import MODEL_HEADER, ModelRegistry
+from src.serving.traffic_split import (
+    ARM_HEADER,
+    BUCKETS,
+    CLIENT_ID_HEADER,
+    TrafficSplit,
+    parse_arms,
+)
+
+CHALLENGER = "IrisClassifier@challenger"
+
+
+def _assignments(split: TrafficSplit, n: int = 20_000) -> dict:
+    return {f"client-{i}": split.assign(f"client-{i}") for i in range(n)}
+
+
+class TestTrafficSplit:
+    """Tests de la table de routage pondérée"""
+
+    def test_parse_arms(self):
+        """Test du format "clé:poids" (alias contenant ':' acceptés)"""
+        assert parse_arms(" default:90, models:/x@y:10 ,") == {
+            "default": 90.0,
+            "models:/x@y": 10.0,
+        }
+        assert parse_arms("") == {}
+        with pytest.raises(ValueError):
+            parse_arms("default")
+
+    def test_weights_respected(self):
+        """Test des proportions observées sur de nombreux clients"""
+        split = TrafficSplit({"default": 80, CHALLENGER: 20})
+        assert split.weights == {"default": 0.8, CHALLENGER: 0.2}
+        arms = list(_assignments(split).values())
+        assert arms.count(CHALLENGER) / len(arms) == pytest.approx(0.2, abs=0.01)
+
+    def test_assignment_is_sticky(self):
+        """Test : un client reçoit toujours le même bras, la graine change tout"""
+        split = TrafficSplit({"default": 50, CHALLENGER: 50}, seed=7)
+        first = _assignments(split, 1000)
+        assert _assignments(split, 1000) == first
+        assert (
+            _assignments(TrafficSplit({"default": 50, CHALLENGER: 50}, seed=7), 1000)
+            == first
+        )
+        other_seed = _assignments(
+            TrafficSplit({"default": 50, CHALLENGER: 50}, seed=8), 1000
+        )
+        assert other_seed != first
+
+    def test_ramp_up_keeps_existing_clients(self):
+        """Test : augmenter le challenger ne fait que lui ajouter des clients"""
+        split = TrafficSplit({"default": 90, CHALLENGER: 10})
+        before = _assignments(split)
+        split.set_weights({"default": 50, CHALLENGER: 50})
+        after = _assignments(split)
+        assert all(
+            after[client] == CHALLENGER
+            for client, arm in before.items()
+            if arm == CHALLENGER
+        )
+
+    def test_invalid_weights(self):
+        """Test de la validation des poids"""
+        for weights in ({}, {"default": -1, CHALLENGER: 2}, {"default": 0}):
+            with pytest.raises(ValueError):
+                TrafficSplit(weights)
+        for spec in ("default:inf,b:1", "default:nan,b:1"):
+            with pytest.raises(ValueError, match="non finis"):
+                TrafficSplit(parse_arms(spec))
+
+    def test_from_env(self, monkeypatch):
+        """Test de la configuration par variables d'environnement"""
+        monkeypatch.delenv("AB_ARMS", raising=False)
+        assert TrafficSplit.from_env() is None
+        monkeypatch.setenv("AB_ARMS", f"default:3,{CHALLENGER}:1")
+        monkeypatch.setenv("AB_SEED", "42")
+        split = TrafficSplit.from_env()
+        assert split.seed == 42
+        assert split.weights == {"default": 0.75, CHALLENGER: 0.25}
+        assert len(split._table) == BUCKETS
+
+
+class TestTrafficSplitRoutes:
+    """Tests du routage A/B de /predict et de l'administration des poids"""
+
+    ADMIN_KEY = "admin-key-for-tests-0123456789abcdef"
+
+    @pytest.fixture
+    def challenger_registry(self, iris_dataset, monkeypatch):
+        monkeypatch.setattr(limiter, "enabled", False)
+        X, y, _, _ = iris_dataset
+        challenger = RandomForestClassifier(n_estimators=5, random_state=2).fit(X, y)
+        registry = ModelRegistry([CHALLENGER], loader=lambda key: (challenger, None))
+        app.state.registry = registry
+        yield registry
+        app.state.registry = None
+        app.state.traffic_split = None
+
+    def test_predict_routed_to_arm(
+        self, api_client_with_model, api_key, valid_iris_data, challenger_registry
+    ):
+        """Test du bras choisi par client, annoncé par X-AB-Arm"""
+        app.state.traffic_split = TrafficSplit({CHALLENGER: 1})
+        before = ab_requests.labels(arm=CHALLENGER)._value.get()
+        headers = {"X-API-Key": api_key, CLIENT_ID_HEADER: "client-1"}
+
+        response = api_client_with_model.post(
+            "/predict", json=valid_iris_data, headers=headers
+        )
+        assert response.status_code == 200
+        assert response.headers[ARM_HEADER] == CHALLENGER
+        assert response.headers[MODEL_HEADER] == CHALLENGER
+        assert ab_requests.labels(arm=CHALLENGER)._value.get() == before + 1
+
+        # Un modèle désigné explicitement contourne la répartition
+        explicit = api_client_with_model.post(
+            "/predict",
+            json=valid_iris_data,
+            headers={**headers, MODEL_HEADER: "default"},
+        )
+        assert ARM_HEADER not in explicit.headers
+
+        metrics = api_client_with_model.get("/metrics").text
+        assert f'ab_latency_seconds_count{{arm="{CHALLENGER}"}}' in metrics
+
+    def test_admin_updates_weights(
+        self, api_client_with_model, challenger_registry, monkeypatch
+    ):
+        """Test de la modification à chaud des poids (clé admin requise)"""
+        monkeypatch.setenv("ADMIN_API_KEY", self.ADMIN_KEY)
+        headers = {"X-Admin-Key": self.ADMIN_KEY}
+        payload = {"weights": {"default": 3, CHALLENGER: 1}}
+
+        assert (
+            api_client_with_model.put("/admin/traffic-split", json=payload).status_code
+            == 401
+        )
+        response = api_client_with_model.put(
+            "/admin/traffic-split", json=payload, headers=headers
+        )
+        assert response.status_code == 200
+        assert response.json()["weights"] == {"default": 0.75, CHALLENGER: 0.25}
+        assert challenger_registry._entries[CHALLENGER].pinned
+
+        current = api_client_with_model.get("/admin/traffic-split", headers=headers)
+        assert current.json()["weights"] == {"default": 0.75, CHALLENGER: 0.25}
+
+        for invalid in ({"unknown@x": 1}, {"default": -1}, {}):
+            response = api_client_with_model.put(
+                "/admin/traffic-split", json={"weights": invalid}, headers=headers
+            )
+            assert response.status_code == 422
+        assert app.state.traffic_split.weights == {"default": 0.75, CHALLENGER: 0.25}
+
+    def test_removed_arm_unpinned(
+        self, api_client_with_model, challenger_registry, monkeypatch
+    ):
+        """Test : un bras retiré redevient déchargeable, une requête invalide n'épingle rien"""
+        monkeypatch.setenv("ADMIN_API_KEY", self.ADMIN_KEY)
+        headers = {"X-Admin-Key": self.ADMIN_KEY}
+
+        invalid = {"weights": {CHALLENGER: 1, "unknown@x": 1}}
+        response = api_client_with_model.put(
+            "/admin/traffic-split", json=invalid, headers=headers
+        )
+        assert response.status_code == 422
+        assert not challenger_registry._entries[CHALLENGER].pinned
+
+        ramp = {"weights": {"default": 9, CHALLENGER: 1}}
+        assert (
+            api_client_with_model.put(
+                "/admin/traffic-split", json=ramp, headers=headers
+            ).status_code
+            == 200
+        )
+        assert challenger_registry._entries[CHALLENGER].pinned
+
+        rollback = {"weights": {"default": 1}}
+        assert (
+            api_client_with_model.put(
+                "/admin/traffic-split", json=rollback, headers=headers
+            ).status_code
+            == 200
+        )
+        assert not challenger_registry._entries[CHALLENGER].pinned
@@ -0,0 +1,177 @@
+"""
+Tests unitaires pour le préchauffage du serving (serving/warmup.py)
+"""
+
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.bench_import_time import audit_import_time, parse_importtime
+from src.serving.app import app
+from src.serving.metrics import model_predictions
+from src.serving.registry import ModelRegistry
+from src.serving.shadow import ShadowScorer
+from src.serving.traffic_split import TrafficSplit
+from src.serving.warmup import synthetic_features, warm_up
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+# Exécuté dans un interpréteur neuf : démarrage réel (lifespan), puis
+# première requête comparée au régime établi
+FIRST_REQUEST_SCRIPT = """
+import json, statistics, time
+from fastapi.testclient import TestClient
+from src.serving.app import app
+from src.serving.metrics import warmup_duration
+from src.serving.middleware import limiter
+
+limiter.enabled = False
+body = {"sepal_length": 5.1, "sepal_width": 3.5, "petal_length": 1.4, "petal_width": 0.2}
+headers = {"X-API-Key": "test-api-key-12345"}
+with TestClient(app) as client:
+    durations = []
+    for _ in range(30):
+        start = time.perf_counter()
+        assert client.post("/predict", json=body, headers=headers).status_code == 200
+        durations.append(time.perf_counter() - start)
+print("TIMINGS", json.dumps({
+    "first": durations[0],
+    "steady": statistics.median(durations[1:]),
+    "warmup_s": warmup_duration._value.get(),
+}))
+"""
+
+
+class _CountingModel:
+    """Modèle factice : compte les appels et le thread qui les exécute"""
+
+    def __init__(self):
+        self.calls = 0
+        self.threads = set()
+
+    def predict_proba(self, X):
+        assert X.shape == (1, 4)
+        self.calls += 1
+        self.threads.add(threading.current_thread().name)
+        return np.array([[0.2, 0.5, 0.3]])
+
+
+class TestWarmUp:
+    """Tests des prédictions synthétiques de démarrage"""
+
+    def test_synthetic_features_are_valid_requests(self):
+        """Test : corps conformes au schéma IrisFeatures, reproductibles"""
+        payloads = synthetic_features(5)
+        assert payloads == synthetic_features(5)
+        assert set(payloads[0]) == {
+            "sepal_length",
+            "sepal_width",
+            "petal_length",
+            "petal_width",
+        }
+
+    def test_every_enabled_path_warmed(self, monkeypatch):
+        """Test : défaut, bras A/B et candidat fantôme, sans métrique de prédiction"""
+        monkeypatch.setenv("WARMUP_ITERATIONS", "4")
+        default, arm, candidate = _CountingModel(), _CountingModel(), _CountingModel()
+        registry = ModelRegistry(["arm"], loader=lambda key: (arm, None))
+        shadow = ShadowScorer(candidate, "candidate")
+        predictions_before = sum(
+            sample.value
+            for metric in model_predictions.collect()
+            for sample in metric.samples
+        )
+
+        app.state.model = default
+        app.state.registry = registry
+        app.state.traffic_split = TrafficSplit({"default": 50, "arm": 50})
+        app.state.shadow = shadow
+        try:
+            timings = asyncio.run(warm_up(app))
+        finally:
+            app.state.model = None
+            app.state.registry = None
+            app.state.traffic_split = None
+            app.state.shadow = None
+            shadow.close(wait=True)
+
+        assert set(timings) == {"default", "arm", "shadow:candidate"}
+        assert default.calls == arm.calls == candidate.calls == 4
+        assert all(name.startswith("shadow") for name in candidate.threads)
+        assert predictions_before == sum(
+            sample.value
+            for metric in model_predictions.collect()
+            for sample in metric.samples
+        )
+
+    def test_disabled(self, monkeypatch):
+        """Test : WARMUP_ITERATIONS=0 ou pas de modèle, rien n'est exécuté"""
+        model = _CountingModel()
+        monkeypatch.setenv("WARMUP_ITERATIONS", "0")
+        app.state.model = model
+        try:
+            assert asyncio.run(warm_up(app)) == {}
+        finally:
+            app.state.model = None
+        monkeypatch.setenv("WARMUP_ITERATIONS", "4")
+        assert asyncio.run(warm_up(app)) == {}
+        assert model.calls == 0
+
+    def test_first_request_close_to_steady_state(self, trained_model):
+        """Test : après démarrage, la première requête reste proche du régime établi"""
+        _, metadata = trained_model
+        # Dossier temporaire de la fixture : parent de mlruns/ et models/
+        root = metadata["mlflow_run_uri"].removeprefix("file://").split("/mlruns/")[0]
+        env = {
+            **os.environ,
+            "MODEL_DIR": f"{root}/models",
+            "MLFLOW_TRACKING_URI": f"file://{root}/mlruns",
+            "API_KEY": "test-api-key-12345",
+            "ENVIRONMENT": "development",
+            "AUDIT_LOG_DIR": "",
+            "WARMUP_ITERATIONS": "20",
+        }
+        result = subprocess.run(
+            [sys.executable, "-c", FIRST_REQUEST_SCRIPT],
+            cwd=REPO_ROOT,
+            env=env,
+            capture_output=True,
+            text=True,
+            timeout=120,
+        )
+        assert result.returncode == 0, result.stderr[-2000:]
+        line = next(
+            line for line in result.stdout.splitlines() if line.startswith("TIMINGS ")
+        )
+        timings = json.loads(line.removeprefix("TIMINGS "))
+
+        assert timings["warmup_s"] > 0
+        assert timings["first"] <= 3 * timings["steady"]
+
+
+class TestImportTime:
+    """Tests de l'audit -X importtime (benchmarks/bench_import_time.py)"""
+
+    def test_parse_importtime(self):
+        """Test de l'analyse de la trace (temps propre, cumulé, profondeur)"""
+        trace = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |   numpy.core\n"
+            "import time:       300 |        420 | numpy\n"
+        )
+        assert parse_importtime(trace) == [
+            {"module": "numpy.core", "self_us": 120, "cumulative_us": 120, "depth": 1},
+            {"module": "numpy", "self_us": 300, "cumulative_us": 420, "depth": 0},
+        ]
+
+    def test_serving_app_defers_mlflow(self):
+        """Test : importer l'app ne charge pas mlflow (importé par le lifespan)"""
+        report = audit_import_time("src.serving.app", repeat=1)
+        assert report["total_ms"] > 0
+        assert report["eager_deferred"] == []